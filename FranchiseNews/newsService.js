@@ -287,10 +287,24 @@ const MOCK_NEWS_ARTICLES = [
    NEWS SERVICE API
    ============================================================================ */
 
+// Published by scripts/fetch_franchise_news_rss.py
+const NEWS_URL = '../data/franchise_news.json';
+const NEWS_CHANGES_URL = '../data/news_changes.json';  // Per-article changes of the last runs
+const NEWS_CACHE_KEY = 'franchiseNews.published.v1';   // localStorage: { seq, articles }
+
+// Same order as the published list: newest first, ties by id
+function comparePublished(a, b) {
+  const dateA = a.published_iso || '';
+  const dateB = b.published_iso || '';
+  if (dateA !== dateB) return dateA < dateB ? 1 : -1;
+  return a.id < b.id ? 1 : a.id > b.id ? -1 : 0;
+}
+
 class NewsService {
   constructor() {
     this.sources = NEWS_SOURCES;
     this.articles = MOCK_NEWS_ARTICLES;
+    this._published = null;  // { seq, articles } - see _loadPublishedArticles()
   }
 
   /**
@@ -332,27 +346,25 @@ class NewsService {
    */
   async getAllArticles() {
     try {
-      // Fetch from static JSON file (updated by GitHub Actions RSS aggregator)
-      const dataUrl = new URL('../data/franchise_news.json', document.baseURI).toString();
-      const response = await fetch(dataUrl);
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
+      // Static JSON file (updated by GitHub Actions RSS aggregator), kept
+      // current with the change log
+      const data = await this._loadPublishedArticles();
 
       // Transform RSS data to match our article format
       if (Array.isArray(data)) {
-        return data.map((item, index) => ({
-          id: `rss-${index}-${Date.now()}`,
-          title: item.title || 'Untitled',
-          sourceId: this._normalizeSourceId(item.source || 'unknown'),
-          url: item.link || item.url || '#',
-          publishedAt: item.published ? item.published.split('T')[0] : new Date().toISOString().split('T')[0],
-          category: this._mapRSSCategory(item.category || 'trade_press'),
-          shortSourceLabel: item.source || 'News'
-        }));
+        return data.map((item, index) => {
+          const source = item.source || item.source_name || 'unknown';
+          const published = item.published || item.published_iso;
+          return {
+            id: item.id || `rss-${index}`,
+            title: item.title || 'Untitled',
+            sourceId: this._normalizeSourceId(source),
+            url: item.link || item.url || '#',
+            publishedAt: published ? published.split('T')[0] : new Date().toISOString().split('T')[0],
+            category: this._mapRSSCategory(item.category || 'trade_press'),
+            shortSourceLabel: item.source || item.source_name || 'News'
+          };
+        });
       }
 
       return MOCK_NEWS_ARTICLES;
@@ -362,6 +374,92 @@ class NewsService {
     }
   }
 
+  /**
+   * Published article list (raw franchise_news.json items)
+   *
+   * The full list is downloaded once. After that only news_changes.json is
+   * requested - a 304 when nothing changed - and the articles added,
+   * updated or removed since our sequence number are applied. The list is
+   * kept in localStorage, so returning visitors download only what is new.
+   * If our copy is older than the change log reaches back, the full list is
+   * downloaded again.
+   *
+   * @private
+   * @returns {Promise<Array>} Published articles, newest first
+   */
+  async _loadPublishedArticles() {
+    const local = this._published || this._readPublishedCache();
+
+    let changes = null;
+    try {
+      changes = await this._fetchJson(NEWS_CHANGES_URL);
+    } catch (error) {
+      // No change log (yet) - fall back to the full list
+    }
+
+    if (local && changes && local.seq >= changes.since && local.seq <= changes.seq) {
+      if (local.seq < changes.seq) {
+        this._published = { seq: changes.seq, articles: this._applyChanges(local.articles, changes, local.seq) };
+        this._writePublishedCache();
+      } else {
+        this._published = local;
+      }
+      return this._published.articles;
+    }
+
+    const articles = await this._fetchJson(NEWS_URL);
+    this._published = { seq: changes ? changes.seq : 0, articles: Array.isArray(articles) ? articles : [] };
+    this._writePublishedCache();
+    return this._published.articles;
+  }
+
+  /**
+   * Apply the change log entries after `seq` to an article list
+   * @private
+   */
+  _applyChanges(articles, changes, seq) {
+    const byId = new Map(articles.map(article => [article.id, article]));
+    for (const change of changes.changes) {
+      if (change.seq <= seq) continue;
+      (change.removed || []).forEach(id => byId.delete(id));
+      [...(change.added || []), ...(change.updated || [])].forEach(article => byId.set(article.id, article));
+    }
+    return [...byId.values()].sort(comparePublished);
+  }
+
+  /**
+   * Fetch a data file, revalidating with the server (cheap 304s)
+   * @private
+   */
+  async _fetchJson(path) {
+    const url = new URL(path, document.baseURI).toString();
+    const response = await fetch(url, { cache: 'no-cache' });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
+  /** @private */
+  _readPublishedCache() {
+    try {
+      const stored = JSON.parse(window.localStorage.getItem(NEWS_CACHE_KEY));
+      return stored && Array.isArray(stored.articles) ? stored : null;
+    } catch (error) {
+      return null;  // Storage unavailable or corrupt
+    }
+  }
+
+  /** @private */
+  _writePublishedCache() {
+    try {
+      window.localStorage.setItem(NEWS_CACHE_KEY, JSON.stringify(this._published));
+    } catch (error) {
+      // Storage unavailable or full - the in-memory copy still works
+    }
+  }
+
   /**
    * Normalize source name to source ID
    * @private
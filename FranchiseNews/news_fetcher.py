@@ -1,11 +1,17 @@
-import json
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
 
 import feedparser
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import profiling  # noqa: E402
+import run_metrics  # noqa: E402
+from publisher import publish_json  # noqa: E402
+
 FEEDS = [
     ("Franchise Times", "https://www.franchisetimes.com/search/?f=rt%3Aarticle%2Csection%3Afeatures%2Ctype%3Astore%2Ctype%3Aarticle%2Ctype%3Apages&l=100&sd=desc&st=article&f_site=franchisetimes.com&f_type=article&sort=pubdate&rss=1"),
     ("QSR Magazine", "https://www.qsrmagazine.com/rss.xml"),
@@ -19,10 +25,19 @@ MAX_ITEMS = 60
 
 
 def fetch_feed(name: str, url: str):
+    host = urlparse(url).netloc
+    started = time.perf_counter()
     try:
-        response = requests.get(url, timeout=15)
+        try:
+            response = requests.get(url, timeout=15)
+        except requests.RequestException as exc:
+            run_metrics.record_request(host, time.perf_counter() - started, error=exc)
+            raise
+        run_metrics.record_request(host, time.perf_counter() - started, response)
         response.raise_for_status()
+        parse_started = time.perf_counter()
         parsed = feedparser.parse(response.text)
+        run_metrics.observe("feed_parse_seconds", time.perf_counter() - parse_started, provider=host)
         articles = []
         for entry in parsed.entries:
             title = entry.get("title") or "Untitled"
@@ -64,8 +79,10 @@ def gather_articles():
     return all_articles[:MAX_ITEMS]
 
 
+@run_metrics.instrumented("news_widget")
 def main():
-    articles = gather_articles()
+    with run_metrics.stage("fetch"):
+        articles = gather_articles()
     if not articles:
         articles = [
             {
@@ -76,9 +93,11 @@ def main():
             }
         ]
 
-    OUTPUT_PATH.write_text(json.dumps(articles, indent=2), encoding="utf-8")
+    with run_metrics.stage("publish"):
+        publish_json(articles, OUTPUT_PATH, name="franchise_news_widget")
+    run_metrics.record_rows("franchise_news_widget", len(articles))
     print(f"Saved {len(articles)} articles to {OUTPUT_PATH}")
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main, "news_widget", description="Fetch the franchise news widget feed")
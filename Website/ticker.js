@@ -18,10 +18,16 @@ const TICKER_SYMBOLS = [
 // Refresh interval in milliseconds (1 hour = 3600 seconds)
 const REFRESH_INTERVAL = 3600000; // 1 hour
 
+// Optional push channel served by scripts/data_api_server.py, e.g.
+// window.TICKER_STREAM_URL = 'http://localhost:8787/api/stream/quotes'.
+// When connected, changed quotes are pushed and polling is skipped.
+const TICKER_STREAM_URL = window.TICKER_STREAM_URL || null;
+
 // Cache for last known prices (for offline fallback)
 let lastKnownData = {};
 let lastMarketData = {}; // Store last market close data for after-hours
 let historicalSnapshots = null; // { symbol: { latest, previous, previousDate } }
+let summarySnapshots = null;    // Same shape, from the ticker history summary
 
 // Load cached data from localStorage on initialization
 try {
@@ -82,41 +88,67 @@ async function loadHistoricalSnapshots() {
   }
 }
 
+/**
+ * Last two closes per symbol from the ticker history summary
+ * (data/ticker_history.json, a few KB, rebuilt with the CSV by
+ * scripts/ticker_bundle.py). Same shape as loadHistoricalSnapshots()
+ * without downloading the full history CSV.
+ * @returns {Promise<Object>} Snapshots keyed by symbol
+ */
+async function loadSummarySnapshots() {
+  if (summarySnapshots) {
+    return summarySnapshots;
+  }
+
+  try {
+    const response = await fetch('../data/ticker_history.json');
+    if (!response.ok) {
+      throw new Error(`Summary fetch failed with status ${response.status}`);
+    }
+
+    const data = await response.json();
+    const snapshots = {};
+    for (const [symbol, entry] of Object.entries(data.symbols || {})) {
+      snapshots[symbol] = {
+        latest: entry.close,
+        latestDate: entry.date,
+        previous: entry.previousClose,
+        previousDate: null
+      };
+    }
+
+    summarySnapshots = snapshots;
+    return snapshots;
+  } catch (error) {
+    console.warn('Unable to load ticker history summary:', error);
+    summarySnapshots = {};
+    return summarySnapshots;
+  }
+}
+
 // ============================================================================
-// FINNHUB LIVE DATA INTEGRATION
+// PRECOMPUTED TICKER BUNDLE
 // ============================================================================
 
 /**
- * Fetch live stock data from Finnhub (updated hourly by GitHub Actions)
+ * Fetch the ticker bundle (live quotes joined with last close, 52-week
+ * range, YTD return and sparkline by scripts/ticker_bundle.py). One small
+ * request instead of the live snapshot plus the full history CSV.
  * @returns {Promise<Object>} Stock data keyed by symbol
  */
-async function fetchLiveTickerData() {
+async function fetchTickerBundle() {
   try {
-    console.log('Fetching live ticker data from Finnhub...');
-    const response = await fetch('../data/live_ticker.json');
+    const response = await fetch('../data/ticker_bundle.json');
 
     if (!response.ok) {
-      throw new Error(`Failed to fetch live ticker: ${response.status}`);
+      throw new Error(`Failed to fetch ticker bundle: ${response.status}`);
     }
 
     const data = await response.json();
-
-    if (!data.quotes || Object.keys(data.quotes).length === 0) {
-      throw new Error('Live ticker data is empty');
-    }
-
-    // Transform Finnhub format to ticker format
     const stockData = {};
-    const snapshots = await loadHistoricalSnapshots();
-
-    for (const [symbol, quote] of Object.entries(data.quotes)) {
-      let changePercent = quote.changePercent;
-
-      const snapshot = snapshots[symbol];
-      if (snapshot && snapshot.previous && snapshot.latest) {
-        changePercent = ((snapshot.latest - snapshot.previous) / snapshot.previous) * 100;
-      }
 
+    for (const [symbol, quote] of Object.entries(data.quotes || {})) {
+      const changePercent = quote.changePercent;
       stockData[symbol] = {
         symbol: quote.symbol,
         price: quote.price.toFixed(2),
@@ -124,11 +156,50 @@ async function fetchLiveTickerData() {
         isPositive: changePercent > 0,
         isNegative: changePercent < 0,
         afterHours: false,
-        source: 'finnhub',
-        fetchedAt: data.fetchedAt
+        source: quote.source,
+        fetchedAt: data.fetchedAt,
+        lastClose: quote.lastClose,
+        high52: quote.high52,
+        low52: quote.low52,
+        ytdReturn: quote.ytdReturn,
+        spark: quote.spark
       };
     }
 
+    console.log(`✓ Loaded ${Object.keys(stockData).length} quotes from ticker bundle`);
+    return stockData;
+
+  } catch (error) {
+    console.error('Failed to fetch ticker bundle:', error);
+    return {};
+  }
+}
+
+// ============================================================================
+// FINNHUB LIVE DATA INTEGRATION
+// ============================================================================
+
+/**
+ * Fetch live stock data from Finnhub (updated hourly by GitHub Actions)
+ * @returns {Promise<Object>} Stock data keyed by symbol
+ */
+async function fetchLiveTickerData() {
+  try {
+    console.log('Fetching live ticker data from Finnhub...');
+    const response = await fetch('../data/live_ticker.json');
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch live ticker: ${response.status}`);
+    }
+
+    const data = await response.json();
+
+    if (!data.quotes || Object.keys(data.quotes).length === 0) {
+      throw new Error('Live ticker data is empty');
+    }
+
+    const stockData = await transformLiveQuotes(data.quotes, data.fetchedAt);
+
     console.log(`✓ Loaded ${Object.keys(stockData).length} live quotes from Finnhub`);
     console.log(`  Last updated: ${data.fetchedAt}`);
     return stockData;
@@ -139,6 +210,101 @@ async function fetchLiveTickerData() {
   }
 }
 
+/**
+ * Transform Finnhub quotes (live_ticker.json format) to ticker format
+ * @param {Object} quotes - Quotes keyed by symbol
+ * @param {string} fetchedAt - Snapshot timestamp
+ * @param {Object} [snapshots] - Last closes by symbol (default: from the CSV)
+ * @returns {Promise<Object>} Stock data keyed by symbol
+ */
+async function transformLiveQuotes(quotes, fetchedAt, snapshots) {
+  const stockData = {};
+  snapshots = snapshots || await loadHistoricalSnapshots();
+
+  for (const [symbol, quote] of Object.entries(quotes)) {
+    let changePercent = quote.changePercent;
+
+    const snapshot = snapshots[symbol];
+    if (snapshot && snapshot.previous && snapshot.latest) {
+      changePercent = ((snapshot.latest - snapshot.previous) / snapshot.previous) * 100;
+    }
+
+    stockData[symbol] = {
+      symbol: quote.symbol,
+      price: quote.price.toFixed(2),
+      changePercent: Number.isFinite(changePercent) ? changePercent.toFixed(2) : '–',
+      isPositive: changePercent > 0,
+      isNegative: changePercent < 0,
+      afterHours: false,
+      source: 'finnhub',
+      fetchedAt: fetchedAt
+    };
+  }
+
+  return stockData;
+}
+
+// ============================================================================
+// LIVE PUSH CHANNEL (SERVER-SENT EVENTS)
+// ============================================================================
+
+let streamQuotes = null;   // Latest pushed quotes keyed by symbol
+let streamActive = false;  // True while the EventSource is connected
+
+/**
+ * Render the quotes received over the push channel
+ * @param {string} fetchedAt - Snapshot timestamp
+ */
+async function renderStreamQuotes(fetchedAt) {
+  // The stream exists to save bytes: take the closes from the summary, not the CSV
+  const stockData = await transformLiveQuotes(streamQuotes, fetchedAt, await loadSummarySnapshots());
+  ensurePlaceholders(stockData);
+  renderTicker(stockData);
+
+  const lastUpdatedEl = document.getElementById('last-updated');
+  if (lastUpdatedEl) {
+    lastUpdatedEl.textContent = formatTime(new Date()).split(' ')[0];
+  }
+}
+
+/**
+ * Subscribe to pushed quote changes. The server sends a snapshot on
+ * connect and then only changed symbols; EventSource reconnects on its own
+ * and resumes from the last event id.
+ * @returns {boolean} True if a stream was opened
+ */
+function connectQuoteStream() {
+  if (!TICKER_STREAM_URL || typeof EventSource === 'undefined') {
+    return false;
+  }
+
+  const source = new EventSource(TICKER_STREAM_URL);
+
+  source.addEventListener('snapshot', (event) => {
+    const data = JSON.parse(event.data);
+    streamQuotes = { ...data.quotes };
+    renderStreamQuotes(data.fetchedAt);
+  });
+
+  source.addEventListener('quotes', (event) => {
+    if (!streamQuotes) return;
+    const data = JSON.parse(event.data);
+    Object.assign(streamQuotes, data.changed);
+    data.removed.forEach(symbol => delete streamQuotes[symbol]);
+    renderStreamQuotes(data.fetchedAt);
+  });
+
+  source.onopen = () => {
+    streamActive = true;
+    console.log('✓ Connected to live quote stream');
+  };
+  source.onerror = () => {
+    streamActive = false;  // Fall back to polling until it reconnects
+  };
+
+  return true;
+}
+
 // ============================================================================
 // CSV DATA INTEGRATION (FOR CHART HISTORICAL DATA)
 // ============================================================================
@@ -507,10 +673,20 @@ async function updateTicker() {
 
   let stockData = {};
 
-  if (marketOpen) {
-    // Market is open: Try Finnhub live data first, fall back to CSV
-    console.log('Market is open - fetching live data from Finnhub...');
-    stockData = await fetchLiveTickerData();
+  if (marketOpen && streamActive) {
+    // Quotes are being pushed - nothing to poll
+    if (closingMessageEl) {
+      closingMessageEl.style.display = 'none';
+    }
+  } else if (marketOpen) {
+    // Market is open: Try the ticker bundle, then Finnhub live data, then CSV
+    console.log('Market is open - fetching live data...');
+    stockData = await fetchTickerBundle();
+
+    if (Object.keys(stockData).length < TICKER_SYMBOLS.length / 2) {
+      console.log('Ticker bundle unavailable, trying Finnhub snapshot...');
+      stockData = await fetchLiveTickerData();
+    }
 
     // If Finnhub data failed or insufficient, try CSV as fallback
     if (Object.keys(stockData).length < TICKER_SYMBOLS.length / 2) {
@@ -544,8 +720,12 @@ async function updateTicker() {
     console.log('Market is closed - loading most recent data...');
 
     if (Object.keys(lastMarketData).length === 0) {
-      // Try Finnhub first (may have after-hours data)
-      stockData = await fetchLiveTickerData();
+      // Try the ticker bundle first, then the Finnhub snapshot
+      stockData = await fetchTickerBundle();
+
+      if (Object.keys(stockData).length === 0) {
+        stockData = await fetchLiveTickerData();
+      }
 
       // If Finnhub failed, fall back to CSV
       if (Object.keys(stockData).length === 0) {
@@ -958,7 +1138,8 @@ function init() {
   // Start clock and countdown timers
   startTimers();
 
-  // Initial load
+  // Live push channel (if configured), then initial load
+  connectQuoteStream();
   updateTicker();
 
   // Auto-refresh every 60 seconds (synced with countdown)
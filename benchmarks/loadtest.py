@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+SCALE TEST HARNESS
+=============================================================================
+
+Runs the real fetch, dedup and store code against a local stand-in server
+at universe sizes well beyond production (thousands of symbols, hundreds
+of feeds), and reports throughput and memory per scenario.
+
+The stand-in server (stdlib, threaded, keep-alive) emulates:
+
+    /api/v1/quote?symbol=X      Finnhub quote, with a token-bucket rate limit
+                                that answers 429 + X-Ratelimit-* headers
+    /feeds/<n>.xml              Synthetic RSS feed; a share of the stories is
+                                syndicated across feeds so dedup has work
+    /history/<SYM>.csv          Daily OHLCV bars (yfinance history() frame)
+
+Every response waits --latency-ms (+/- --jitter-ms) before answering.
+
+Scenarios:
+    ticker      fetch_all_quotes + save_quotes for --symbols symbols
+    news        fetch_all_feeds + dedup/filter/sort + story clustering + save_to_json
+                for --feeds feeds
+    history     fetch_stock_data + validation + merge_history + CSV publish: a full backfill
+                of --years years, an incremental week on top of it, then a rebuild of
+                the whole range from scratch (served by the history cache)
+
+The scripts' fixed rate-limit sleeps are skipped and reported as
+"throttle" (time production would spend waiting). Outputs are published
+to a temporary directory, never to data/.
+
+Usage:
+    python benchmarks/loadtest.py                          # 5000 symbols, 500 feeds
+    python benchmarks/loadtest.py --quick                  # Small smoke-test universe
+    python benchmarks/loadtest.py --scenarios news --feeds 1000 --latency-ms 80
+    python benchmarks/loadtest.py --rate-limit 0           # No 429s
+
+Results are written to benchmarks/results/loadtest-<git-sha>.json (or --output).
+=============================================================================
+"""
+
+import argparse
+import functools
+import io
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from run_benchmarks import REPO_ROOT, RESULTS_DIR, git_revision, quiet, synthetic_symbols
+
+import run_metrics
+
+try:
+    import resource
+except ImportError:  # Not available on Windows - peak RSS is not reported
+    resource = None
+
+# Captured before the scenarios patch time.sleep out of the fetchers
+_sleep = time.sleep
+
+
+# =============================================================================
+# STAND-IN SERVER
+# =============================================================================
+
+class TokenBucket:
+    """Requests-per-second limiter (rate 0 = unlimited)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """
+        Returns:
+            tuple: (allowed, remaining)
+        """
+        if not self.rate:
+            return True, None
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False, 0
+            self.tokens -= 1
+            return True, int(self.tokens)
+
+
+def _seed(text):
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def quote_body(symbol):
+    """Deterministic Finnhub /quote body for a symbol"""
+    rng = random.Random(_seed(symbol) ^ int(time.time() // 60))
+    prev_close = 10 + (_seed(symbol) % 50000) / 100
+    current = prev_close * (1 + rng.uniform(-0.05, 0.05))
+    return {
+        'c': round(current, 2),
+        'd': round(current - prev_close, 2),
+        'dp': round((current - prev_close) / prev_close * 100, 4),
+        'h': round(max(current, prev_close) * 1.01, 2),
+        'l': round(min(current, prev_close) * 0.99, 2),
+        'o': round(prev_close * (1 + rng.uniform(-0.01, 0.01)), 2),
+        'pc': round(prev_close, 2),
+        't': int(time.time()),
+    }
+
+
+def feed_body(index, items, overlap, host):
+    """
+    Synthetic RSS 2.0 feed
+
+    A fraction `overlap` of the items are syndicated stories shared by all
+    feeds (same link), the rest are unique to this feed.
+    """
+    rng = random.Random(index)
+    now = datetime.now(timezone.utc)
+    shared = int(items * overlap)
+
+    entries = []
+    for i in range(items):
+        story = f"shared-{i}" if i < shared else f"feed{index}-{i}"
+        published = now - timedelta(minutes=rng.randint(0, 20 * 24 * 60))
+        entries.append(
+            f"<item><title>Franchise story {story}</title>"
+            f"<link>http://{host}/story/{story}</link>"
+            f"<guid>http://{host}/story/{story}</guid>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            f"<description>&lt;p&gt;Synthetic summary for {story}. "
+            f"{'Lorem ipsum dolor sit amet. ' * rng.randint(2, 8)}&lt;/p&gt;</description></item>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<rss version="2.0"><channel><title>Synthetic feed {index}</title>'
+        f'<link>http://{host}/</link><description>Load test feed</description>'
+        + ''.join(entries) + '</channel></rss>'
+    ).encode('utf-8')
+
+
+def history_body(symbol, start, end):
+    """Daily bars (weekdays) between start and end as a yfinance-style CSV"""
+    seed = _seed(symbol)
+    base = 10 + (seed % 50000) / 100
+    lines = ['Date,Open,High,Low,Close,Volume,Dividends,Stock Splits']
+
+    # Each day's bar depends only on (symbol, day), so a backfill and a later
+    # incremental fetch agree on the overlapping days
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            rng = random.Random(seed ^ day.toordinal())
+            trend = base * (1 + 0.3 * math.sin(day.toordinal() / 90 + seed % 7))
+            open_ = trend * (1 + rng.uniform(-0.01, 0.01))
+            close = trend * (1 + rng.uniform(-0.01, 0.01))
+            high = max(open_, close) * (1 + rng.uniform(0, 0.01))
+            low = min(open_, close) * (1 - rng.uniform(0, 0.01))
+            lines.append(f"{day.isoformat()},{open_:.4f},{high:.4f},{low:.4f},{close:.4f},"
+                         f"{rng.randint(100000, 5000000)},0.0,0.0")
+        day += timedelta(days=1)
+
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # Keep-alive, like the real providers
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        latency = server.latency + random.uniform(-server.jitter, server.jitter)
+        if latency > 0:
+            _sleep(latency)
+
+        server.count('requests')
+
+        if url.path == '/api/v1/quote':
+            allowed, remaining = server.bucket.take()
+            headers = {}
+            if server.bucket.rate:
+                headers = {'X-Ratelimit-Limit': str(server.bucket.rate),
+                           'X-Ratelimit-Remaining': str(remaining),
+                           'X-Ratelimit-Reset': str(int(time.time()) + 1)}
+            if not allowed:
+                server.count('rate_limited')
+                self.send_body(429, b'{"error":"API limit reached. Please try again later."}',
+                               'application/json', headers)
+                return
+            body = json.dumps(quote_body(query.get('symbol', ''))).encode('utf-8')
+            self.send_body(200, body, 'application/json', headers)
+
+        elif url.path.startswith('/feeds/') and url.path.endswith('.xml'):
+            index = int(url.path[len('/feeds/'):-len('.xml')])
+            self.send_body(200, server.feed(index, self.headers.get('Host', 'localhost')),
+                           'application/rss+xml')
+
+        elif url.path.startswith('/history/') and url.path.endswith('.csv'):
+            symbol = url.path[len('/history/'):-len('.csv')]
+            start = datetime.strptime(query['start'], '%Y-%m-%d').date()
+            end = datetime.strptime(query['end'], '%Y-%m-%d').date()
+            self.send_body(200, history_body(symbol, start, end), 'text/csv')
+
+        else:
+            self.send_body(404, b'not found', 'text/plain')
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit=30, items_per_feed=50, overlap=0.3):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.latency = latency
+        self.jitter = min(jitter, latency)
+        self.bucket = TokenBucket(rate_limit)
+        self.items_per_feed = items_per_feed
+        self.overlap = overlap
+        self.stats = {}
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def feed(self, index, host):
+        body = self._feeds.get(index)
+        if body is None:
+            body = self._feeds[index] = feed_body(index, self.items_per_feed, self.overlap, host)
+        return body
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='stand-in-server', daemon=True).start()
+        return self
+
+
+class StandInTicker:
+    """yfinance.Ticker stand-in that downloads history from the stand-in server"""
+
+    session = None
+
+    def __init__(self, base_url, symbol):
+        self.base_url = base_url
+        self.symbol = symbol
+
+    def history(self, start=None, end=None, **kwargs):
+        import pandas as pd
+        import requests
+
+        if StandInTicker.session is None:
+            StandInTicker.session = requests.Session()
+
+        response = StandInTicker.session.get(
+            f"{self.base_url}/history/{self.symbol}.csv",
+            params={'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')},
+            timeout=30,
+        )
+        response.raise_for_status()
+        frame = pd.read_csv(io.BytesIO(response.content))
+        frame['Date'] = pd.to_datetime(frame['Date']).dt.tz_localize('America/New_York')
+        return frame.set_index('Date')
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+class Throttle:
+    """Stands in for time.sleep in the fetchers: records instead of waiting"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+
+    def __call__(self, seconds):
+        self.seconds += seconds
+        self.calls += 1
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def request_summary(run):
+    """Request counts by status from a run_metrics run"""
+    statuses = {}
+    for (name, labels), value in run.counters.items():
+        if name == 'requests_total':
+            status = dict(labels)['status']
+            statuses[status] = statuses.get(status, 0) + value
+    return statuses
+
+
+def measure(name, func, workdir, **details):
+    """Run one scenario step under run_metrics and collect its numbers"""
+    throttle = Throttle()
+    started = time.perf_counter()
+    with mock.patch.object(time, 'sleep', throttle), quiet(), \
+            run_metrics.job_run(f"loadtest_{name}", directory=workdir / 'metrics') as run:
+        items = func()
+    wall = time.perf_counter() - started
+
+    result = {
+        'items': items,
+        'wall_seconds': round(wall, 3),
+        'items_per_second': round(items / wall, 1) if wall else None,
+        'throttle_seconds_skipped': round(throttle.seconds, 1),
+        'requests': request_summary(run),
+        'peak_rss_mb': peak_rss_mb(),
+        **details,
+    }
+    print(f"  {name:<22} {items:>9,} items  {wall:>8.2f}s  {result['items_per_second'] or 0:>10,.1f}/s"
+          f"  requests {sum(result['requests'].values()):>6,} ({result['requests'].get('429', 0):,} x 429)"
+          f"  throttle {throttle.seconds:>7.0f}s  peak RSS {result['peak_rss_mb']} MB")
+    return result
+
+
+def scenario_ticker(server, args, workdir):
+    import fetch_live_ticker_finnhub as ticker
+    import intraday_store
+    import ticker_bundle
+    import validation
+    from publisher import publish_json
+
+    symbols = synthetic_symbols(args.symbols)
+    quotes = {}
+
+    def run():
+        with mock.patch.object(ticker, 'TICKER_SYMBOLS', symbols), \
+                mock.patch.object(ticker, 'FINNHUB_BASE_URL', f"{server.base_url}/api/v1"), \
+                mock.patch.object(ticker, 'FINNHUB_API_KEY', 'loadtest'), \
+                mock.patch.object(ticker, 'OUTPUT_FILE', workdir / 'live_ticker.json'), \
+                mock.patch.object(ticker, 'publish_json',
+                                  functools.partial(publish_json, manifest_path=workdir / 'manifest.json')), \
+                mock.patch.object(ticker_bundle, 'publish_json',
+                                  functools.partial(publish_json, manifest_path=workdir / 'manifest.json')), \
+                mock.patch.object(ticker_bundle, 'LIVE_TICKER_FILE', workdir / 'live_ticker.json'), \
+                mock.patch.object(ticker.ticker_bundle, 'publish_bundle',
+                                  functools.partial(ticker_bundle.publish_bundle, summary={},
+                                                    path=workdir / 'ticker_bundle.json')), \
+                mock.patch.object(ticker.intraday_store, 'record_snapshot',
+                                  functools.partial(intraday_store.record_snapshot,
+                                                    store_path=workdir / 'intraday' / 'store.bin',
+                                                    intraday_dir=workdir / 'intraday')), \
+                mock.patch.object(validation, 'quarantine',
+                                  functools.partial(validation.quarantine, directory=workdir / 'quarantine')):
+            quotes.update(ticker.fetch_all_quotes())
+            ticker.save_quotes(quotes)
+        return len(quotes)
+
+    result = measure('ticker', run, workdir, symbols=len(symbols))
+    result['failed'] = len(symbols) - len(quotes)
+    return {'ticker': result}
+
+
+def scenario_news(server, args, workdir):
+    import fetch_franchise_news_rss as news
+    import story_clustering
+    from publisher import publish_json
+
+    feeds = [{'url': f"{server.base_url}/feeds/{i}.xml", 'name': f"Synthetic {i}", 'category': 'trade_press'}
+             for i in range(args.feeds)]
+    published = []
+
+    def run():
+        health = {'feeds': {}}
+        with mock.patch.object(news, 'RSS_FEEDS', feeds), \
+                mock.patch.object(news, 'GOOGLE_NEWS_FEEDS', []), \
+                mock.patch.object(news, 'MAX_ARTICLES_PER_FEED', args.items_per_feed), \
+                mock.patch.object(news, 'publish_json',
+                                  functools.partial(publish_json, manifest_path=workdir / 'manifest.json')), \
+                mock.patch.object(story_clustering, 'publish_json',
+                                  functools.partial(publish_json, manifest_path=workdir / 'manifest.json')):
+            articles = news.fetch_all_feeds(health)
+            unique = news.deduplicate_articles(articles)
+            final = news.sort_articles(news.filter_recent_articles(unique))
+            with run_metrics.stage('cluster'):
+                top_stories = story_clustering.build_top_stories(final)
+            news.save_to_json(final, workdir / 'franchise_news.json')
+            story_clustering.save_top_stories(top_stories, workdir / 'top_stories.json')
+        published.extend([len(articles), len(final)])
+        return len(articles)
+
+    result = measure('news', run, workdir, feeds=len(feeds))
+    result['articles_published'] = published[1]
+    result['duplicates_removed'] = published[0] - published[1]
+    return {'news': result}
+
+
+def scenario_history(server, args, workdir):
+    import pandas as pd
+    import history_cache
+    import update_franchise_stocks as history
+    import validation
+    from publisher import publish_bytes
+
+    symbols = synthetic_symbols(args.symbols)
+    end = datetime.now()
+    split = end - timedelta(days=7)
+    store = {}
+
+    def fetch_and_store(start, stop):
+        frames = [history.fetch_stock_data(symbol, start, stop) for symbol in symbols]
+        new_df = pd.concat([f for f in frames if f is not None], ignore_index=True)
+        new_df = validation.screen_history(new_df, store.get('df'))
+        combined = history.merge_history(store.get('df'), new_df)
+        publish_bytes(combined.to_csv(index=False).encode('utf-8'),
+                      workdir / 'franchise_stocks.csv', name=False)
+        store['df'] = combined
+        return len(new_df)
+
+    def rebuild():
+        store.pop('df')
+        return fetch_and_store(split - timedelta(days=365 * args.years), end)
+
+    results = {}
+    with mock.patch.object(history.yf, 'Ticker', functools.partial(StandInTicker, server.base_url)), \
+            mock.patch.object(history.history_cache, 'fetch',
+                              functools.partial(history_cache.fetch, cache_dir=workdir / 'cache')), \
+            mock.patch.object(validation, 'quarantine',
+                              functools.partial(validation.quarantine, directory=workdir / 'quarantine')):
+        results['history.backfill'] = measure(
+            'history.backfill',
+            lambda: fetch_and_store(split - timedelta(days=365 * args.years), split),
+            workdir, symbols=len(symbols), years=args.years)
+        results['history.incremental'] = measure(
+            'history.incremental', lambda: fetch_and_store(split + timedelta(days=1), end),
+            workdir, symbols=len(symbols))
+        results['history.incremental']['store_rows'] = len(store['df'])
+        results['history.rebuild'] = measure('history.rebuild', rebuild, workdir, symbols=len(symbols))
+    return results
+
+
+SCENARIOS = {
+    'ticker': scenario_ticker,
+    'news': scenario_news,
+    'history': scenario_history,
+}
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scale test the data pipelines against a local stand-in server")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})")
+    parser.add_argument('--symbols', type=int, default=5000, help="Symbol universe size (default 5000)")
+    parser.add_argument('--years', type=int, default=1, help="History backfill years (default 1)")
+    parser.add_argument('--feeds', type=int, default=500, help="Number of feeds (default 500)")
+    parser.add_argument('--items-per-feed', type=int, default=50, help="Items per feed (default 50)")
+    parser.add_argument('--overlap', type=float, default=0.3,
+                        help="Share of each feed syndicated across all feeds (default 0.3)")
+    parser.add_argument('--latency-ms', type=float, default=20, help="Server response latency (default 20)")
+    parser.add_argument('--jitter-ms', type=float, default=10, help="Latency jitter (default 10)")
+    parser.add_argument('--rate-limit', type=int, default=30,
+                        help="Quote requests per second before 429s, 0 = unlimited (default 30)")
+    parser.add_argument('--quick', action='store_true', help="Small universe: 200 symbols, 20 feeds")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/loadtest-<git-sha>.json)")
+    args = parser.parse_args(argv)
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if args.quick:
+        args.symbols, args.feeds = min(args.symbols, 200), min(args.feeds, 20)
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    revision = git_revision()
+
+    server = StandInServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                           rate_limit=args.rate_limit, items_per_feed=args.items_per_feed,
+                           overlap=args.overlap).start()
+
+    print("=" * 70)
+    print(f"🏋️  SCALE TEST ({revision}) against {server.base_url}")
+    print("=" * 70)
+    print(f"  symbols {args.symbols:,}  feeds {args.feeds:,} x {args.items_per_feed} items"
+          f"  latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms  rate limit {args.rate_limit or 'off'}/s\n")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='loadtest-') as tmp:
+        for name in args.scenarios:
+            results.update(SCENARIOS[name](server, args, Path(tmp)))
+
+    server.shutdown()
+
+    report = {
+        'meta': {
+            'revision': revision,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {key: value for key, value in vars(args).items() if key != 'output'},
+            'server': server.stats,
+        },
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"loadtest-{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    print(f"\n💾 Saved results to {output.relative_to(REPO_ROOT) if output.is_relative_to(REPO_ROOT) else output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
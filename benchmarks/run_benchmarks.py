@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+OFFLINE PIPELINE BENCHMARKS
+=============================================================================
+
+Times each stage of the data pipelines separately, at several data sizes,
+entirely offline. Network calls are replaced by a fake transport that
+serves the recorded provider responses in benchmarks/fixtures/:
+
+    finnhub_quote.json      Finnhub /quote body
+    rss_wordpress.xml       WordPress RSS 2.0 feed
+    atom_feed.xml           Atom feed
+    google_news.xml         Google News search feed
+    yfinance_history.csv    yfinance Ticker.history() frame (one year)
+
+Larger inputs are built by replicating fixture items with unique links,
+so parsing/normalizing/dedup work scales like real data.
+
+Stages:
+    ticker.fetch        fetch_all_quotes (mocked transport, no rate-limit sleep)
+    ticker.serialize    compact JSON of the live_ticker payload
+    news.parse          feedparser.parse of a feed body
+    news.fetch          fetch_rss_feed (mocked transport: fetch + parse + normalize)
+    news.dedup          deduplicate_articles
+    news.sort           filter_recent_articles + sort_articles
+    news.serialize      compact JSON of the article list
+    history.fetch       fetch_stock_data (mocked yfinance)
+    history.merge       merge_history (existing CSV + one new day)
+    history.serialize   DataFrame.to_csv
+    startup.import      Importing a command module in a fresh interpreter
+                        (heavy dependencies must stay lazy)
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # All stages
+    python benchmarks/run_benchmarks.py --stages news       # Stage prefix filter
+    python benchmarks/run_benchmarks.py --quick             # Smallest sizes, fewer runs
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+
+Results are written to benchmarks/results/<git-sha>.json (or --output).
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+FIXTURES = BENCH_DIR / "fixtures"
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+STAGES = {}
+
+
+def stage(name, sizes, quick_sizes=None):
+    """
+    Register a benchmark stage
+
+    The decorated function receives a size, does its (untimed) setup and
+    returns a zero-argument callable that is timed.
+    """
+    def register(func):
+        STAGES[name] = {'setup': func, 'sizes': sizes, 'quick_sizes': quick_sizes or sizes[:1]}
+        return func
+    return register
+
+
+# =============================================================================
+# FIXTURES & FAKE TRANSPORT
+# =============================================================================
+
+def fixture_bytes(name):
+    return (FIXTURES / name).read_bytes()
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the fetchers"""
+
+    def __init__(self, content, status_code=200, url=''):
+        self.content = content
+        self.status_code = status_code
+        self.reason = 'OK' if status_code == 200 else 'Error'
+        self.url = url
+        self.headers = {'Content-Type': 'application/xml'}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Session whose get() serves canned bodies (callable: url, params -> bytes)"""
+
+    def __init__(self, body_for):
+        self.body_for = body_for
+
+    def get(self, url, params=None, **kwargs):
+        return FakeResponse(self.body_for(url, params), url=url)
+
+
+_ITEM_RE = re.compile(rb'(<item>.*?</item>|<entry>.*?</entry>)', re.S)
+
+
+def scale_feed(body, count):
+    """Rebuild a feed with `count` items by replicating its items with unique links"""
+    items = _ITEM_RE.findall(body)
+    start = body.index(items[0])
+    end = body.index(items[-1]) + len(items[-1])
+
+    scaled = []
+    for i in range(count):
+        item = items[i % len(items)]
+        copy = i // len(items)
+        if copy:
+            suffix = f"?copy={copy}".encode()
+            item = re.sub(rb'(</link>|</guid>|</id>)', suffix + rb'\1', item)
+            item = re.sub(rb'(href="[^"?]+)', rb'\1' + suffix, item)
+        scaled.append(item)
+
+    return body[:start] + b'\n'.join(scaled) + body[end:]
+
+
+def quiet():
+    """Silence the scripts' progress output while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def synthetic_symbols(count):
+    return [f"S{i:04d}" for i in range(count)]
+
+
+# =============================================================================
+# TICKER STAGES
+# =============================================================================
+
+@stage('ticker.fetch', sizes=[34, 500, 5000], quick_sizes=[34])
+def bench_ticker_fetch(size):
+    import fetch_live_ticker_finnhub as ticker
+
+    body = fixture_bytes('finnhub_quote.json')
+    symbols = synthetic_symbols(size)
+
+    def run():
+        with mock.patch.object(ticker, 'TICKER_SYMBOLS', symbols), \
+                mock.patch.object(ticker, 'SESSION', FakeSession(lambda url, params: body)), \
+                mock.patch.object(ticker.time, 'sleep', lambda seconds: None), quiet():
+            ticker.fetch_all_quotes()
+    return run
+
+
+@stage('ticker.serialize', sizes=[34, 500, 5000], quick_sizes=[34])
+def bench_ticker_serialize(size):
+    import fetch_live_ticker_finnhub as ticker
+    from publisher import dumps_compact
+
+    body = fixture_bytes('finnhub_quote.json')
+    with mock.patch.object(ticker, 'SESSION', FakeSession(lambda url, params: body)), quiet():
+        quote = ticker.fetch_quote('MCD')
+    output = {
+        'quotes': {s: replace(quote, symbol=s) for s in synthetic_symbols(size)},
+        'fetchedAt': datetime.now(timezone.utc).isoformat(),
+        'count': size,
+        'source': 'finnhub',
+    }
+    return lambda: dumps_compact(output)
+
+
+# =============================================================================
+# NEWS STAGES
+# =============================================================================
+
+FEED_FIXTURES = ['rss_wordpress.xml', 'atom_feed.xml', 'google_news.xml']
+
+
+def _feed_bodies(size):
+    return {name: scale_feed(fixture_bytes(name), size) for name in FEED_FIXTURES}
+
+
+@stage('news.parse', sizes=[20, 100, 500], quick_sizes=[20])
+def bench_news_parse(size):
+    import feedparser
+
+    bodies = list(_feed_bodies(size).values())
+    return lambda: [feedparser.parse(body) for body in bodies]
+
+
+def _fetch_articles(size):
+    """Run fetch_rss_feed over every fixture feed (mocked transport)"""
+    import fetch_franchise_news_rss as news
+
+    bodies = _feed_bodies(size)
+    feeds = [
+        ({'url': f"https://fixtures.local/{name}", 'name': name, 'category': 'trade_press'},
+         'google_news' if name.startswith('google') else 'rss')
+        for name in FEED_FIXTURES
+    ]
+    session = FakeSession(lambda url, params: bodies[url.rsplit('/', 1)[-1]])
+
+    def run():
+        articles = []
+        with mock.patch.object(news, 'SESSION', session), \
+                mock.patch.object(news, 'MAX_ARTICLES_PER_FEED', size), quiet():
+            for config, source_type in feeds:
+                articles.extend(news.fetch_rss_feed(config, source_type=source_type))
+        return articles
+    return run
+
+
+@stage('news.fetch', sizes=[20, 100, 500], quick_sizes=[20])
+def bench_news_fetch(size):
+    return _fetch_articles(size)
+
+
+def _article_set(size, duplicate_ratio=0.3):
+    """`size` normalized articles of which ~duplicate_ratio repeat a URL"""
+    unique = max(1, int(size * (1 - duplicate_ratio)))
+    base = _fetch_articles(max(20, unique // len(FEED_FIXTURES) + 1))()[:unique]
+    return [copy.copy(base[i % len(base)]) for i in range(size)]
+
+
+@stage('news.dedup', sizes=[100, 1000, 10000], quick_sizes=[100])
+def bench_news_dedup(size):
+    import fetch_franchise_news_rss as news
+
+    articles = _article_set(size)
+    return lambda: news.deduplicate_articles(articles)
+
+
+@stage('news.sort', sizes=[100, 1000, 10000], quick_sizes=[100])
+def bench_news_sort(size):
+    import fetch_franchise_news_rss as news
+
+    articles = _article_set(size)
+    return lambda: news.sort_articles(news.filter_recent_articles(articles))
+
+
+@stage('news.serialize', sizes=[100, 1000, 10000], quick_sizes=[100])
+def bench_news_serialize(size):
+    from publisher import dumps_compact
+
+    articles = _article_set(size)
+    return lambda: dumps_compact(articles)
+
+
+# =============================================================================
+# HISTORY STAGES
+# =============================================================================
+
+def _yfinance_frame(years):
+    """The recorded one-year frame tiled back `years` years"""
+    import pandas as pd
+
+    frame = pd.read_csv(FIXTURES / 'yfinance_history.csv')
+    frame['Date'] = pd.to_datetime(frame['Date'], utc=True).dt.tz_convert('America/New_York')
+    frame = frame.set_index('Date')
+
+    copies = []
+    for year in range(years):
+        copy = frame.copy()
+        copy.index = copy.index - pd.DateOffset(years=year)
+        copies.append(copy)
+    return pd.concat(copies[::-1])
+
+
+class FakeTicker:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def history(self, start=None, end=None, **kwargs):
+        return self.frame.copy()
+
+
+@stage('history.fetch', sizes=[1, 5, 10], quick_sizes=[1])
+def bench_history_fetch(size):
+    import update_franchise_stocks as history
+
+    frame = _yfinance_frame(size)
+
+    def run():
+        with mock.patch.object(history.yf, 'Ticker', lambda symbol: FakeTicker(frame)), quiet():
+            history.fetch_stock_data('MCD', None, None)
+    return run
+
+
+def _history_store(symbols, years):
+    """Existing CSV contents for `symbols` symbols over `years` years"""
+    import pandas as pd
+    import update_franchise_stocks as history
+
+    frame = _yfinance_frame(years)
+    with mock.patch.object(history.yf, 'Ticker', lambda symbol: FakeTicker(frame)), quiet():
+        one = history.fetch_stock_data('MCD', None, None)
+
+    frames = []
+    for symbol in synthetic_symbols(symbols):
+        copy = one.copy()
+        copy['symbol'] = symbol
+        frames.append(copy)
+    return pd.concat(frames, ignore_index=True)
+
+
+HISTORY_SIZES = {'34x1y': (34, 1), '34x10y': (34, 10), '500x10y': (500, 10)}
+
+
+@stage('history.merge', sizes=list(HISTORY_SIZES), quick_sizes=['34x1y'])
+def bench_history_merge(size):
+    import update_franchise_stocks as history
+
+    existing = _history_store(*HISTORY_SIZES[size])
+    last_day = existing['date'].max()
+    new = existing[existing['date'] == last_day].copy()
+    new['close'] = new['close'] * 1.01
+    return lambda: history.merge_history(existing, new)
+
+
+@stage('history.serialize', sizes=list(HISTORY_SIZES), quick_sizes=['34x1y'])
+def bench_history_serialize(size):
+    existing = _history_store(*HISTORY_SIZES[size])
+    return lambda: existing.to_csv(index=False)
+
+
+# =============================================================================
+# STARTUP STAGES
+# =============================================================================
+
+@stage('startup.import', sizes=['ticker', 'history', 'news'], quick_sizes=['ticker', 'history', 'news'])
+def bench_startup_import(size):
+    import franchise_data
+
+    module_name = franchise_data.COMMANDS[size][0]
+    command = [sys.executable, '-c', f"import sys; sys.path.insert(0, {str(REPO_ROOT / 'scripts')!r}); "
+                                     f"import {module_name}"]
+    return lambda: subprocess.run(command, check=True, cwd=REPO_ROOT)
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def time_callable(func, runs, min_time=0.0):
+    """Time func `runs` times (and at least min_time seconds in total)"""
+    func()  # Warm-up (imports, caches)
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < runs or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+    return {
+        'runs': len(samples),
+        'min_ms': round(min(samples) * 1000, 4),
+        'median_ms': round(statistics.median(samples) * 1000, 4),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'stdev_ms': round(statistics.stdev(samples) * 1000, 4) if len(samples) > 1 else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmarks(prefixes=None, quick=False, runs=5):
+    results = {}
+    for name, config in STAGES.items():
+        if prefixes and not any(name.startswith(p) for p in prefixes):
+            continue
+
+        results[name] = {}
+        for size in (config['quick_sizes'] if quick else config['sizes']):
+            try:
+                func = config['setup'](size)
+                timing = time_callable(func, runs=runs)
+            except ImportError as e:
+                print(f"  ⏭️  {name} [{size}]: skipped ({e})")
+                continue
+            results[name][str(size)] = timing
+            print(f"  {name:<20} {str(size):>8}  median {timing['median_ms']:>10.3f} ms"
+                  f"  (min {timing['min_ms']:.3f}, n={timing['runs']})")
+    return results
+
+
+def compare(current, baseline_path, threshold):
+    """
+    Print median deltas against a previous results file
+
+    Returns:
+        int: Number of stage/size pairs slower than the threshold
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\n📊 Compared with {baseline_path} ({baseline['meta'].get('revision')})")
+    regressions = 0
+    for name, sizes in current.items():
+        for size, timing in sizes.items():
+            old = baseline['results'].get(name, {}).get(size)
+            if not old or not old['median_ms']:
+                continue
+            change = (timing['median_ms'] - old['median_ms']) / old['median_ms'] * 100
+            marker = '  '
+            if change > threshold:
+                marker = '🔺'
+                regressions += 1
+            elif change < -threshold:
+                marker = '🟢'
+            print(f"  {marker} {name:<20} {size:>8}  {old['median_ms']:>10.3f} -> "
+                  f"{timing['median_ms']:>10.3f} ms  ({change:+.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks")
+    parser.add_argument('--stages', help="Comma-separated stage name prefixes (e.g. news,history.merge)")
+    parser.add_argument('--quick', action='store_true', help="Smallest size per stage only")
+    parser.add_argument('--runs', type=int, default=5, help="Timed runs per stage and size (default 5)")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/<git-sha>.json)")
+    parser.add_argument('--compare', help="Previous results file to diff against")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="Percent slowdown reported as a regression (default 10)")
+    args = parser.parse_args(argv)
+
+    prefixes = [p.strip() for p in args.stages.split(',')] if args.stages else None
+    revision = git_revision()
+
+    print("=" * 70)
+    print(f"⏱️  OFFLINE PIPELINE BENCHMARKS ({revision})")
+    print("=" * 70)
+
+    # The fetchers resolve data/ paths relative to the repository root
+    os.chdir(REPO_ROOT)
+    results = run_benchmarks(prefixes, quick=args.quick, runs=args.runs)
+
+    report = {
+        'meta': {
+            'revision': revision,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    print(f"\n💾 Saved results to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n🔺 {regressions} regressions above {args.threshold:.0f}%")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Enrich news articles with Open Graph metadata from the article pages.
+
+For every article without a cached result, the page is fetched and only
+its <head> is read: the response is streamed and the connection dropped as
+soon as </head> (or <body>) arrives, then the tags are pulled out with the
+stdlib HTMLParser, which is much lighter than building a full soup for
+pages that are mostly body. Extracted fields:
+
+    image_url       - og:image / twitter:image
+    description     - og:description / description meta
+    canonical_url   - <link rel="canonical"> / og:url
+
+Results are cached by article id in data/article_enrichment.json, so each
+page is fetched once (one retry for failures). Fetches run concurrently
+with a global worker pool, a per-host limit and an overall time budget;
+articles not reached within the budget are simply picked up next run.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from publisher import write_state
+
+CACHE_PATH = Path("data/article_enrichment.json")
+
+MAX_WORKERS = 16             # Concurrent page fetches overall
+PER_HOST_LIMIT = 2           # Concurrent page fetches per host
+REQUEST_TIMEOUT = 8          # Seconds per page
+TIME_BUDGET = 120            # Seconds for the whole stage
+MAX_HEAD_BYTES = 256 * 1024  # Give up on pages whose <head> is larger
+MAX_ATTEMPTS = 2             # Fetch attempts per article before giving up
+CACHE_TTL_DAYS = 45          # Articles are only kept 30 days
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+SKIP_HOSTS = {'news.google.com'}   # Unresolved redirect pages have no metadata
+
+_thread_local = threading.local()
+
+
+class _HeadComplete(Exception):
+    """Raised by the parser once the document head has been read"""
+
+
+class HeadMetaParser(HTMLParser):
+    """Collect <meta> and <link rel="canonical"> tags until the head ends"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.canonical = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            raise _HeadComplete()
+
+        attrs = dict(attrs)
+        if tag == 'meta':
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            content = attrs.get('content')
+            if key and content and key not in self.meta:
+                self.meta[key] = content.strip()
+        elif tag == 'link' and 'canonical' in (attrs.get('rel') or '').lower().split():
+            self.canonical = self.canonical or attrs.get('href')
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            raise _HeadComplete()
+
+
+def parse_head(html_text, base_url):
+    """
+    Extract Open Graph fields from (the head of) an HTML document
+
+    Returns:
+        dict: {'image_url', 'description', 'canonical_url'} (values may be None)
+    """
+    parser = HeadMetaParser()
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except _HeadComplete:
+        pass
+
+    meta = parser.meta
+    image = meta.get('og:image') or meta.get('og:image:url') or meta.get('twitter:image')
+    description = meta.get('og:description') or meta.get('description') or meta.get('twitter:description')
+    canonical = parser.canonical or meta.get('og:url')
+
+    return {
+        'image_url': urljoin(base_url, image) if image else None,
+        'description': ' '.join(description.split()) if description else None,
+        'canonical_url': urljoin(base_url, canonical) if canonical else None,
+    }
+
+
+def _session():
+    """One requests session per worker thread (keeps connections alive)"""
+    if not hasattr(_thread_local, 'session'):
+        _thread_local.session = requests.Session()
+        _thread_local.session.headers.update(HEADERS)
+    return _thread_local.session
+
+
+def fetch_head(url):
+    """
+    Download a page only up to the end of its <head>
+
+    Returns:
+        tuple: (head HTML text, final URL)
+    """
+    with _session().get(url, timeout=REQUEST_TIMEOUT, stream=True, allow_redirects=True) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type:
+            raise ValueError(f"not HTML ({content_type or 'no content type'})")
+
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            buffer += chunk
+            lowered = bytes(buffer[-len(chunk) - 16:]).lower()
+            if b'</head' in lowered or b'<body' in lowered or len(buffer) >= MAX_HEAD_BYTES:
+                break
+
+        encoding = response.encoding or 'utf-8'
+        if encoding.lower() == 'iso-8859-1':  # requests' default when no charset is sent
+            encoding = 'utf-8'
+
+        return buffer.decode(encoding, errors='replace'), response.url
+
+
+def enrich_one(url):
+    """
+    Fetch and parse one article page
+
+    Returns:
+        dict: Extracted fields, or {'error': message}
+    """
+    try:
+        head, final_url = fetch_head(url)
+        return parse_head(head, final_url)
+    except Exception as e:  # noqa: BLE001 - recorded in the cache and retried once
+        return {'error': str(e)[:200]}
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def load_cache(path=CACHE_PATH):
+    """Load the enrichment cache (article id -> entry)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    """Persist the enrichment cache, dropping entries older than the TTL"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=CACHE_TTL_DAYS)).isoformat()
+    kept = {key: entry for key, entry in cache.items() if entry.get('enriched_at', '') >= cutoff}
+    write_state(dict(sorted(kept.items())), path)
+
+
+def _needs_fetch(entry):
+    if entry is None:
+        return True
+    return 'error' in entry and entry.get('attempts', 0) < MAX_ATTEMPTS
+
+
+# =============================================================================
+# STAGE
+# =============================================================================
+
+def enrich_articles(articles, cache_path=CACHE_PATH, max_workers=MAX_WORKERS,
+                    per_host_limit=PER_HOST_LIMIT, time_budget=TIME_BUDGET):
+    """
+    Add image_url / description / canonical_url to articles (in place)
+
+    Args:
+        articles: Article records
+        cache_path: Enrichment cache location
+        max_workers: Global concurrency
+        per_host_limit: Concurrency per host
+        time_budget: Seconds after which no new fetches are started
+
+    Returns:
+        list: The same articles
+    """
+    cache = load_cache(cache_path)
+    pending = [a for a in articles
+               if urlparse(a.url).netloc not in SKIP_HOSTS and _needs_fetch(cache.get(a.id))]
+
+    if pending:
+        print(f"\n🖼️  Enriching {len(pending)} articles ({len(articles) - len(pending)} cached)...")
+        started = time.monotonic()
+        deadline = started + time_budget
+        lock = threading.Lock()
+        counts = {'ok': 0, 'failed': 0, 'skipped': 0}
+
+        def work(article):
+            with host_limits[urlparse(article.url).netloc]:
+                if time.monotonic() >= deadline:
+                    with lock:
+                        counts['skipped'] += 1
+                    return
+
+                result = enrich_one(article.url)
+                now = datetime.now(timezone.utc).isoformat()
+
+                with lock:
+                    attempts = cache.get(article.id, {}).get('attempts', 0) + 1
+                    cache[article.id] = dict(result, enriched_at=now, attempts=attempts)
+                    counts['failed' if 'error' in result else 'ok'] += 1
+
+        # Interleave hosts so one slow site does not hold up the queue
+        by_host = defaultdict(list)
+        for article in pending:
+            by_host[urlparse(article.url).netloc].append(article)
+        host_limits = {host: threading.BoundedSemaphore(per_host_limit) for host in by_host}
+        queue = [a for group in zip_longest_lists(by_host.values()) for a in group]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(work, queue))
+
+        print(f"  ✓ Enriched {counts['ok']}, failed {counts['failed']}, "
+              f"deferred {counts['skipped']} in {time.monotonic() - started:.1f}s")
+
+    for article in articles:
+        entry = cache.get(article.id)
+        if not entry or 'error' in entry:
+            continue
+        if entry.get('image_url'):
+            article.image_url = entry['image_url']
+        if entry.get('canonical_url'):
+            article.canonical_url = entry['canonical_url']
+        if entry.get('description') and not article.summary:
+            article.summary = entry['description'][:500]
+
+    save_cache(cache, cache_path)
+    return articles
+
+
+def zip_longest_lists(lists):
+    """Round-robin over lists: [[a1, b1], [a2, b2], [a3]]"""
+    lists = [list(items) for items in lists]
+    for i in range(max((len(items) for items in lists), default=0)):
+        yield [items[i] for items in lists if i < len(items)]
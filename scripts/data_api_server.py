@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+LOCAL DATA API SERVER
+=============================================================================
+
+Small async HTTP service over the files the data scripts already publish,
+so frontends can request exactly the slice they need instead of whole
+static files:
+
+    GET /api/quotes                       All live quotes
+    GET /api/quotes?symbols=MCD,YUM       Selected quotes
+    GET /api/quotes/MCD                   One quote
+    GET /api/history/MCD?from=2024-01-01&to=2024-03-31
+                                          Daily bars for one symbol (columnar)
+    GET /api/news?page=1&per_page=20&category=trade_press&source=QSR&q=pizza
+                                          Paginated, filtered news
+    GET /api/health                       Data file versions
+    GET /api/stream/quotes                Server-Sent Events: snapshot on
+                                          connect, then changed quotes only
+                                          (see quote_stream.py)
+
+Each source file is parsed once and kept in memory; a cheap stat() on each
+request notices when a script republishes the file and reloads it (in a
+worker thread, so readers are never blocked by a big CSV parse). Rendered
+responses are memoized per (route, query, data version) with a strong
+ETag, answered with 304 on If-None-Match, and gzip-compressed once when the
+client accepts it (the gzip variant has its own ETag, with Vary:
+Accept-Encoding).
+
+Built on asyncio streams only - no web framework needed.
+
+Usage:
+    python scripts/data_api_server.py [--host 127.0.0.1] [--port 8787]
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import bisect
+import csv
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from email.utils import formatdate
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from publisher import dumps_compact
+from quote_stream import QuoteBroadcaster
+from records import Bar
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+QUOTES_FILE = REPO_ROOT / "data" / "live_ticker.json"
+HISTORY_FILE = REPO_ROOT / "data" / "franchise_stocks.csv"
+NEWS_FILE = REPO_ROOT / "data" / "franchise_news.json"
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8787
+
+RESPONSE_CACHE_SIZE = 1024    # Memoized responses kept in memory
+MIN_GZIP_BYTES = 1024         # Smaller bodies are not worth compressing
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024    # Request bodies up to this size are read and discarded
+KEEP_ALIVE_TIMEOUT = 15       # Seconds an idle connection is kept open
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+HISTORY_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'adjClose', 'volume']   # Bar fields
+
+
+class HTTPError(Exception):
+    """Raised by handlers to answer with an error status"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+# =============================================================================
+# DATA SOURCES
+# =============================================================================
+
+def load_quotes(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        'quotes': data.get('quotes', {}),
+        'fetchedAt': data.get('fetchedAt'),
+    }
+
+
+def load_history(path):
+    """
+    Parse the history CSV into per-symbol, date-sorted columns
+
+    Returns:
+        dict: symbol -> {'dates': [...], 'rows': [Bar, ...]}
+    """
+    by_symbol = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for record in csv.DictReader(f):
+            try:
+                row = Bar(
+                    record['date'],
+                    round(float(record['open']), 4),
+                    round(float(record['high']), 4),
+                    round(float(record['low']), 4),
+                    round(float(record['close']), 4),
+                    round(float(record['adjClose']), 4),
+                    int(float(record['volume'] or 0)),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            by_symbol.setdefault(record['symbol'].upper(), []).append(row)
+
+    history = {}
+    for symbol, rows in by_symbol.items():
+        rows.sort(key=lambda r: r.date)
+        history[symbol] = {'dates': [r.date for r in rows], 'rows': rows}
+    return history
+
+
+def load_news(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+    return articles if isinstance(articles, list) else []
+
+
+class FileSource:
+    """
+    A data file parsed into memory and reloaded when it changes on disk
+
+    `version` increases on every reload and is part of the response cache
+    key, so cached responses are invalidated automatically.
+    """
+
+    def __init__(self, name, path, loader, empty):
+        self.name = name
+        self.path = Path(path)
+        self.loader = loader
+        self.empty = empty
+        self.data = empty
+        self.version = 0
+        self.signature = None
+        self._lock = asyncio.Lock()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    async def get(self):
+        """Return (data, version), reloading if the file changed"""
+        signature = self._stat()
+        if signature != self.signature:
+            async with self._lock:
+                signature = self._stat()
+                if signature != self.signature:
+                    if signature is None:
+                        data = self.empty
+                    else:
+                        try:
+                            data = await asyncio.to_thread(self.loader, self.path)
+                        except (OSError, ValueError) as e:
+                            # Keep serving the previous version until the file is readable
+                            print(f"⚠️  Failed to load {self.path}: {e}")
+                            return self.data, self.version
+                    self.data = data
+                    self.signature = signature
+                    self.version += 1
+        return self.data, self.version
+
+
+# =============================================================================
+# HANDLERS
+# =============================================================================
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _int_param(query, name, default, minimum, maximum):
+    value = _param(query, name)
+    if value is None:
+        return default
+    try:
+        return max(minimum, min(maximum, int(value)))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer") from None
+
+
+def handle_quotes(data, query, symbol=None):
+    quotes = data['quotes']
+
+    if symbol:
+        quote = quotes.get(symbol.upper())
+        if quote is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No quote for {symbol.upper()}")
+        return {'quote': quote, 'fetchedAt': data['fetchedAt']}
+
+    symbols = _param(query, 'symbols')
+    if symbols:
+        wanted = [s.strip().upper() for s in symbols.split(',') if s.strip()]
+        quotes = {s: quotes[s] for s in wanted if s in quotes}
+
+    return {'quotes': quotes, 'count': len(quotes), 'fetchedAt': data['fetchedAt']}
+
+
+def handle_history(data, query, symbol):
+    series = data.get(symbol.upper())
+    if series is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No history for {symbol.upper()}")
+
+    start = _param(query, 'from')
+    end = _param(query, 'to')
+    dates = series['dates']
+    lo = bisect.bisect_left(dates, start) if start else 0
+    hi = bisect.bisect_right(dates, end) if end else len(dates)
+
+    limit = _param(query, 'limit')
+    rows = series['rows'][lo:hi]
+    if limit:
+        rows = rows[-_int_param(query, 'limit', 0, 1, len(dates) or 1):]
+
+    rows = [bar.to_row() for bar in rows]
+    return {'symbol': symbol.upper(), 'columns': HISTORY_COLUMNS, 'rows': rows}
+
+
+def handle_news(articles, query):
+    category = _param(query, 'category')
+    source = (_param(query, 'source') or '').lower()
+    text = (_param(query, 'q') or '').lower()
+    since = _param(query, 'since')
+
+    if category or source or text or since:
+        articles = [
+            a for a in articles
+            if (not category or a.get('category') == category)
+            and (not source or source in (a.get('source_name') or '').lower())
+            and (not text or text in (a.get('title') or '').lower() or text in (a.get('summary') or '').lower())
+            and (not since or (a.get('published_iso') or '') >= since)
+        ]
+
+    per_page = _int_param(query, 'per_page', DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    page = _int_param(query, 'page', 1, 1, 10 ** 6)
+    start = (page - 1) * per_page
+
+    return {
+        'articles': articles[start:start + per_page],
+        'page': page,
+        'per_page': per_page,
+        'total': len(articles),
+        'pages': (len(articles) + per_page - 1) // per_page,
+    }
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+class DataAPIServer:
+    """Routes requests to handlers and memoizes rendered responses"""
+
+    def __init__(self, quotes_file=QUOTES_FILE, history_file=HISTORY_FILE, news_file=NEWS_FILE):
+        self.sources = {
+            'quotes': FileSource('quotes', quotes_file, load_quotes, {'quotes': {}, 'fetchedAt': None}),
+            'history': FileSource('history', history_file, load_history, {}),
+            'news': FileSource('news', news_file, load_news, []),
+        }
+        self.responses = OrderedDict()
+        self.broadcaster = QuoteBroadcaster(self.sources['quotes'])
+        self.routes = []
+        self.add_route('/api/quotes', 'quotes', lambda data, query: handle_quotes(data, query))
+        self.add_route('/api/quotes/', 'quotes', handle_quotes, prefix=True)
+        self.add_route('/api/history/', 'history', handle_history, prefix=True)
+        self.add_route('/api/news', 'news', handle_news)
+        self.add_route('/api/health', None, None)
+
+    def add_route(self, path, source, handler, prefix=False):
+        """
+        Register a GET route
+
+        Args:
+            path: Exact path, or path prefix when prefix=True (the remainder
+                  is passed to the handler as its third argument)
+            source: Name of the FileSource the handler reads (None for no data)
+            handler: handler(data, query[, remainder]) -> JSON-serializable
+        """
+        self.routes.append((path, source, handler, prefix))
+
+    def _match(self, path):
+        for route_path, source, handler, prefix in self.routes:
+            if prefix and path.startswith(route_path) and len(path) > len(route_path):
+                return route_path, source, handler, unquote(path[len(route_path):])
+            if not prefix and path == route_path:
+                return route_path, source, handler, None
+        return None
+
+    async def health(self):
+        versions = {}
+        for name, source in self.sources.items():
+            await source.get()
+            versions[name] = {'version': source.version, 'available': source.signature is not None}
+        return versions
+
+    async def render(self, path, raw_query):
+        """
+        Produce (status, body, etag) for a GET request
+
+        Memoized responses are reused while the source version is unchanged.
+        """
+        match = self._match(path)
+        if match is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {path}")
+        route_path, source_name, handler, remainder = match
+
+        if source_name is None:
+            body = dumps_compact(await self.health())
+            return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"', None
+
+        data, version = await self.sources[source_name].get()
+        query = parse_qs(raw_query, keep_blank_values=False)
+        cache_key = (route_path, remainder, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+
+        cached = self.responses.get(cache_key)
+        if cached is not None and cached[0] == version:
+            self.responses.move_to_end(cache_key)
+            return cached[1], cached[2], cached
+
+        result = handler(data, query, remainder) if remainder is not None else handler(data, query)
+        body = dumps_compact(result)
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+        entry = [version, body, etag, None]
+        self.responses[cache_key] = entry
+        if len(self.responses) > RESPONSE_CACHE_SIZE:
+            self.responses.popitem(last=False)
+
+        return body, etag, entry
+
+    # -------------------------------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                request = self.parse_request(head)
+                if request is None:
+                    await self.send(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request'}, keep_alive=False)
+                    break
+
+                method, target, headers = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                # No route takes a body, but an unread one would be parsed as
+                # the next request on a keep-alive connection
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.send(writer, HTTPStatus.BAD_REQUEST, {'error': 'Invalid Content-Length'},
+                                    keep_alive=False)
+                    break
+                if 'transfer-encoding' in headers or length > MAX_BODY_BYTES:
+                    keep_alive = False
+                elif length:
+                    try:
+                        await asyncio.wait_for(reader.readexactly(length), KEEP_ALIVE_TIMEOUT)
+                    except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                        break
+
+                if not await self.dispatch(method, target, headers, reader, writer, keep_alive):
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    @staticmethod
+    def parse_request(head):
+        try:
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, _version = lines[0].split(' ', 2)
+        except ValueError:
+            return None
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        return method.upper(), target, headers
+
+    async def dispatch(self, method, target, headers, reader, writer, keep_alive):
+        """
+        Handle one request
+
+        Returns:
+            bool: False if the connection was handed over (streaming) or must close
+        """
+        if method == 'OPTIONS':
+            await self.send(writer, HTTPStatus.NO_CONTENT, None, keep_alive=keep_alive)
+            return True
+        if method not in ('GET', 'HEAD'):
+            await self.send(writer, HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Only GET is supported'},
+                            keep_alive=keep_alive)
+            return True
+
+        url = urlsplit(target)
+        if url.path.rstrip('/') == '/api/stream/quotes' and method == 'GET':
+            await self.stream_quotes(writer, headers, parse_qs(url.query))
+            return False
+
+        try:
+            body, etag, entry = await self.render(url.path.rstrip('/') or '/', url.query)
+        except HTTPError as e:
+            await self.send(writer, e.status, {'error': e.message}, keep_alive=keep_alive)
+            return True
+        except Exception as e:  # noqa: BLE001 - never let one request kill the server
+            print(f"❌ {method} {target}: {e}")
+            await self.send(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal error'},
+                            keep_alive=keep_alive)
+            return True
+
+        # The gzip body is a different representation, so it gets its own ETag
+        compress = 'gzip' in headers.get('accept-encoding', '') and len(body) >= MIN_GZIP_BYTES
+        if compress:
+            etag = etag[:-1] + '-gz"'
+
+        if etag in [t.strip() for t in headers.get('if-none-match', '').split(',')]:
+            await self.send_raw(writer, HTTPStatus.NOT_MODIFIED, b'', {'ETag': etag, 'Vary': 'Accept-Encoding'},
+                                keep_alive, head_only=True)
+            return True
+
+        extra = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if compress:
+            if entry is not None:
+                if entry[3] is None:
+                    entry[3] = gzip.compress(body, compresslevel=6)
+                body = entry[3]
+            else:
+                body = gzip.compress(body, compresslevel=6)
+            extra['Content-Encoding'] = 'gzip'
+
+        await self.send_raw(writer, HTTPStatus.OK, body, extra, keep_alive, head_only=(method == 'HEAD'))
+        return True
+
+    async def stream_quotes(self, writer, headers, query):
+        """Hand the connection over to the quote broadcaster (SSE)"""
+        if self.broadcaster.is_full():
+            await self.send(writer, HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Too many subscribers'},
+                            keep_alive=False)
+            return
+
+        await self.send_raw(writer, HTTPStatus.OK, b'', {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        }, keep_alive=True, stream=True)
+
+        last_event_id = headers.get('last-event-id') or _param(query, 'since')
+        await self.broadcaster.stream(writer, last_event_id)
+
+    async def send(self, writer, status, payload, keep_alive=True):
+        body = dumps_compact(payload) if payload is not None else b''
+        await self.send_raw(writer, status, body, {}, keep_alive)
+
+    @staticmethod
+    async def send_raw(writer, status, body, extra_headers, keep_alive, head_only=False, stream=False):
+        headers = {
+            'Date': formatdate(usegmt=True),
+            'Content-Type': 'application/json; charset=utf-8',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'If-None-Match, Last-Event-ID',
+            'Access-Control-Expose-Headers': 'ETag',
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+        if not stream:
+            headers['Content-Length'] = str(len(body))
+        headers.update(extra_headers)
+
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body and not head_only:
+            writer.write(body)
+        await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, app=None):
+    """Run the API server until cancelled"""
+    app = app or DataAPIServer()
+    server = await asyncio.start_server(app.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    # Warm the caches so the first requests do not pay for parsing
+    for source in app.sources.values():
+        await source.get()
+
+    broadcaster = asyncio.create_task(app.broadcaster.run())
+
+    print(f"🌐 Serving data API on http://{host}:{port}/api/")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        broadcaster.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve quotes, history and news over HTTP")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n⚠️  Server stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Per-feed health tracking and adaptive polling for the news aggregator.
+
+Stats are kept per feed URL in data/feed_health.json (committed by the
+workflow, so they survive between runs):
+
+    attempts / successes      - lifetime counters (success rate)
+    consecutive_failures      - drives exponential backoff
+    latency_ms                - moving average of response time
+    publish_interval_hours    - moving average gap between articles
+    latest_item_iso           - newest article date seen so far
+    last_new_item_at          - when a never-seen-before article last appeared
+    next_due_at               - earliest time the feed should be polled again
+
+Scheduling rules:
+    - Failing feeds back off exponentially (6h, 12h, 24h, ... up to 7 days)
+    - Healthy feeds are polled every half publish interval, so prolific
+      feeds are hit every run and quiet ones only every few days
+    - Feeds with alternate URLs try the last working URL first
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from publisher import write_state
+
+HEALTH_PATH = Path("data/feed_health.json")
+
+BASE_BACKOFF_HOURS = 6       # First retry delay after a failure
+MAX_BACKOFF_HOURS = 24 * 7   # Never wait more than a week to re-check a dead feed
+MAX_POLL_HOURS = 72          # Poll even the quietest healthy feed every 3 days
+DUE_SLACK_HOURS = 1          # Cron runs drift - treat "almost due" as due
+EWMA_ALPHA = 0.3             # Weight of the newest sample in moving averages
+
+MIN_TIMEOUT = 5              # Request timeout bounds (seconds)
+MAX_TIMEOUT = 15
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _parse_iso(value):
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _ewma(previous, sample):
+    if previous is None:
+        return sample
+    return round(previous + EWMA_ALPHA * (sample - previous), 2)
+
+
+def load_health(path=HEALTH_PATH):
+    """Load the feed health state (empty state if missing or unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if isinstance(state, dict) and isinstance(state.get('feeds'), dict):
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'feeds': {}}
+
+
+def save_health(state, path=HEALTH_PATH):
+    """Persist the feed health state"""
+    state['updatedAt'] = _now().isoformat()
+    state['feeds'] = dict(sorted(state['feeds'].items()))
+    write_state(state, path)
+
+
+def get_stats(state, url):
+    """Return (creating if needed) the stats record for a feed URL"""
+    return state['feeds'].setdefault(url, {
+        'attempts': 0,
+        'successes': 0,
+        'consecutive_failures': 0,
+        'latency_ms': None,
+        'publish_interval_hours': None,
+        'latest_item_iso': None,
+        'last_new_item_at': None,
+        'last_status': None,
+        'last_attempt_at': None,
+        'last_success_at': None,
+        'next_due_at': None,
+    })
+
+
+def success_rate(stats):
+    """Fraction of attempts that succeeded (None if never attempted)"""
+    if not stats.get('attempts'):
+        return None
+    return stats['successes'] / stats['attempts']
+
+
+def feed_urls(feed_config):
+    """All candidate URLs for a feed: primary URL followed by alternates"""
+    return [feed_config['url']] + list(feed_config.get('alternates', []))
+
+
+def order_urls(state, feed_config):
+    """
+    Order a feed's candidate URLs so the most recently working one is first
+
+    URLs that have never been tried keep their configured order but come
+    after a URL that is known to work and before ones that keep failing.
+    """
+    urls = feed_urls(feed_config)
+
+    def rank(indexed_url):
+        index, url = indexed_url
+        stats = state['feeds'].get(url)
+        if not stats or not stats.get('attempts'):
+            return (1, 0, index)
+        if stats.get('consecutive_failures', 0) == 0:
+            return (0, 0, index)
+        return (2, stats['consecutive_failures'], index)
+
+    return [url for _, url in sorted(enumerate(urls), key=rank)]
+
+
+def is_due(state, feed_config, now=None):
+    """
+    Check whether any of a feed's URLs should be polled this run
+
+    A feed with alternates follows the schedule of its best candidate URL
+    (see order_urls), so a dead alternate does not pull a healthy feed
+    forward.
+    """
+    now = now or _now()
+    best = order_urls(state, feed_config)[0]
+    next_due = _parse_iso(get_stats(state, best).get('next_due_at'))
+
+    return next_due is None or now + timedelta(hours=DUE_SLACK_HOURS) >= next_due
+
+
+def next_due_at(state, feed_config):
+    """next_due_at of the feed's best candidate URL (ISO string or None)"""
+    return get_stats(state, order_urls(state, feed_config)[0]).get('next_due_at')
+
+
+def feed_timeout(state, url):
+    """Request timeout for a feed: 3x its average latency, within bounds"""
+    latency_ms = state['feeds'].get(url, {}).get('latency_ms')
+    if not latency_ms:
+        return MAX_TIMEOUT
+    return max(MIN_TIMEOUT, min(MAX_TIMEOUT, round(latency_ms * 3 / 1000, 1)))
+
+
+def _publish_interval_hours(published_isos):
+    """Average gap (hours) between consecutive article publish dates"""
+    dates = sorted(d for d in (_parse_iso(p) for p in published_isos) if d)
+    if len(dates) < 2:
+        return None
+    span = (dates[-1] - dates[0]).total_seconds() / 3600
+    return max(span / (len(dates) - 1), 0.1)
+
+
+def record_result(state, url, ok, status=None, latency=None, published_isos=(), now=None):
+    """
+    Record the outcome of one feed fetch and schedule its next poll
+
+    Args:
+        state: Health state from load_health()
+        url: Feed URL that was fetched
+        ok: True if the feed returned parseable entries
+        status: HTTP status code or short error label
+        latency: Request time in seconds (None if the request never completed)
+        published_isos: ISO publish dates of the entries that were returned
+        now: Override for the current time (testing)
+
+    Returns:
+        dict: Updated stats record
+    """
+    now = now or _now()
+    stats = get_stats(state, url)
+
+    stats['attempts'] += 1
+    stats['last_status'] = status
+    stats['last_attempt_at'] = now.isoformat()
+
+    if latency is not None:
+        stats['latency_ms'] = _ewma(stats['latency_ms'], round(latency * 1000))
+
+    if ok:
+        stats['successes'] += 1
+        stats['consecutive_failures'] = 0
+        stats['last_success_at'] = now.isoformat()
+
+        interval = _publish_interval_hours(published_isos)
+        if interval is not None:
+            stats['publish_interval_hours'] = _ewma(stats['publish_interval_hours'], round(interval, 2))
+
+        newest = max((d for d in (_parse_iso(p) for p in published_isos) if d), default=None)
+        latest = _parse_iso(stats['latest_item_iso'])
+        if newest and (latest is None or newest > latest):
+            stats['latest_item_iso'] = newest.isoformat()
+            stats['last_new_item_at'] = now.isoformat()
+
+        poll_hours = MAX_POLL_HOURS
+        if stats['publish_interval_hours'] is not None:
+            poll_hours = min(MAX_POLL_HOURS, stats['publish_interval_hours'] / 2)
+        stats['next_due_at'] = (now + timedelta(hours=poll_hours)).isoformat()
+    else:
+        stats['consecutive_failures'] += 1
+        backoff = BASE_BACKOFF_HOURS * 2 ** (stats['consecutive_failures'] - 1)
+        stats['next_due_at'] = (now + timedelta(hours=min(backoff, MAX_BACKOFF_HOURS))).isoformat()
+
+    return stats
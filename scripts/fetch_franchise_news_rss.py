@@ -13,13 +13,17 @@ Usage:
 
 Output:
     data/franchise_news.json
+    data/news_changes.json    (per-article changes of the last runs, for polling)
+    data/top_stories.json     (articles grouped into cross-outlet stories)
+
+Runs that find nothing new leave the outputs untouched: re-fetched articles
+keep the time they were first seen, and the list order is deterministic.
 
 Dependencies:
     pip install feedparser python-dateutil
 =============================================================================
 """
 
-import feedparser
 import json
 import hashlib
 import requests
@@ -29,6 +33,21 @@ from urllib.parse import urlparse
 import time
 import sys
 
+import feed_health
+import news_changes
+import profiling
+import run_metrics
+import story_clustering
+from article_enricher import enrich_articles
+from google_news_resolver import canonicalize_url, is_google_news_url, resolve_google_news_articles
+from lazy_import import lazy_import
+from publisher import publish_json
+from records import Article
+
+# Only needed when a feed is actually fetched (runs where every feed is
+# still backing off skip it)
+feedparser = lazy_import('feedparser')
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -103,19 +122,14 @@ RSS_FEEDS = [
         'status': 'confirmed'
     },
 
-    # ASSOCIATIONS (IFA - try multiple endpoints)
+    # ASSOCIATIONS (IFA - the working endpoint is picked from feed health)
     {
         'url': 'https://www.franchise.org/blog/rss',
+        'alternates': ['https://www.franchise.org/blog/feed'],
         'name': 'IFA FranBlog',
         'category': 'association',
         'status': 'best_guess'
     },
-    {
-        'url': 'https://www.franchise.org/blog/feed',
-        'name': 'IFA FranBlog (alt)',
-        'category': 'association',
-        'status': 'best_guess'
-    },
 ]
 
 # Google News RSS feeds for topic-based enrichment
@@ -143,6 +157,9 @@ MAX_ARTICLES_PER_FEED = 20  # Limit articles per feed
 MAX_TOTAL_ARTICLES = 100    # Total articles to keep in final output
 MAX_AGE_DAYS = 30           # Only keep articles from last 30 days
 
+# Shared HTTP session (connection reuse across feeds and runs)
+SESSION = requests.Session()
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -210,25 +227,34 @@ def clean_text(text):
 # RSS FETCHING FUNCTIONS
 # =============================================================================
 
-def fetch_rss_feed(feed_config, source_type='rss'):
+def fetch_rss_feed(feed_config, source_type='rss', url=None, health=None):
     """
     Fetch and parse a single RSS feed.
 
     Args:
         feed_config: Dict with 'url', 'name', and optional 'category'
         source_type: 'rss' or 'google_news'
+        url: URL to fetch instead of feed_config['url'] (alternate endpoints)
+        health: Feed health state to record the outcome in (optional)
 
     Returns:
-        List of normalized article dicts
+        List of normalized Article records
     """
-    url = feed_config['url']
+    url = url or feed_config['url']
     feed_name = feed_config.get('name', 'Unknown Source')
     category = feed_config.get('category', 'general')
+    timeout = feed_health.feed_timeout(health, url) if health is not None else 15
 
     print(f"\n📡 Fetching: {feed_name}")
     print(f"   URL: {url}")
 
     articles = []
+    dated = []          # Publish dates actually provided by the feed
+    ok = False
+    status = 'error'
+    latency = None
+    host = urlparse(url).netloc
+    started = time.monotonic()
 
     try:
         # Use requests with proper headers to avoid "Access denied" errors
@@ -243,11 +269,21 @@ def fetch_rss_feed(feed_config, source_type='rss'):
 
         # Fetch with requests first
         try:
-            response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
+            response = SESSION.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        except requests.exceptions.Timeout as e:
+            status = 'timeout'
+            run_metrics.record_request(host, time.monotonic() - started, status=status)
+            print(f"  ❌ Request timed out: {e}")
+            return articles
         except requests.exceptions.RequestException as e:
+            run_metrics.record_request(host, time.monotonic() - started, error=e)
             print(f"  ❌ Request failed: {e}")
             return articles
 
+        latency = time.monotonic() - started
+        status = response.status_code
+        run_metrics.record_request(host, latency, response)
+
         # Check status
         if response.status_code == 403:
             print(f"  ⚠️  Access denied (403) - May be blocking automated requests")
@@ -267,7 +303,9 @@ def fetch_rss_feed(feed_config, source_type='rss'):
         print(f"  ✓ Fetched {len(response.content)} bytes")
 
         # Parse with feedparser
+        parse_started = time.perf_counter()
         feed = feedparser.parse(response.content)
+        run_metrics.observe('feed_parse_seconds', time.perf_counter() - parse_started, provider=host)
 
         # Check for errors
         if feed.bozo:
@@ -275,10 +313,12 @@ def fetch_rss_feed(feed_config, source_type='rss'):
 
         # Check if we got entries
         if not hasattr(feed, 'entries') or len(feed.entries) == 0:
+            status = 'empty'
             print(f"  ❌ No entries found")
             return articles
 
         print(f"  ✓ Found {len(feed.entries)} entries")
+        ok = True
 
         # Extract feed-level info
         feed_title = getattr(feed.feed, 'title', feed_name)
@@ -291,10 +331,13 @@ def fetch_rss_feed(feed_config, source_type='rss'):
                 if not title:
                     continue
 
-                # Extract link
+                # Extract link (without tracking parameters, like resolved
+                # Google News links, so one story arriving both ways dedups)
                 link = entry.get('link', '')
                 if not link:
                     continue
+                if not is_google_news_url(link):
+                    link = canonicalize_url(link)
 
                 # Generate unique ID
                 article_id = generate_article_id(link)
@@ -318,27 +361,29 @@ def fetch_rss_feed(feed_config, source_type='rss'):
                     published_iso = parse_date(entry.updated_parsed)
 
                 # If no date, use current time
-                if not published_iso:
+                if published_iso:
+                    dated.append(published_iso)
+                else:
                     published_iso = datetime.now(timezone.utc).isoformat()
 
                 # Extract author if available
                 author = entry.get('author', '')
 
-                # Build article dict
-                article = {
-                    'id': article_id,
-                    'title': title,
-                    'url': link,
-                    'summary': summary,
-                    'source_name': feed_title,
-                    'source_feed_url': url,
-                    'source_type': source_type,
-                    'category': category if source_type == 'rss' else 'google_news',
-                    'published_raw': published_raw,
-                    'published_iso': published_iso,
-                    'author': author,
-                    'fetched_at': datetime.now(timezone.utc).isoformat()
-                }
+                # Build article record
+                article = Article(
+                    id=article_id,
+                    title=title,
+                    url=link,
+                    summary=summary,
+                    source_name=feed_title,
+                    source_feed_url=url,
+                    source_type=source_type,
+                    category=category if source_type == 'rss' else 'google_news',
+                    published_raw=published_raw,
+                    published_iso=published_iso,
+                    author=author,
+                    fetched_at=datetime.now(timezone.utc).isoformat(),
+                )
 
                 articles.append(article)
 
@@ -347,81 +392,150 @@ def fetch_rss_feed(feed_config, source_type='rss'):
                 continue
 
         print(f"  ✓ Extracted {len(articles)} articles")
+        run_metrics.inc('articles_fetched_total', len(articles), provider=host)
 
     except Exception as e:
+        ok = False
         print(f"  ❌ Failed to fetch feed: {e}")
 
+    finally:
+        if health is not None:
+            feed_health.record_result(health, url, ok, status=status, latency=latency, published_isos=dated)
+
     return articles
 
 # =============================================================================
 # MAIN AGGREGATION LOGIC
 # =============================================================================
 
-def fetch_all_feeds():
-    """Fetch all RSS feeds and return combined article list"""
+def fetch_feed_with_health(feed_config, source_type, health):
+    """
+    Fetch a feed if it is due, trying its URLs best-first
+
+    Returns:
+        List of articles, or None if the feed was skipped (not due)
+    """
+    if not feed_health.is_due(health, feed_config):
+        print(f"\n⏭️  Skipping: {feed_config.get('name', feed_config['url'])} "
+              f"(next due {feed_health.next_due_at(health, feed_config)})")
+        return None
+
+    for url in feed_health.order_urls(health, feed_config):
+        articles = fetch_rss_feed(feed_config, source_type=source_type, url=url, health=health)
+        if feed_health.get_stats(health, url)['consecutive_failures'] == 0:
+            return articles
+        time.sleep(0.5)
+
+    return []
+
+def fetch_all_feeds(health=None):
+    """
+    Fetch all due RSS feeds and return combined article list
+
+    Args:
+        health: Feed health state; feeds that are backing off or not yet
+                due are skipped (defaults to the persisted state)
+    """
+    if health is None:
+        health = feed_health.load_health()
+
     all_articles = []
+    skipped = 0
 
     print("=" * 70)
     print("🔄 FETCHING RSS FEEDS")
     print("=" * 70)
 
-    # Fetch publication RSS feeds
-    print(f"\n📚 Fetching {len(RSS_FEEDS)} publication feeds...")
-    for feed_config in RSS_FEEDS:
-        articles = fetch_rss_feed(feed_config, source_type='rss')
-        all_articles.extend(articles)
-        time.sleep(0.5)  # Be nice to servers
-
-    # Fetch Google News feeds
-    print(f"\n🔍 Fetching {len(GOOGLE_NEWS_FEEDS)} Google News feeds...")
-    for feed_config in GOOGLE_NEWS_FEEDS:
-        articles = fetch_rss_feed(feed_config, source_type='google_news')
-        all_articles.extend(articles)
-        time.sleep(0.5)
+    feed_groups = [
+        ('rss', RSS_FEEDS, f"📚 Fetching {len(RSS_FEEDS)} publication feeds..."),
+        ('google_news', GOOGLE_NEWS_FEEDS, f"🔍 Fetching {len(GOOGLE_NEWS_FEEDS)} Google News feeds..."),
+    ]
+
+    for source_type, feeds, banner in feed_groups:
+        print(f"\n{banner}")
+        for feed_config in feeds:
+            articles = fetch_feed_with_health(feed_config, source_type, health)
+            if articles is None:
+                skipped += 1
+                continue
+            all_articles.extend(articles)
+            time.sleep(0.5)  # Be nice to servers
+
+    if skipped:
+        print(f"\n⏭️  Skipped {skipped} feeds that are not due yet")
 
     return all_articles
 
+def load_existing_articles(path):
+    """
+    Load articles from the previous output so feeds skipped this run keep
+    their items in the published file
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(articles, list):
+        return []
+    return [Article.from_dict(article) for article in articles]
+
 def deduplicate_articles(articles):
-    """Remove duplicate articles based on URL"""
+    """Remove duplicate articles based on URL (tracking parameters ignored)"""
     seen_urls = set()
     unique_articles = []
 
     for article in articles:
-        url = article['url']
+        url = article.url if is_google_news_url(article.url) else canonicalize_url(article.url)
         if url not in seen_urls:
             seen_urls.add(url)
             unique_articles.append(article)
 
     return unique_articles
 
+def keep_first_seen(articles, published):
+    """
+    Carry over what an already published article had, so fetching it again
+    changes nothing: the time it was first seen (fetched_at) and, for items
+    without a date, the stand-in publish date
+
+    Args:
+        articles: Article records (updated in place)
+        published: dict of id -> article dict from the last published list
+    """
+    for article in articles:
+        old = published.get(article.id)
+        if old is None:
+            continue
+        article.fetched_at = old.get('fetched_at') or article.fetched_at
+        if article.published_raw is None and old.get('published_iso'):
+            article.published_iso = old['published_iso']
+
 def filter_recent_articles(articles):
     """Keep only recent articles"""
-    recent = [a for a in articles if is_recent(a['published_iso'])]
+    recent = [a for a in articles if is_recent(a.published_iso)]
     return recent
 
 def sort_articles(articles):
-    """Sort articles by published date (newest first)"""
+    """Sort articles by published date (newest first, ties by id so the order is stable)"""
     return sorted(
         articles,
-        key=lambda x: x.get('published_iso', ''),
+        key=lambda x: (x.published_iso or '', x.id),
         reverse=True
     )
 
 def save_to_json(articles, output_path):
-    """Save articles to JSON file"""
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    """Publish articles to the JSON file (compact, atomic, precompressed)"""
+    result = publish_json(articles, output_path)
+    run_metrics.record_rows(Path(output_path).stem, len(articles))
 
-    # Write JSON
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
-
-    print(f"\n✅ Saved {len(articles)} articles to {output_path}")
+    print(f"\n✅ Saved {len(articles)} articles to {output_path} ({result['bytes']:,} bytes)")
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
+@run_metrics.instrumented('news')
 def main():
     """Main execution"""
     print("\n" + "=" * 70)
@@ -431,37 +545,68 @@ def main():
     print(f"Max age: {MAX_AGE_DAYS} days")
     print(f"Max total articles: {MAX_TOTAL_ARTICLES}")
 
-    # Fetch all feeds
-    all_articles = fetch_all_feeds()
+    # Fetch all due feeds
+    health = feed_health.load_health()
+    with run_metrics.stage('fetch'):
+        all_articles = fetch_all_feeds(health)
+    feed_health.save_health(health)
 
     print("\n" + "=" * 70)
     print("📊 PROCESSING RESULTS")
     print("=" * 70)
     print(f"Total articles fetched: {len(all_articles)}")
 
-    # Deduplicate
-    unique_articles = deduplicate_articles(all_articles)
-    print(f"After deduplication: {len(unique_articles)}")
+    # Keep previously published articles (fresh copies win in dedup)
+    previous_articles = load_existing_articles(OUTPUT_PATH)
+    published = {article.id: article.to_dict() for article in previous_articles}
+    all_articles.extend(previous_articles)
+    print(f"Previously published articles: {len(previous_articles)}")
+
+    # Resolve Google News redirect links to publisher URLs
+    with run_metrics.stage('resolve'):
+        resolve_google_news_articles(all_articles, generate_article_id)
+
+    with run_metrics.stage('process'):
+        # Deduplicate
+        unique_articles = deduplicate_articles(all_articles)
+        keep_first_seen(unique_articles, published)
+        print(f"After deduplication: {len(unique_articles)}")
 
-    # Filter by date
-    recent_articles = filter_recent_articles(unique_articles)
-    print(f"After date filter ({MAX_AGE_DAYS} days): {len(recent_articles)}")
+        # Filter by date
+        recent_articles = filter_recent_articles(unique_articles)
+        print(f"After date filter ({MAX_AGE_DAYS} days): {len(recent_articles)}")
 
-    # Sort by date
-    sorted_articles = sort_articles(recent_articles)
+        # Sort by date
+        sorted_articles = sort_articles(recent_articles)
+
+    # Group the reports of one event from different outlets into stories
+    with run_metrics.stage('cluster'):
+        top_stories = story_clustering.build_top_stories(recent_articles)
 
     # Limit total count
     final_articles = sorted_articles[:MAX_TOTAL_ARTICLES]
     print(f"Final article count (max {MAX_TOTAL_ARTICLES}): {len(final_articles)}")
 
+    # Add og:image / description / canonical URL from the article pages
+    with run_metrics.stage('enrich'):
+        enrich_articles(final_articles)
+
     # Save to JSON
-    save_to_json(final_articles, OUTPUT_PATH)
+    # Only publish (and commit, and redeploy) when something changed
+    with run_metrics.stage('publish'):
+        change = news_changes.diff_articles(published, final_articles)
+        if change is None:
+            print(f"\n💤 No article changes - keeping {OUTPUT_PATH}")
+        else:
+            save_to_json(final_articles, OUTPUT_PATH)
+            news_changes.record_changes(change)
+        story_clustering.save_top_stories(top_stories)
 
     # Print summary by category
     print("\n📈 ARTICLES BY CATEGORY:")
     categories = {}
     for article in final_articles:
-        cat = article['category']
+        cat = article.category
         categories[cat] = categories.get(cat, 0) + 1
 
     for cat, count in sorted(categories.items()):
@@ -475,7 +620,7 @@ def main():
 
 if __name__ == '__main__':
     try:
-        sys.exit(main())
+        sys.exit(profiling.run(main, 'news', description="Aggregate franchise news feeds"))
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
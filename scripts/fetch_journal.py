@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for resumable fetch runs.
+
+The fetchers publish nothing until every symbol is done, so a run that dies
+halfway (crash, workflow time limit) used to lose everything it had
+fetched. With a journal each completed symbol is appended to
+
+    data/journal/<name>.jsonl
+
+as one JSON line and flushed to disk before the next request, so a crash
+costs at most the symbol in flight. The next run with the same key (the
+same date range, shard, ...) replays the journal and only fetches the
+symbols that are missing. Once the results are published the journal is
+deleted.
+
+The first line is a header with the run key; a journal written for a
+different key, or older than max_age, is discarded. A torn last line from a
+crash mid-write is ignored. Recording a symbol twice is harmless - the
+last entry wins - so replaying and resuming are idempotent.
+
+Usage:
+    journal = FetchJournal('history', key=f"{start}:{end}")
+    for symbol in journal.pending(symbols):
+        journal.record(symbol, fetch(symbol))
+    publish(journal.results())
+    journal.complete()
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import run_metrics
+from publisher import dumps_compact
+
+JOURNAL_DIR = Path("data/journal")
+
+FORMAT = 'fetch-journal-v1'
+
+
+class FetchJournal:
+    """Append-only log of completed symbols for one fetch run"""
+
+    def __init__(self, name, key, max_age=None, directory=JOURNAL_DIR):
+        """
+        Args:
+            name: Journal name (job, plus the shard for sharded runs)
+            key: Identifies the run; entries are only resumed for the same key
+            max_age: Seconds after which an unfinished journal is stale
+            directory: Where journals are kept
+        """
+        self.path = Path(directory) / f"{name}.jsonl"
+        self.key = key
+        self.max_age = max_age
+        self.entries = {}
+        self.created = time.time()
+        self._file = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, ValueError):
+            return
+        if header.get('format') != FORMAT or header.get('key') != self.key:
+            return
+        if self.max_age is not None and time.time() - header.get('created', 0) > self.max_age:
+            return
+
+        self.created = header['created']
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # Torn write from a crash - everything before it is good
+            self.entries[entry['symbol']] = entry['data']
+
+        if self.entries:
+            print(f"↩️  Resuming from {self.path}: {len(self.entries)} symbols already fetched")
+            run_metrics.inc('journal_resumed_total', len(self.entries), journal=self.path.stem)
+
+    def _open(self):
+        if self._file is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Rewrite the journal with the resumed entries, which also drops a
+        # stale journal or a torn last line
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': FORMAT, 'key': self.key, 'created': self.created}) + '\n')
+            for symbol, data in self.entries.items():
+                f.write(self._line(symbol, data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def _line(symbol, data):
+        return dumps_compact({'symbol': symbol, 'data': data}).decode('utf-8') + '\n'
+
+    def __contains__(self, symbol):
+        return symbol in self.entries
+
+    def pending(self, symbols):
+        """Symbols that still need fetching, in their original order"""
+        return [symbol for symbol in symbols if symbol not in self.entries]
+
+    def record(self, symbol, data):
+        """Checkpoint one completed symbol (data must be JSON-serializable or a record)"""
+        self._open()
+        self._file.write(self._line(symbol, data))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries[symbol] = data
+
+    def results(self):
+        """All completed symbols (resumed and new): symbol -> data"""
+        return dict(self.entries)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self):
+        """The results are published - the journal is no longer needed"""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -5,14 +5,35 @@ Outputs to: data/live_ticker.json
 
 This script fetches real-time stock quotes from Finnhub.io and saves them
 in a format compatible with the stock ticker widget.
+
+Large universes can be split across workers (or API keys):
+
+    python scripts/fetch_live_ticker_finnhub.py --shard 0/4   # ... 3/4, in parallel
+    python scripts/fetch_live_ticker_finnhub.py --merge-shards
 """
 
-import os
+import argparse
 import json
+import os
+import sys
 import time
-import requests
 from datetime import datetime, timezone
 
+import intraday_store
+import profiling
+import run_metrics
+import sharding
+import ticker_bundle
+import validation
+from fetch_journal import FetchJournal
+from lazy_import import lazy_import
+from market_calendar import is_market_holiday
+from publisher import atomic_write, dumps_compact, publish_json
+from records import Quote
+
+# Loaded on first request, so the holiday exit does not pay for it
+requests = lazy_import('requests')
+
 # Ticker symbols (same as in ticker.js)
 TICKER_SYMBOLS = [
     "MCD", "YUM", "QSR", "WEN", "DPZ", "JACK", "WING", "SHAK",
@@ -36,109 +57,19 @@ FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
 # Output file
 OUTPUT_FILE = "data/live_ticker.json"
 
-# US Stock Market Holidays (2024-2026)
-# Source: NYSE/NASDAQ official holiday schedules
-US_MARKET_HOLIDAYS = {
-    # 2024
-    "2024-01-01",  # New Year's Day
-    "2024-01-15",  # Martin Luther King Jr. Day
-    "2024-02-19",  # Presidents' Day
-    "2024-03-29",  # Good Friday
-    "2024-05-27",  # Memorial Day
-    "2024-06-19",  # Juneteenth
-    "2024-07-04",  # Independence Day
-    "2024-09-02",  # Labor Day
-    "2024-11-28",  # Thanksgiving Day
-    "2024-12-25",  # Christmas Day
-
-    # 2025
-    "2025-01-01",  # New Year's Day
-    "2025-01-20",  # Martin Luther King Jr. Day
-    "2025-02-17",  # Presidents' Day
-    "2025-04-18",  # Good Friday
-    "2025-05-26",  # Memorial Day
-    "2025-06-19",  # Juneteenth
-    "2025-07-04",  # Independence Day
-    "2025-09-01",  # Labor Day
-    "2025-11-27",  # Thanksgiving Day
-    "2025-12-25",  # Christmas Day
-
-    # 2026
-    "2026-01-01",  # New Year's Day
-    "2026-01-19",  # Martin Luther King Jr. Day
-    "2026-02-16",  # Presidents' Day
-    "2026-04-03",  # Good Friday
-    "2026-05-25",  # Memorial Day
-    "2026-06-19",  # Juneteenth
-    "2026-07-03",  # Independence Day (observed, July 4 is Saturday)
-    "2026-09-07",  # Labor Day
-    "2026-11-26",  # Thanksgiving Day
-    "2026-12-25",  # Christmas Day
-}
-
-
-def is_market_holiday():
-    """
-    Check if today is a US market holiday
+# Quotes checkpointed by a run that was cut short are reused for this long
+JOURNAL_MAX_AGE = 30 * 60
 
-    Returns:
-        bool: True if today is a market holiday
-    """
-    # Get current date in ET timezone
-    from datetime import datetime
-    import pytz
-
-    try:
-        et_tz = pytz.timezone('America/New_York')
-        now_et = datetime.now(et_tz)
-        today = now_et.strftime('%Y-%m-%d')
-
-        if today in US_MARKET_HOLIDAYS:
-            holiday_name = get_holiday_name(today)
-            print(f"🏖️  Market is closed today for {holiday_name}")
-            return True
-
-        return False
-    except ImportError:
-        # If pytz is not available, use UTC date as fallback
-        # This is less accurate but still works
-        today = datetime.utcnow().strftime('%Y-%m-%d')
-        return today in US_MARKET_HOLIDAYS
-
-
-def get_holiday_name(date_str):
-    """Get holiday name from date"""
-    holiday_names = {
-        "-01-01": "New Year's Day",
-        "-01-15": "Martin Luther King Jr. Day",
-        "-01-19": "Martin Luther King Jr. Day",
-        "-01-20": "Martin Luther King Jr. Day",
-        "-02-16": "Presidents' Day",
-        "-02-17": "Presidents' Day",
-        "-02-19": "Presidents' Day",
-        "-03-29": "Good Friday",
-        "-04-03": "Good Friday",
-        "-04-18": "Good Friday",
-        "-05-25": "Memorial Day",
-        "-05-26": "Memorial Day",
-        "-05-27": "Memorial Day",
-        "-06-19": "Juneteenth",
-        "-07-03": "Independence Day",
-        "-07-04": "Independence Day",
-        "-09-01": "Labor Day",
-        "-09-02": "Labor Day",
-        "-09-07": "Labor Day",
-        "-11-26": "Thanksgiving Day",
-        "-11-27": "Thanksgiving Day",
-        "-11-28": "Thanksgiving Day",
-        "-12-25": "Christmas Day",
-    }
+# Shared HTTP session (keeps the Finnhub connection alive between calls),
+# created on first use
+SESSION = None
 
-    for suffix, name in holiday_names.items():
-        if date_str.endswith(suffix):
-            return name
 
-    return "Market Holiday"
+def get_session():
+    global SESSION
+    if SESSION is None:
+        SESSION = requests.Session()
+    return SESSION
 
 
 def fetch_quote(symbol):
@@ -149,7 +80,7 @@ def fetch_quote(symbol):
         symbol: Stock symbol (e.g., "AAPL")
 
     Returns:
-        dict: Quote data or None if failed
+        Quote: Quote data or None if failed
     """
     # Map Yahoo-style symbols to Finnhub symbols
     finnhub_symbol = SYMBOL_MAP.get(symbol, symbol)
@@ -160,8 +91,11 @@ def fetch_quote(symbol):
         'token': FINNHUB_API_KEY
     }
 
+    started = time.perf_counter()
+    response = None
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(url, params=params, timeout=10)
+        run_metrics.record_request('finnhub', time.perf_counter() - started, response)
         response.raise_for_status()
         data = response.json()
 
@@ -174,25 +108,27 @@ def fetch_quote(symbol):
             change = current - prev_close
             change_percent = (change / prev_close * 100) if prev_close > 0 else 0
 
-            return {
-                'symbol': symbol,  # Use original symbol for consistency
-                'price': round(current, 2),
-                'change': round(change, 2),
-                'changePercent': round(change_percent, 2),
-                'isPositive': change > 0,
-                'isNegative': change < 0,
-                'high': round(data.get('h', current), 2),
-                'low': round(data.get('l', current), 2),
-                'open': round(data.get('o', current), 2),
-                'previousClose': round(prev_close, 2),
-                'timestamp': data.get('t', int(time.time())),
-                'source': 'finnhub'
-            }
+            return Quote(
+                symbol=symbol,  # Use original symbol for consistency
+                price=round(current, 2),
+                change=round(change, 2),
+                changePercent=round(change_percent, 2),
+                isPositive=change > 0,
+                isNegative=change < 0,
+                high=round(data.get('h', current), 2),
+                low=round(data.get('l', current), 2),
+                open=round(data.get('o', current), 2),
+                previousClose=round(prev_close, 2),
+                timestamp=data.get('t', int(time.time())),
+                source='finnhub',
+            )
         else:
             print(f"⚠️  {symbol}: No valid data returned")
             return None
 
     except requests.exceptions.RequestException as e:
+        if response is None:
+            run_metrics.record_request('finnhub', time.perf_counter() - started, error=e)
         print(f"❌ {symbol}: Request failed - {e}")
         return None
     except Exception as e:
@@ -200,27 +136,40 @@ def fetch_quote(symbol):
         return None
 
 
-def fetch_all_quotes():
+def fetch_all_quotes(symbols=None, journal=None):
     """
     Fetch quotes for all symbols with rate limiting
 
+    Args:
+        symbols: Symbols to fetch (default: TICKER_SYMBOLS)
+        journal: Optional FetchJournal; quotes already in it are reused and
+                 every new quote is checkpointed to it
+
     Returns:
-        dict: All quotes keyed by symbol
+        dict: All quotes (Quote records) keyed by symbol
     """
+    symbols = TICKER_SYMBOLS if symbols is None else symbols
     quotes = {}
-    total = len(TICKER_SYMBOLS)
+    total = len(symbols)
 
     print(f"📊 Fetching {total} stock quotes from Finnhub...")
     print(f"⏰ Started at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
 
-    for i, symbol in enumerate(TICKER_SYMBOLS, 1):
+    for i, symbol in enumerate(symbols, 1):
         print(f"[{i}/{total}] Fetching {symbol}...", end=" ")
 
+        if journal is not None and symbol in journal:
+            quotes[symbol] = Quote.from_dict(journal.entries[symbol])
+            print("↩ resumed")
+            continue
+
         quote = fetch_quote(symbol)
 
         if quote:
             quotes[symbol] = quote
-            print(f"✓ ${quote['price']} ({quote['changePercent']:+.2f}%)")
+            if journal is not None:
+                journal.record(symbol, quote)
+            print(f"✓ ${quote.price} ({quote.changePercent:+.2f}%)")
         else:
             print("✗ Failed")
 
@@ -228,38 +177,123 @@ def fetch_all_quotes():
         # Sleep 1.1 seconds between calls to stay under limit (55 calls/minute)
         if i < total:
             time.sleep(1.1)
+            run_metrics.inc('throttle_seconds_total', 1.1, provider='finnhub')
 
     print(f"\n✅ Successfully fetched {len(quotes)}/{total} quotes")
     return quotes
 
 
-def save_quotes(quotes):
+def save_quotes(quotes, fetched_at=None):
     """
-    Save quotes to JSON file
+    Publish quotes to the JSON file (compact, atomic, precompressed)
 
     Args:
-        quotes: Dictionary of quotes
+        quotes: Dictionary of Quote records
+        fetched_at: Snapshot time (ISO string, default: now)
     """
-    # Ensure data directory exists
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    # Leave out bad ticks (10x prices, stale or out-of-order quotes)
+    with run_metrics.stage('validate'):
+        quotes = validation.screen_quotes(quotes)
+    if not quotes:
+        print("\n⚠️  Every quote was quarantined - keeping the published snapshot")
+        return
 
     # Add metadata
     output = {
         'quotes': quotes,
-        'fetchedAt': datetime.utcnow().isoformat() + 'Z',
+        'fetchedAt': fetched_at or datetime.utcnow().isoformat() + 'Z',
         'count': len(quotes),
         'source': 'finnhub'
     }
 
     # Write to file
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    result = publish_json(output, OUTPUT_FILE)
+    run_metrics.record_rows('live_ticker', len(quotes))
 
-    print(f"\n💾 Saved {len(quotes)} quotes to {OUTPUT_FILE}")
+    print(f"\n💾 Saved {len(quotes)} quotes to {OUTPUT_FILE} ({result['bytes']:,} bytes)")
 
+    # One small file for the ticker: quotes joined with history-derived fields
+    ticker_bundle.publish_bundle(quotes, output['fetchedAt'])
 
-def main():
+    # Keep the snapshot for intraday sparklines and 5-minute bars
+    intraday_store.record_snapshot(quotes)
+
+
+# =============================================================================
+# SHARDED RUNS
+# =============================================================================
+
+def save_shard(quotes, shard):
+    """Write one shard's quotes as a partial output for --merge-shards"""
+    path = sharding.shard_path('live_ticker', shard, '.json')
+    atomic_write(path, dumps_compact({
+        'shard': list(shard),
+        'fetchedAt': datetime.utcnow().isoformat() + 'Z',
+        'quotes': quotes,
+    }))
+    print(f"\n💾 Saved {len(quotes)} quotes for shard {shard[0]}/{shard[1]} to {path}")
+
+
+def merge_shards():
+    """
+    Merge the shards' partial outputs and publish them as one snapshot
+
+    Shards are merged in index order and the snapshot time is the latest
+    shard's, so the result does not depend on which worker finished first.
+
+    Nothing is published unless every shard's output is there: the missing
+    shards' symbols would drop out of the snapshot, the bundle and the
+    intraday store. The shard files are left for a retry.
+
+    Returns:
+        int: Process exit status
+    """
+    paths, missing = sharding.collect('live_ticker', '.json')
+    if not paths:
+        print("❌ No shard outputs to merge")
+        return 1
+    if missing:
+        print(f"❌ Missing shard(s) {', '.join(map(str, missing))} - not publishing a partial snapshot")
+        return 1
+
+    quotes = {}
+    fetched_at = []
+    with run_metrics.stage('merge'):
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                partial = json.load(f)
+            quotes.update((symbol, Quote.from_dict(quote)) for symbol, quote in partial['quotes'].items())
+            fetched_at.append(partial['fetchedAt'])
+
+    if not quotes:
+        print("❌ No shard fetched any quotes")
+        sharding.remove(paths)
+        return 1
+
+    print(f"🧩 Merged {len(quotes)} quotes from {len(paths)} shard(s)")
+    with run_metrics.stage('publish'):
+        # Same symbol order as an unsharded run
+        order = {symbol: i for i, symbol in enumerate(TICKER_SYMBOLS)}
+        ordered = sorted(quotes.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+        save_quotes(dict(ordered), max(fetched_at))
+    sharding.remove(paths)
+    return 0
+
+
+def add_arguments(parser):
+    parser.add_argument('--shard', type=sharding.parse_shard, metavar='i/N',
+                        help="Fetch only shard i of N (0-based) and write a partial output")
+    parser.add_argument('--merge-shards', action='store_true',
+                        help="Merge the shards' partial outputs and publish them")
+
+
+@run_metrics.instrumented('ticker')
+def main(args=None):
     """Main execution"""
+    args = args or argparse.Namespace(shard=None, merge_shards=False)
+    if args.merge_shards:
+        return merge_shards()
+
     if not FINNHUB_API_KEY:
         print("❌ Error: FINNHUB_API_KEY environment variable not set")
         print("Please set it in GitHub Secrets or export it locally")
@@ -276,15 +310,26 @@ def main():
         print("\n" + "=" * 60)
         exit(0)
 
-    # Fetch all quotes
-    quotes = fetch_all_quotes()
+    # Fetch all quotes (or this worker's share of them), checkpointing each
+    # one so a run cut short resumes instead of starting over
+    shard = f"{args.shard[0]}-of-{args.shard[1]}" if args.shard else 'all'
+    journal = FetchJournal(f"ticker.{shard}", key=shard, max_age=JOURNAL_MAX_AGE)
+    with run_metrics.stage('fetch'):
+        quotes = fetch_all_quotes(sharding.select(TICKER_SYMBOLS, args.shard), journal)
 
-    if not quotes:
+    # A shard writes its output even when empty: the merge needs every
+    # shard's file to tell a quiet shard from a lost one
+    if not quotes and not args.shard:
         print("\n❌ Failed to fetch any quotes")
         exit(1)
 
     # Save to file
-    save_quotes(quotes)
+    with run_metrics.stage('publish'):
+        if args.shard:
+            save_shard(quotes, args.shard)
+        else:
+            save_quotes(quotes)
+    journal.complete()
 
     print("\n" + "=" * 60)
     print("✅ DONE!")
@@ -292,4 +337,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(profiling.run(main, 'ticker', description="Fetch live quotes from Finnhub",
+                           arguments=add_arguments))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+FRANCHISE DATA COMMAND LINE
+=============================================================================
+
+One entry point for all data jobs. Each subcommand imports only the module
+it runs, and those modules defer their heavy dependencies (pandas,
+yfinance, requests, feedparser) until they are actually used, so trivial
+paths - a market holiday, a stock CSV that is already up to date - exit
+in milliseconds instead of paying for a full import.
+
+Commands:
+    ticker          Fetch live quotes from Finnhub       (fetch_live_ticker_finnhub)
+    history         Update the stock history CSV         (update_franchise_stocks)
+    news            Aggregate franchise news feeds       (fetch_franchise_news_rss)
+    news-widget     Fetch the franchise news widget feed (FranchiseNews/news_fetcher)
+    orchestrate     Run the jobs on a schedule           (orchestrator)
+    serve           Serve the data over HTTP             (data_api_server)
+    import-times    Show the import cost of each command
+
+Arguments after the command go to that command (ticker, history, news and
+news-widget accept --profile; ticker and history also --shard i/N and
+--merge-shards).
+
+Usage:
+    python scripts/franchise_data.py history
+    python scripts/franchise_data.py news --profile
+    python scripts/franchise_data.py orchestrate --once --jobs ticker
+    python scripts/franchise_data.py import-times
+=============================================================================
+"""
+
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+WIDGET_DIR = REPO_ROOT / "FranchiseNews"
+
+# command -> (module, job name for metrics/profiles or None, help)
+# Commands with a job name run main() through profiling.run(); the others
+# get the remaining arguments passed to main(argv)
+COMMANDS = {
+    'ticker': ('fetch_live_ticker_finnhub', 'ticker', "Fetch live quotes from Finnhub"),
+    'history': ('update_franchise_stocks', 'history', "Update the stock history CSV"),
+    'news': ('fetch_franchise_news_rss', 'news', "Aggregate franchise news feeds"),
+    'news-widget': ('news_fetcher', 'news_widget', "Fetch the franchise news widget feed"),
+    'orchestrate': ('orchestrator', None, "Run the data jobs on a schedule in one process"),
+    'serve': ('data_api_server', None, "Serve quotes, history and news over HTTP"),
+}
+
+
+def load(module_name):
+    """Import a command module (scripts/ and FranchiseNews/ are on the path)"""
+    for directory in (SCRIPTS_DIR, WIDGET_DIR):
+        if str(directory) not in sys.path:
+            sys.path.insert(0, str(directory))
+    return importlib.import_module(module_name)
+
+
+def run_command(name, argv):
+    module_name, job, description = COMMANDS[name]
+    module = load(module_name)
+
+    if job is None:
+        return module.main(argv)
+
+    import profiling
+    return profiling.run(module.main, job, argv, description=description,
+                         arguments=getattr(module, 'add_arguments', None))
+
+
+# =============================================================================
+# IMPORT TIMES
+# =============================================================================
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_time(module_name):
+    """
+    Import a command module in a fresh interpreter with -X importtime
+
+    Returns:
+        tuple: (total_us, [(cumulative_us, top-level dependency), ...])
+    """
+    code = (f"import sys; sys.path[:0] = [{str(SCRIPTS_DIR)!r}, {str(WIDGET_DIR)!r}]; "
+            f"import {module_name}")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, cwd=REPO_ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # (cumulative_us, indent, name); children are listed before their parent
+    entries = [(int(m.group(2)), len(m.group(3)), m.group(4))
+               for m in map(_IMPORTTIME_RE.match, result.stderr.splitlines()) if m]
+    index = max(i for i, entry in enumerate(entries) if entry[2] == module_name)
+    total, indent, _ = entries[index]
+
+    dependencies = []
+    for cumulative, child_indent, name in reversed(entries[:index]):
+        if child_indent <= indent:
+            break
+        if child_indent == indent + 2:
+            dependencies.append((cumulative, name))
+
+    return total, sorted(dependencies, reverse=True)
+
+
+def show_import_times(argv):
+    parser = argparse.ArgumentParser(prog='franchise_data.py import-times',
+                                     description="Show the import cost of each command")
+    parser.add_argument('commands', nargs='*', help="Commands to measure (default: all)")
+    parser.add_argument('--top', type=int, default=3, help="Heaviest direct imports to list (default 3)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.commands if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    for name in args.commands or COMMANDS:
+        module_name = COMMANDS[name][0]
+        try:
+            total, dependencies = import_time(module_name)
+        except RuntimeError as e:
+            print(f"  {name:<14} failed: {e}")
+            continue
+        heaviest = ', '.join(f"{dep} {us / 1000:.1f}" for us, dep in dependencies[:args.top])
+        print(f"  {name:<14} {total / 1000:>8.1f} ms   ({heaviest})")
+
+    return 0
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    listing = '\n'.join(f"  {name:<14} {description}" for name, (_, _, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        description="Franchise data jobs",
+        epilog=f"commands:\n{listing}\n  {'import-times':<14} Show the import cost of each command\n\n"
+               "Arguments after the command are passed to it (e.g. `history --profile`).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('command', choices=list(COMMANDS) + ['import-times'], metavar='command')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="Arguments for the command")
+    args = parser.parse_args(argv)
+
+    if args.command == 'import-times':
+        return show_import_times(args.args)
+
+    # The job scripts use paths relative to the repository root
+    os.chdir(REPO_ROOT)
+    return run_command(args.command, args.args)
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(1)
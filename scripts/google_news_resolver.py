@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Resolve Google News article links to canonical publisher URLs.
+
+Google News RSS items point at opaque news.google.com/rss/articles/<id>
+links and carry an HTML summary (<a>headline</a>&nbsp;<font>outlet</font>).
+This stage:
+
+  1. Resolves each Google link to the publisher URL, concurrently with a
+     bounded worker pool
+  2. Remembers every resolution in data/google_news_urls.json, so a link is
+     only resolved once ever (failures are retried after a cool-down)
+  3. Rewrites the article's url/id to the publisher URL so URL dedup
+     against publisher feeds works
+  4. Strips the summary HTML down to plain text (dropped entirely when it
+     only repeats the headline and outlet)
+
+Resolution strategy per link:
+    - Older ids embed the target URL in their base64 payload - decode offline
+    - Newer ids need the article page's signature/timestamp, which is then
+      exchanged for the URL through Google's batchexecute endpoint
+"""
+
+import base64
+import html
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlparse, urlunparse
+
+import requests
+
+from publisher import write_state
+
+CACHE_PATH = Path("data/google_news_urls.json")
+
+MAX_WORKERS = 8              # Concurrent resolutions
+REQUEST_TIMEOUT = 10         # Seconds per HTTP request
+RETRY_FAILED_HOURS = 24      # Re-try unresolvable links after this long
+CACHE_TTL_DAYS = 60          # Forget links not seen for this long
+
+GOOGLE_NEWS_HOST = 'news.google.com'
+BATCHEXECUTE_URL = 'https://news.google.com/_/DotsSplashUi/data/batchexecute'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Query parameters that only track the click, not the article
+TRACKING_PARAMS = ('utm_', 'ocid', 'cmpid', 'fbclid', 'gclid', 'guccounter')
+
+_TAG_RE = re.compile(r'<[^>]*(?:>|$)')  # Also drops a tag cut off by truncation
+_URL_RE = re.compile(rb'https?://[\x21-\x7e]+')
+_SIGNATURE_RE = re.compile(r'data-n-a-sg="([^"]+)"')
+_TIMESTAMP_RE = re.compile(r'data-n-a-ts="([^"]+)"')
+
+_thread_local = threading.local()
+
+
+def _session():
+    """One requests session per worker thread (keeps connections alive)"""
+    if not hasattr(_thread_local, 'session'):
+        _thread_local.session = requests.Session()
+        _thread_local.session.headers.update(HEADERS)
+    return _thread_local.session
+
+
+def is_google_news_url(url):
+    """True for news.google.com article redirect links"""
+    parsed = urlparse(url or '')
+    return parsed.netloc == GOOGLE_NEWS_HOST and '/articles/' in parsed.path
+
+
+def article_token(url):
+    """Extract the opaque article id from a Google News link"""
+    return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def canonicalize_url(url):
+    """
+    Drop tracking query parameters and fragments from a publisher URL
+
+    The other parameters are kept as they were written (same order and
+    encoding), so a URL without tracking parameters only loses its fragment.
+    """
+    parsed = urlparse(url)
+    query = [part for part in parsed.query.split('&')
+             if part and not part.split('=', 1)[0].lower().startswith(TRACKING_PARAMS)]
+    return urlunparse(parsed._replace(query='&'.join(query), fragment=''))
+
+
+def html_to_text(value):
+    """Strip tags and entities from an HTML fragment"""
+    if not value:
+        return ''
+    text = html.unescape(_TAG_RE.sub(' ', value))
+    return ' '.join(text.replace('\xa0', ' ').split())
+
+
+# =============================================================================
+# RESOLUTION
+# =============================================================================
+
+def decode_offline(token):
+    """
+    Decode old-style ids that embed the publisher URL
+
+    Returns:
+        str or None: Publisher URL if present in the payload
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return None
+
+    match = _URL_RE.search(raw)
+    if not match:
+        return None
+
+    url = match.group(0).decode('ascii', errors='ignore')
+    return None if GOOGLE_NEWS_HOST in url else url
+
+
+def decode_online(token):
+    """
+    Resolve new-style ids through the article page + batchexecute call
+
+    Returns:
+        str or None: Publisher URL
+    """
+    session = _session()
+
+    page = session.get(f"https://{GOOGLE_NEWS_HOST}/rss/articles/{token}", timeout=REQUEST_TIMEOUT)
+    if not is_google_news_url(page.url) and page.url.startswith('http'):
+        return page.url  # Plain HTTP redirect
+
+    signature = _SIGNATURE_RE.search(page.text)
+    timestamp = _TIMESTAMP_RE.search(page.text)
+    if not signature or not timestamp:
+        return None
+
+    inner = ["garturlreq", [["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1,
+                             None, None, None, None, None, 0, 1], "X", "X", 1, [1, 1, 1], 1, 1,
+                            None, 0, 0, None, 0], token, int(timestamp.group(1)), signature.group(1)]
+    payload = {'f.req': json.dumps([[["Fbv4je", json.dumps(inner), None, "generic"]]])}
+
+    response = session.post(
+        BATCHEXECUTE_URL,
+        data=payload,
+        headers={'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'},
+        timeout=REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+
+    # Response is ")]}'\n\n<json>" - the URL sits in a JSON string inside it
+    body = response.text.split('\n\n', 1)[-1]
+    result = json.loads(json.loads(body)[0][2])
+    url = result[1]
+    return url if isinstance(url, str) and url.startswith('http') else None
+
+
+def resolve_token(token):
+    """
+    Resolve one Google News id
+
+    Returns:
+        tuple: (publisher URL or None, error message or None)
+    """
+    url = decode_offline(token)
+    if url:
+        return url, None
+
+    try:
+        return decode_online(token), None
+    except Exception as e:  # noqa: BLE001 - any failure is cached and retried later
+        return None, str(e)[:200]
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def load_cache(path=CACHE_PATH):
+    """Load the resolution cache (token -> entry)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    """Persist the resolution cache, dropping links not seen recently"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=CACHE_TTL_DAYS)).isoformat()
+    kept = {token: entry for token, entry in cache.items() if entry.get('last_seen', '') >= cutoff}
+    write_state(dict(sorted(kept.items())), path)
+
+
+def _needs_resolution(entry, now):
+    if entry is None:
+        return True
+    if entry.get('url'):
+        return False
+    failed_at = entry.get('failed_at')
+    return not failed_at or failed_at < (now - timedelta(hours=RETRY_FAILED_HOURS)).isoformat()
+
+
+def resolve_urls(urls, cache, max_workers=MAX_WORKERS):
+    """
+    Resolve Google News links, consulting and filling the cache
+
+    Args:
+        urls: Iterable of Google News links
+        cache: Cache dict from load_cache() (updated in place)
+        max_workers: Maximum concurrent resolutions
+
+    Returns:
+        dict: Google link -> publisher URL (only successfully resolved links)
+    """
+    now = datetime.now(timezone.utc)
+    tokens = {url: article_token(url) for url in urls if is_google_news_url(url)}
+
+    pending = sorted({t for t in tokens.values() if _needs_resolution(cache.get(t), now)})
+    if pending:
+        print(f"🔗 Resolving {len(pending)} Google News links ({len(tokens) - len(pending)} cached)...")
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(resolve_token, pending))
+
+        resolved = 0
+        for token, (url, error) in zip(pending, results):
+            if url:
+                cache[token] = {'url': canonicalize_url(url), 'resolved_at': now.isoformat()}
+                resolved += 1
+            else:
+                cache[token] = {'url': None, 'failed_at': now.isoformat(), 'error': error}
+
+        print(f"  ✓ Resolved {resolved}/{len(pending)} in {time.monotonic() - started:.1f}s")
+
+    mapping = {}
+    for url, token in tokens.items():
+        entry = cache.setdefault(token, {'url': None})
+        entry['last_seen'] = now.isoformat()
+        if entry.get('url'):
+            mapping[url] = entry['url']
+
+    return mapping
+
+
+def resolve_google_news_articles(articles, id_func, cache_path=CACHE_PATH, max_workers=MAX_WORKERS):
+    """
+    Rewrite Google News articles to publisher URLs and plain-text summaries
+
+    Args:
+        articles: Article records from the RSS aggregator (updated in place)
+        id_func: Function mapping a URL to an article id
+        cache_path: Resolution cache location
+        max_workers: Maximum concurrent resolutions
+
+    Returns:
+        list: The same articles
+    """
+    google_articles = [a for a in articles if a.source_type == 'google_news']
+    if not google_articles:
+        return articles
+
+    cache = load_cache(cache_path)
+    mapping = resolve_urls([a.url for a in google_articles], cache, max_workers=max_workers)
+    save_cache(cache, cache_path)
+
+    for article in google_articles:
+        publisher_url = mapping.get(article.url)
+        if publisher_url:
+            article.google_news_url = article.url
+            article.url = publisher_url
+            article.id = id_func(publisher_url)
+
+        # Google's summary is just "<a>headline</a> <font>outlet</font>"
+        summary = html_to_text(article.summary)
+        headline = (article.title or '').rsplit(' - ', 1)[0]
+        if headline and summary.startswith(headline):
+            summary = ''
+        article.summary = summary
+
+    return articles
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of daily history responses, so ranges are downloaded once.
+
+Without it, every re-run of the history update downloads ranges it has
+already fetched: after a crash, when the CSV is rebuilt (a full 10-year pull)
+or during development. Fetched bars are kept per symbol in
+
+    data/cache/history/<SYMBOL>.json
+
+split into calendar-month segments. Each segment records the date range
+[from, to) it covers and when it was fetched:
+
+    {"format": "history-cache-v1", "symbol": "MCD",
+     "columns": ["date", "open", "high", "low", "close", "adjClose", "volume"],
+     "segments": {"2024-01": {"from": "2024-01-01", "to": "2024-02-01",
+                              "fetchedOn": "2024-02-03", "fetchedAt": 1706990000,
+                              "rows": [["2024-01-02", ...], ...]}}}
+
+Days before the day a segment was fetched (ET) were closed sessions and are
+cached permanently. The day it was fetched on (and any later day in the
+range) may still change, so that part is only reused for LIVE_TTL seconds.
+
+A request for [start, end) is split along the segments; only the parts that
+are not covered are downloaded, adjacent parts as one request. A rebuild of
+the whole history only downloads the days no run has seen yet.
+
+Failed downloads are not cached: download() must raise for them. An empty
+download is only cached when the range has no trading day (weekends,
+holidays); otherwise it is taken for an outage and asked for again.
+
+Cached bars are not re-adjusted for later splits or dividends, the same as
+the CSV, which only ever appends new days.
+"""
+
+import json
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import run_metrics
+from lazy_import import lazy_import
+from market_calendar import has_trading_day, trading_date
+from publisher import atomic_write, dumps_compact
+
+pd = lazy_import('pandas')
+
+CACHE_DIR = Path("data/cache/history")
+
+FORMAT = 'history-cache-v1'
+
+COLUMNS = ['date', 'open', 'high', 'low', 'close', 'adjClose', 'volume']
+
+LIVE_TTL = 15 * 60      # Seconds the current day's bars are reused
+
+
+def _day(value):
+    """A date from a date, datetime or YYYY-MM-DD string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _months(start, end):
+    """(key, segment start, segment end) of the months overlapping [start, end)"""
+    month = _month_start(start)
+    while month < end:
+        following = _next_month(month)
+        yield month.strftime('%Y-%m'), max(start, month), min(end, following)
+        month = following
+
+
+def cache_path(symbol, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{symbol.upper()}.json"
+
+
+def load_segments(symbol, cache_dir=CACHE_DIR):
+    """A symbol's cached segments (month key -> segment); {} if there are none"""
+    try:
+        with open(cache_path(symbol, cache_dir), 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if document.get('format') != FORMAT or document.get('columns') != COLUMNS:
+        return {}
+    return document.get('segments', {})
+
+
+def save_segments(symbol, segments, cache_dir=CACHE_DIR):
+    atomic_write(cache_path(symbol, cache_dir), dumps_compact({
+        'format': FORMAT,
+        'symbol': symbol.upper(),
+        'columns': COLUMNS,
+        'segments': dict(sorted(segments.items())),
+    }))
+
+
+def covered_until(segment, now=None):
+    """
+    End (exclusive) of the part of a segment that can be reused
+
+    Closed days are always reusable; the days from the fetch day on only
+    while the segment is younger than LIVE_TTL.
+    """
+    now = time.time() if now is None else now
+    if now - segment['fetchedAt'] < LIVE_TTL:
+        return _day(segment['to'])
+    return max(_day(segment['from']), min(_day(segment['to']), _day(segment['fetchedOn'])))
+
+
+def missing_ranges(segments, start, end, now=None):
+    """
+    Parts of [start, end) that are not in the cache
+
+    Days between the request and the segment's reusable part are included
+    (before a segment that starts later in the month, after one whose
+    reusable part ends earlier), so the download can always be merged into
+    the segment.
+
+    Returns:
+        list: (start, end) date ranges in order, adjacent parts merged
+    """
+    ranges = []
+    for key, lo, hi in _months(start, end):
+        segment = segments.get(key)
+        if segment is None:
+            parts = [(lo, hi)]
+        else:
+            first, until = _day(segment['from']), covered_until(segment, now)
+            parts = [(lo, first)] if lo < first else []
+            if hi > until:
+                # From the reusable end even if the request starts later:
+                # a gap would make store_range() replace the segment
+                parts.append((until, hi))
+        for part_lo, part_hi in parts:
+            if ranges and ranges[-1][1] == part_lo:
+                ranges[-1] = (ranges[-1][0], part_hi)
+            else:
+                ranges.append((part_lo, part_hi))
+    return ranges
+
+
+def store_range(segments, start, end, rows, today, now=None):
+    """
+    Record the rows downloaded for [start, end) in the segments (in place)
+
+    A download that overlaps or touches a segment's reusable part is merged
+    into it (the downloaded days replace the cached ones); otherwise it
+    replaces the segment.
+    """
+    now = time.time() if now is None else now
+    for key, lo, hi in _months(start, end):
+        fetched = [row for row in rows if lo.isoformat() <= row[0] < hi.isoformat()]
+        entry = {'from': lo, 'to': hi, 'fetchedOn': today.isoformat(), 'fetchedAt': int(now)}
+        segment = segments.get(key)
+        if segment is not None:
+            first, until = _day(segment['from']), covered_until(segment, now)
+            if lo <= until and first <= hi:
+                before = [row for row in segment['rows'] if row[0] < lo.isoformat()]
+                after = [row for row in segment['rows'] if hi.isoformat() <= row[0] < until.isoformat()]
+                fetched = before + fetched + after
+                entry['from'], entry['to'] = min(lo, first), max(hi, until)
+                if hi < until:
+                    # Only days before the segment were added: its fetch
+                    # time still decides when its last days expire
+                    entry['fetchedOn'], entry['fetchedAt'] = segment['fetchedOn'], segment['fetchedAt']
+        segments[key] = {
+            'from': entry['from'].isoformat(),
+            'to': entry['to'].isoformat(),
+            'fetchedOn': entry['fetchedOn'],
+            'fetchedAt': entry['fetchedAt'],
+            'rows': fetched,
+        }
+
+
+def cached_rows(segments, start, end):
+    """Cached rows in [start, end), in date order"""
+    lo, hi = start.isoformat(), end.isoformat()
+    rows = []
+    for key, _, _ in _months(start, end):
+        segment = segments.get(key)
+        if segment is not None:
+            rows.extend(row for row in segment['rows'] if lo <= row[0] < hi)
+    return rows
+
+
+def fetch(symbol, start_date, end_date, download, cache_dir=CACHE_DIR, now=None):
+    """
+    Daily bars for [start_date, end_date], downloading only what is not cached
+
+    Args:
+        symbol: Stock symbol
+        start_date: First day (date or datetime)
+        end_date: Last day; a datetime after midnight includes its own day,
+                  like the provider's end timestamp
+        download: download(symbol, start, end) -> normalized DataFrame
+                  (COLUMNS plus symbol) for [start, end) as datetimes;
+                  raises on errors, which are not cached
+        now: Unix time, for testing
+
+    Returns:
+        DataFrame: date, symbol, open, high, low, close, adjClose, volume
+    """
+    now = time.time() if now is None else now
+    start = _day(start_date)
+    end = _day(end_date)
+    if not isinstance(end_date, datetime) or end_date.time() != datetime.min.time():
+        end += timedelta(days=1)
+    today = _day(trading_date(now))
+
+    segments = load_segments(symbol, cache_dir)
+    ranges = missing_ranges(segments, start, end, now)
+    downloaded = 0
+    stored = False
+    for lo, hi in ranges:
+        frame = download(symbol, datetime.combine(lo, datetime.min.time()),
+                         datetime.combine(hi, datetime.min.time()))
+        rows = frame[COLUMNS].to_dict(orient='split', index=False)['data'] if not frame.empty else []
+        downloaded += len(rows)
+        if not rows and has_trading_day(lo, hi):
+            # No bars for trading days: do not trust that as the final answer
+            run_metrics.inc('history_cache_uncached_total')
+            continue
+        store_range(segments, lo, hi, rows, today, now)
+        stored = True
+    if stored:
+        save_segments(symbol, segments, cache_dir)
+
+    rows = cached_rows(segments, start, end)
+    run_metrics.inc('history_cache_rows_total', len(rows) - downloaded)
+    if not ranges:
+        run_metrics.inc('history_cache_hits_total')
+
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df.insert(1, 'symbol', symbol)
+    return df
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Intraday quote store built from the live ticker snapshots.
+
+Every ticker refresh appends its quotes to a per-day store instead of
+only overwriting data/live_ticker.json, so intraday sparklines and charts
+come for free from calls we already make:
+
+    data/cache/intraday/store.bin   Today's samples (state, not committed)
+    data/intraday/<SYMBOL>.json     Today's series for one symbol (published)
+    data/intraday/bars/<date>.json  5-minute OHLCV bars for a finished day
+
+The store changes on every run, so it is not committed; the ticker
+workflow carries it between runs with actions/cache. The per-symbol
+series also change on every run and are a few KB, so they are published
+without .gz/.br siblings (the bar files, written once a day, keep them).
+
+Each symbol keeps three array-backed columns (timestamp, price, volume) in
+a fixed-capacity ring buffer, so a day's store stays bounded however often
+the ticker runs. The store file is a one-line JSON header followed by the
+raw little-endian arrays - a few KB for the whole universe.
+
+Once the market has closed (or when the first snapshot of a new day
+arrives) the day is rolled up into 5-minute bars and the store starts
+over. Volume is the session's cumulative volume when the quote provides
+one (Finnhub's /quote does not, so it is 0 there); bar volume is the
+increase within the bar.
+
+Usage:
+    python scripts/intraday_store.py rollup   # Roll up the stored day now
+"""
+
+import json
+import sys
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from market_calendar import MARKET_CLOSE, now_eastern, trading_date
+from publisher import REPO_ROOT, atomic_write, publish_json
+
+INTRADAY_DIR = REPO_ROOT / "data" / "intraday"
+STORE_PATH = REPO_ROOT / "data" / "cache" / "intraday" / "store.bin"
+BARS_DIR = INTRADAY_DIR / "bars"
+
+CAPACITY = 512          # Samples kept per symbol and day (1/min covers the session)
+BAR_SECONDS = 5 * 60
+KEEP_BAR_DAYS = 10      # Daily bar files kept
+
+MAGIC = 'intraday-v1'
+
+
+class SymbolSeries:
+    """Ring buffer of (timestamp, price, volume) samples for one symbol"""
+
+    __slots__ = ('capacity', 'start', 'count', 't', 'p', 'v')
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.start = 0
+        self.count = 0
+        self.t = array('q', bytes(8 * capacity))
+        self.p = array('d', bytes(8 * capacity))
+        self.v = array('q', bytes(8 * capacity))
+
+    def __len__(self):
+        return self.count
+
+    def last(self):
+        if not self.count:
+            return None
+        i = (self.start + self.count - 1) % self.capacity
+        return self.t[i], self.p[i], self.v[i]
+
+    def append(self, timestamp, price, volume=0):
+        """
+        Add a sample (the oldest one is dropped when the buffer is full)
+
+        Returns:
+            bool: False if the sample is not newer than the last one
+        """
+        last = self.last()
+        if last is not None and timestamp <= last[0]:
+            return False
+
+        if self.count < self.capacity:
+            i = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            i = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        self.t[i] = timestamp
+        self.p[i] = price
+        self.v[i] = volume
+        return True
+
+    def columns(self):
+        """Samples in time order as three arrays"""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.t[self.start:end], self.p[self.start:end], self.v[self.start:end]
+        wrap = end - self.capacity
+        return (self.t[self.start:] + self.t[:wrap],
+                self.p[self.start:] + self.p[:wrap],
+                self.v[self.start:] + self.v[:wrap])
+
+    @classmethod
+    def from_columns(cls, t, p, v, capacity=CAPACITY):
+        series = cls(capacity)
+        for sample in zip(t[-capacity:], p[-capacity:], v[-capacity:]):
+            series.append(*sample)
+        return series
+
+
+class IntradayStore:
+    """One trading day of samples for every symbol"""
+
+    def __init__(self, date, capacity=CAPACITY):
+        self.date = date
+        self.capacity = capacity
+        self.series = {}
+
+    def append(self, symbol, timestamp, price, volume=0):
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = SymbolSeries(self.capacity)
+        return series.append(timestamp, price, volume)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def to_bytes(self):
+        symbols = sorted(self.series)
+        header = {
+            'format': MAGIC,
+            'date': self.date,
+            'capacity': self.capacity,
+            'symbols': [[symbol, len(self.series[symbol])] for symbol in symbols],
+        }
+        chunks = [json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n']
+        for symbol in symbols:
+            for column in self.series[symbol].columns():
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                chunks.append(column.tobytes())
+        return b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, payload):
+        newline = payload.index(b'\n')
+        header = json.loads(payload[:newline])
+        if header.get('format') != MAGIC:
+            raise ValueError(f"unknown intraday store format {header.get('format')!r}")
+
+        store = cls(header['date'], header.get('capacity', CAPACITY))
+        offset = newline + 1
+        for symbol, count in header['symbols']:
+            columns = []
+            for typecode in ('q', 'd', 'q'):
+                column = array(typecode)
+                column.frombytes(payload[offset:offset + 8 * count])
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                columns.append(column)
+                offset += 8 * count
+            store.series[symbol] = SymbolSeries.from_columns(*columns, capacity=store.capacity)
+        return store
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        """Load the stored day (None if missing or unreadable)"""
+        try:
+            return cls.from_bytes(Path(path).read_bytes())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, path=STORE_PATH):
+        return atomic_write(path, self.to_bytes())
+
+    # -------------------------------------------------------------------------
+    # Outputs
+    # -------------------------------------------------------------------------
+
+    def symbol_payload(self, symbol):
+        t, p, v = self.series[symbol].columns()
+        return {
+            'symbol': symbol,
+            'date': self.date,
+            't': t.tolist(),
+            'p': p.tolist(),
+            'v': v.tolist(),
+        }
+
+    def bars(self, seconds=BAR_SECONDS):
+        """
+        Roll the samples up into fixed-interval OHLCV bars
+
+        Returns:
+            dict: symbol -> {'t', 'o', 'h', 'l', 'c', 'v'} column lists
+        """
+        result = {}
+        for symbol, series in sorted(self.series.items()):
+            columns = {key: [] for key in ('t', 'o', 'h', 'l', 'c', 'v')}
+            bucket = None
+            for timestamp, price, volume in zip(*series.columns()):
+                start = timestamp - timestamp % seconds
+                if start != bucket:
+                    # Cumulative volume at the end of the previous bar (the
+                    # first sample is the baseline for the first bar)
+                    baseline = volume if bucket is None else last_volume
+                    bucket = start
+                    for key, value in (('t', start), ('o', price), ('h', price), ('l', price), ('c', price)):
+                        columns[key].append(value)
+                    columns['v'].append(0)
+                else:
+                    columns['h'][-1] = max(columns['h'][-1], price)
+                    columns['l'][-1] = min(columns['l'][-1], price)
+                    columns['c'][-1] = price
+                columns['v'][-1] = max(0, volume - baseline)
+                last_volume = volume
+            result[symbol] = columns
+        return result
+
+
+# =============================================================================
+# TICKER INTEGRATION
+# =============================================================================
+
+def rollup(store, bars_dir=BARS_DIR, keep_days=KEEP_BAR_DAYS):
+    """Publish the store's 5-minute bars and prune old bar files"""
+    if not store.series:
+        return None
+
+    result = publish_json({
+        'date': store.date,
+        'interval': BAR_SECONDS,
+        'symbols': store.bars(),
+    }, Path(bars_dir) / f"{store.date}.json", name=False)
+
+    cutoff = (datetime.strptime(store.date, '%Y-%m-%d') - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+    for path in Path(bars_dir).glob('*.json*'):
+        if path.name[:10] < cutoff:
+            path.unlink()
+
+    print(f"🕯️  Rolled up {len(store.series)} symbols into 5-minute bars ({result['path']})")
+    return result
+
+
+def record_snapshot(quotes, now=None, store_path=STORE_PATH, intraday_dir=INTRADAY_DIR):
+    """
+    Append one ticker snapshot to the day's store and publish the series
+
+    Quotes whose trade timestamp is not from the current trading day (the
+    previous close before the open, holidays) are ignored.
+
+    Args:
+        quotes: dict of symbol -> Quote (fetch_all_quotes output)
+        now: Current time (ET), for testing
+
+    Returns:
+        int: Number of samples added
+    """
+    now = now or now_eastern()
+    today = now.strftime('%Y-%m-%d')
+    intraday_dir = Path(intraday_dir)
+
+    store = IntradayStore.load(store_path)
+    if store is not None and store.date != today:
+        rollup(store, intraday_dir / 'bars')
+        store = None
+    if store is None:
+        store = IntradayStore(today)
+
+    added = set()
+    for symbol, quote in quotes.items():
+        timestamp = int(quote.timestamp or 0)
+        if not timestamp or trading_date(timestamp) != today:
+            continue
+        # Finnhub quotes carry no volume; the store keeps the column for feeds that do
+        if store.append(symbol, timestamp, float(quote.price)):
+            added.add(symbol)
+
+    store.save(store_path)
+    for symbol in sorted(added):
+        publish_json(store.symbol_payload(symbol), intraday_dir / f"{symbol}.json", name=False, compress=False)
+
+    print(f"📈 Intraday store: {len(added)} new samples for {store.date}")
+
+    if now.time() >= MARKET_CLOSE:
+        rollup(store, intraday_dir / 'bars')
+
+    return len(added)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ['rollup']:
+        print("Usage: python scripts/intraday_store.py rollup")
+        return 2
+
+    store = IntradayStore.load()
+    if store is None:
+        print("No intraday store to roll up")
+        return 0
+    rollup(store)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for heavy optional dependencies.
+
+    pd = lazy_import('pandas')
+
+returns a module object whose code only runs on first attribute access,
+so a script can keep its usual `pd.concat(...)` / `yf.Ticker(...)` style
+while paths that never touch the library (holiday exit, "CSV already up
+to date") skip its import cost entirely. A missing package still raises
+ImportError at the lazy_import() call, like a normal import would.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Import a module lazily
+
+    Args:
+        name: Absolute module name (e.g. "pandas")
+
+    Returns:
+        module: The module (already imported, or loading on first use)
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
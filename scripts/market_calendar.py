@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+US stock market calendar shared by the data scripts.
+
+Holiday list plus helpers to decide whether the market is open, used by
+the live ticker fetcher and the job orchestrator.
+"""
+
+from datetime import datetime, time as dt_time, timedelta
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    EASTERN = ZoneInfo('America/New_York')
+except (ImportError, ZoneInfoNotFoundError):
+    # No tz database (e.g. Windows without the tzdata package)
+    EASTERN = None
+
+# Regular session hours (America/New_York)
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+# US Stock Market Holidays (2024-2026)
+# Source: NYSE/NASDAQ official holiday schedules
+US_MARKET_HOLIDAYS = {
+    # 2024
+    "2024-01-01",  # New Year's Day
+    "2024-01-15",  # Martin Luther King Jr. Day
+    "2024-02-19",  # Presidents' Day
+    "2024-03-29",  # Good Friday
+    "2024-05-27",  # Memorial Day
+    "2024-06-19",  # Juneteenth
+    "2024-07-04",  # Independence Day
+    "2024-09-02",  # Labor Day
+    "2024-11-28",  # Thanksgiving Day
+    "2024-12-25",  # Christmas Day
+
+    # 2025
+    "2025-01-01",  # New Year's Day
+    "2025-01-20",  # Martin Luther King Jr. Day
+    "2025-02-17",  # Presidents' Day
+    "2025-04-18",  # Good Friday
+    "2025-05-26",  # Memorial Day
+    "2025-06-19",  # Juneteenth
+    "2025-07-04",  # Independence Day
+    "2025-09-01",  # Labor Day
+    "2025-11-27",  # Thanksgiving Day
+    "2025-12-25",  # Christmas Day
+
+    # 2026
+    "2026-01-01",  # New Year's Day
+    "2026-01-19",  # Martin Luther King Jr. Day
+    "2026-02-16",  # Presidents' Day
+    "2026-04-03",  # Good Friday
+    "2026-05-25",  # Memorial Day
+    "2026-06-19",  # Juneteenth
+    "2026-07-03",  # Independence Day (observed, July 4 is Saturday)
+    "2026-09-07",  # Labor Day
+    "2026-11-26",  # Thanksgiving Day
+    "2026-12-25",  # Christmas Day
+}
+
+
+def is_market_holiday():
+    """
+    Check if today is a US market holiday
+
+    Returns:
+        bool: True if today is a market holiday
+    """
+    # Get current date in ET timezone (UTC date if no tz database)
+    today = now_eastern().strftime('%Y-%m-%d')
+
+    if today in US_MARKET_HOLIDAYS:
+        holiday_name = get_holiday_name(today)
+        print(f"🏖️  Market is closed today for {holiday_name}")
+        return True
+
+    return False
+
+
+def get_holiday_name(date_str):
+    """Get holiday name from date"""
+    holiday_names = {
+        "-01-01": "New Year's Day",
+        "-01-15": "Martin Luther King Jr. Day",
+        "-01-19": "Martin Luther King Jr. Day",
+        "-01-20": "Martin Luther King Jr. Day",
+        "-02-16": "Presidents' Day",
+        "-02-17": "Presidents' Day",
+        "-02-19": "Presidents' Day",
+        "-03-29": "Good Friday",
+        "-04-03": "Good Friday",
+        "-04-18": "Good Friday",
+        "-05-25": "Memorial Day",
+        "-05-26": "Memorial Day",
+        "-05-27": "Memorial Day",
+        "-06-19": "Juneteenth",
+        "-07-03": "Independence Day",
+        "-07-04": "Independence Day",
+        "-09-01": "Labor Day",
+        "-09-02": "Labor Day",
+        "-09-07": "Labor Day",
+        "-11-26": "Thanksgiving Day",
+        "-11-27": "Thanksgiving Day",
+        "-11-28": "Thanksgiving Day",
+        "-12-25": "Christmas Day",
+    }
+
+    for suffix, name in holiday_names.items():
+        if date_str.endswith(suffix):
+            return name
+
+    return "Market Holiday"
+
+
+def now_eastern():
+    """
+    Current time in America/New_York
+
+    Returns:
+        datetime: Timezone-aware ET time, or naive UTC time without a tz database
+    """
+    if EASTERN is None:
+        return datetime.utcnow()
+    return datetime.now(EASTERN)
+
+
+def trading_date(timestamp):
+    """Session date (YYYY-MM-DD, ET) of a Unix timestamp"""
+    if EASTERN is None:
+        moment = datetime.utcfromtimestamp(timestamp)
+    else:
+        moment = datetime.fromtimestamp(timestamp, EASTERN)
+    return moment.strftime('%Y-%m-%d')
+
+
+def is_trading_day(now=None):
+    """True on weekdays that are not market holidays"""
+    now = now or now_eastern()
+    return now.weekday() < 5 and now.strftime('%Y-%m-%d') not in US_MARKET_HOLIDAYS
+
+
+def has_trading_day(start, end):
+    """True if [start, end) (dates) includes a weekday that is not a market holiday"""
+    day = start
+    while day < end:
+        if is_trading_day(day):
+            return True
+        day += timedelta(days=1)
+    return False
+
+
+def is_market_open(now=None):
+    """True during the regular session on a trading day"""
+    now = now or now_eastern()
+    return is_trading_day(now) and MARKET_OPEN <= now.time() < MARKET_CLOSE
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Change log of the published news, so clients can fetch only what is new.
+
+franchise_news.json is the full list (up to 100 articles). Clients that
+already have a copy poll data/news_changes.json instead, which holds the
+per-article differences of the last few runs that changed anything:
+
+    {"seq": 412, "since": 405, "generatedAt": "...",
+     "changes": [{"seq": 406, "at": "...", "added": [article, ...],
+                  "updated": [article, ...], "removed": ["<id>", ...]}, ...]}
+
+Every run that changes the published list gets the next sequence number.
+A client at sequence N applies the changes after N when N >= since, and
+reloads the full list otherwise (or when it has none). Runs that change
+nothing do not touch the file, so quiet days cost a 304.
+
+The log keeps the newest changes up to MAX_CHANGE_ARTICLES articles; past
+that, reloading the full list is about as cheap as the delta.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import run_metrics
+from publisher import publish_json
+
+CHANGES_PATH = Path("data/news_changes.json")
+
+MAX_CHANGE_ARTICLES = 50    # Added + updated articles kept in the log
+
+
+def load_changes(path=CHANGES_PATH):
+    """The current change log (seq 0 and no changes if there is none)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            log = json.load(f)
+        if isinstance(log, dict) and isinstance(log.get('changes'), list):
+            return log
+    except (OSError, ValueError):
+        pass
+    return {'seq': 0, 'since': 0, 'changes': []}
+
+
+def diff_articles(previous, current):
+    """
+    Per-article differences between two published lists
+
+    Args:
+        previous: dict of id -> article dict (the last published list)
+        current: Article records about to be published
+
+    Returns:
+        dict: {'added': [...], 'updated': [...], 'removed': [ids]}, or
+              None if the lists are the same (order included)
+    """
+    added, updated = [], []
+    for article in current:
+        data = article.to_dict()
+        old = previous.get(article.id)
+        if old is None:
+            added.append(data)
+        elif old != data:
+            updated.append(data)
+
+    ids = {article.id for article in current}
+    removed = [article_id for article_id in previous if article_id not in ids]
+
+    if not (added or updated or removed) and list(previous) == [a.id for a in current]:
+        return None
+    return {'added': added, 'updated': updated, 'removed': removed}
+
+
+def record_changes(change, path=CHANGES_PATH):
+    """
+    Append one run's changes to the log and publish it
+
+    Returns:
+        int: The new sequence number
+    """
+    log = load_changes(path)
+    seq = log.get('seq', 0) + 1
+    changes = log['changes'] + [dict(seq=seq, at=datetime.now(timezone.utc).isoformat(), **change)]
+
+    # Keep the newest entries up to the article budget (always the latest)
+    kept, articles = [], 0
+    for entry in reversed(changes):
+        articles += len(entry['added']) + len(entry['updated'])
+        if kept and articles > MAX_CHANGE_ARTICLES:
+            break
+        kept.append(entry)
+    kept.reverse()
+
+    result = publish_json({
+        'seq': seq,
+        'since': kept[0]['seq'] - 1,
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'changes': kept,
+    }, path, name=False)
+    run_metrics.inc('news_changes_total', len(change['added']), kind='added')
+    run_metrics.inc('news_changes_total', len(change['updated']), kind='updated')
+    run_metrics.inc('news_changes_total', len(change['removed']), kind='removed')
+
+    print(f"🆕 Change #{seq}: {len(change['added'])} added, {len(change['updated'])} updated, "
+          f"{len(change['removed'])} removed ({result['bytes']:,} bytes in {path})")
+    return seq
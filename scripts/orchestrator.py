@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+DATA JOB ORCHESTRATOR
+=============================================================================
+
+Runs the live ticker, stock history and news jobs as scheduled asyncio jobs
+inside one long-lived process, instead of one cold-started Python process
+per cron workflow. Because the job modules are imported once and stay
+resident, their HTTP sessions (connection pools), caches and the market
+calendar are shared between runs.
+
+Per job the orchestrator handles:
+    - Interval scheduling with random jitter
+    - Overlap prevention (a tick is skipped while the previous run is busy)
+    - Per-job timeouts (the run is reported and its slot stays busy until the
+      worker thread really finishes)
+    - Run conditions (the ticker only runs while the market is open)
+
+Usage:
+    python scripts/orchestrator.py                    # Run forever
+    python scripts/orchestrator.py --once             # Run each due job once
+    python scripts/orchestrator.py --jobs ticker,news # Subset of jobs
+    python scripts/orchestrator.py --once --force     # Ignore run conditions
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import market_calendar
+import run_metrics
+
+# =============================================================================
+# JOBS
+# =============================================================================
+
+def run_ticker():
+    """Fetch and publish live quotes (fetch_live_ticker_finnhub)"""
+    import fetch_live_ticker_finnhub as ticker
+
+    if not ticker.FINNHUB_API_KEY:
+        raise RuntimeError("FINNHUB_API_KEY environment variable not set")
+
+    with run_metrics.job_run('ticker'):
+        with run_metrics.stage('fetch'):
+            quotes = ticker.fetch_all_quotes()
+        if not quotes:
+            raise RuntimeError("Failed to fetch any quotes")
+
+        with run_metrics.stage('publish'):
+            ticker.save_quotes(quotes)
+
+
+def run_history():
+    """Append new daily bars to the stock history CSV (update_franchise_stocks)"""
+    import update_franchise_stocks as history
+
+    try:
+        history.main()
+    except SystemExit as e:
+        if e.code not in (0, None):
+            raise RuntimeError(f"History update exited with code {e.code}") from None
+
+
+def run_news():
+    """Aggregate franchise news feeds (fetch_franchise_news_rss)"""
+    import fetch_franchise_news_rss as news
+
+    code = news.main()
+    if code:
+        raise RuntimeError(f"News aggregation exited with code {code}")
+
+
+JOBS = {
+    'ticker': {
+        'func': run_ticker,
+        'interval': 15 * 60,       # Every 15 minutes...
+        'jitter': 60,
+        'timeout': 10 * 60,
+        'when': market_calendar.is_market_open,   # ...while the market is open
+    },
+    'history': {
+        'func': run_history,
+        'interval': 6 * 60 * 60,   # Cheap when the CSV is already up to date
+        'jitter': 5 * 60,
+        'timeout': 45 * 60,
+        'when': None,
+    },
+    'news': {
+        'func': run_news,
+        'interval': 60 * 60,       # Feed health skips feeds that are not due
+        'jitter': 5 * 60,
+        'timeout': 20 * 60,
+        'when': None,
+    },
+}
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+def log(message):
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+class ScheduledJob:
+    """Runtime state of one job: its config plus the in-flight run"""
+
+    def __init__(self, name, config, force=False):
+        self.name = name
+        self.func = config['func']
+        self.interval = config['interval']
+        self.jitter = config['jitter']
+        self.timeout = config['timeout']
+        self.when = None if force else config['when']
+        self.in_flight = None
+        self.runs = 0
+        self.failures = 0
+
+    def next_delay(self):
+        """Seconds until the next tick (interval +/- jitter)"""
+        return max(1.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def is_busy(self):
+        return self.in_flight is not None and not self.in_flight.done()
+
+    async def tick(self):
+        """
+        Run the job once if its condition holds and it is not already running
+
+        Returns:
+            bool: True if the job was started
+        """
+        if self.when is not None and not self.when():
+            log(f"⏸️  {self.name}: run condition not met, skipping")
+            return False
+
+        if self.is_busy():
+            log(f"⏭️  {self.name}: previous run still in progress, skipping")
+            return False
+
+        log(f"▶️  {self.name}: starting")
+        started = time.monotonic()
+        self.runs += 1
+        self.in_flight = asyncio.ensure_future(asyncio.to_thread(self.func))
+
+        done, _ = await asyncio.wait({self.in_flight}, timeout=self.timeout)
+        elapsed = time.monotonic() - started
+
+        if not done:
+            self.failures += 1
+            log(f"⏱️  {self.name}: timed out after {elapsed:.0f}s (left to finish in background)")
+            return True
+
+        error = self.in_flight.exception()
+        if error is not None:
+            self.failures += 1
+            log(f"❌ {self.name}: failed after {elapsed:.1f}s - {error}")
+        else:
+            log(f"✅ {self.name}: finished in {elapsed:.1f}s")
+
+        return True
+
+    async def wait_idle(self):
+        """Wait for a run that outlived its timeout to finish"""
+        if self.in_flight is not None:
+            await asyncio.wait({self.in_flight})
+
+
+async def run_forever(jobs, stop):
+    """Tick every job on its own schedule until `stop` is set"""
+
+    async def loop(job):
+        # Spread the first runs out so jobs do not all start at once
+        delay = random.uniform(0, job.jitter)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            if stop.is_set():
+                break
+            await job.tick()
+            delay = job.next_delay()
+
+    await asyncio.gather(*(loop(job) for job in jobs))
+
+
+async def run_once(jobs):
+    """Run every job once, concurrently"""
+    await asyncio.gather(*(job.tick() for job in jobs))
+
+
+async def orchestrate(job_names, once=False, force=False):
+    jobs = [ScheduledJob(name, JOBS[name], force=force) for name in job_names]
+
+    if once:
+        await run_once(jobs)
+    else:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform - Ctrl+C still interrupts
+        log(f"🕒 Scheduling jobs: {', '.join(job_names)} (Ctrl+C to stop)")
+        await run_forever(jobs, stop)
+
+    for job in jobs:
+        await job.wait_idle()
+
+    return 1 if any(job.failures for job in jobs) else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the data jobs on a schedule in one process")
+    parser.add_argument('--jobs', default=','.join(JOBS),
+                        help=f"Comma-separated jobs to run (default: {','.join(JOBS)})")
+    parser.add_argument('--once', action='store_true', help="Run each job once and exit")
+    parser.add_argument('--force', action='store_true', help="Ignore run conditions (market hours)")
+    args = parser.parse_args(argv)
+
+    args.jobs = [name.strip() for name in args.jobs.split(',') if name.strip()]
+    unknown = [name for name in args.jobs if name not in JOBS]
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(unknown)}")
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # The job scripts use paths relative to the repository root
+    os.chdir(Path(__file__).resolve().parent.parent)
+
+    print("=" * 70)
+    print("🎛️  DATA JOB ORCHESTRATOR")
+    print("=" * 70)
+
+    return asyncio.run(orchestrate(args.jobs, once=args.once, force=args.force))
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(1)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Opt-in CPU and memory profiling for the data scripts (--profile).
+
+Every entry point runs its main() through profiling.run(), which adds:
+
+    --profile            Profile the run
+    --profile-dir DIR    Where to write the profiles (default: data/profiles)
+
+With --profile the job runs under cProfile, tracemalloc and a wall-clock
+stack sampler, split by the run_metrics stages (fetch, merge, publish, ...):
+
+    <job>.prof             cProfile stats for the whole run (snakeviz, pstats)
+    <job>.<stage>.prof     cProfile stats for one stage
+    <job>.folded           Collapsed stacks rooted at the stage name, for
+                           flamegraph.pl / speedscope (includes worker threads)
+    <job>.memory.txt       Peak traced memory and top allocating lines per stage
+
+Without the flag nothing is imported or hooked: cProfile and tracemalloc
+are only loaded when profiling is actually requested.
+
+Usage:
+    python scripts/update_franchise_stocks.py --profile
+    flamegraph.pl data/profiles/history.folded > history.svg
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import run_metrics
+
+PROFILE_DIR = run_metrics.REPO_ROOT / "data" / "profiles"
+
+SAMPLE_INTERVAL = 0.005   # Seconds between stack samples
+TRACE_FRAMES = 1          # tracemalloc frames per allocation (lineno stats)
+TOP_LINES = 15            # Allocating lines reported per stage
+TOP_FUNCTIONS = 15        # Functions printed from the cProfile stats
+
+OUTSIDE_STAGE = 'other'
+
+
+def parse_args(argv=None, description=None, arguments=None):
+    parser = argparse.ArgumentParser(description=description)
+    if arguments is not None:
+        arguments(parser)
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile CPU and memory per stage")
+    parser.add_argument('--profile-dir', default=str(PROFILE_DIR),
+                        help=f"Directory for profile output (default: {PROFILE_DIR})")
+    return parser.parse_args(argv)
+
+
+def run(main, job, argv=None, description=None, arguments=None):
+    """
+    Run an entry point's main(), profiled if --profile was given
+
+    Args:
+        arguments: Optional function adding the job's own options to the
+                   parser; main() is then called with the parsed arguments
+
+    Returns:
+        Whatever main() returns
+    """
+    args = parse_args(argv, description, arguments)
+    call_args = (args,) if arguments is not None else ()
+    if not args.profile:
+        return main(*call_args)
+
+    with profiled(job, args.profile_dir):
+        return main(*call_args)
+
+
+# =============================================================================
+# STACK SAMPLER
+# =============================================================================
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of all threads and counts them as folded stacks"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.interval = interval
+        self.stage = OUTSIDE_STAGE
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stage = self.stage
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(';', ','))
+                stack.append(stage)
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+# =============================================================================
+# PROFILER
+# =============================================================================
+
+class StageProfiler:
+    """cProfile + tracemalloc per stage, switched by run_metrics.stage()"""
+
+    def __init__(self, job):
+        import cProfile
+        import tracemalloc
+
+        self._cprofile = cProfile
+        self._tracemalloc = tracemalloc
+        self.job = job
+        self.profiles = {}         # stage -> cProfile.Profile
+        self.memory = []           # (stage, peak_bytes, [top lines])
+        self.sampler = StackSampler()
+        self._stack = []
+        self._owner = threading.get_ident()
+
+    def _profile(self, stage):
+        if stage not in self.profiles:
+            self.profiles[stage] = self._cprofile.Profile()
+        return self.profiles[stage]
+
+    def start(self):
+        self._tracemalloc.start(TRACE_FRAMES)
+        self.sampler.start()
+        self._enter(OUTSIDE_STAGE)
+
+    def stop(self):
+        self._exit()
+        self.sampler.stop()
+        self._tracemalloc.stop()
+
+    def _enter(self, stage):
+        if self._stack:
+            outer = self._stack[-1]
+            self.profiles[outer['stage']].disable()
+            outer['peak'] = max(outer['peak'], self._tracemalloc.get_traced_memory()[1])
+        self._tracemalloc.reset_peak()
+        self._stack.append({'stage': stage, 'before': self._snapshot(), 'peak': 0})
+        self.sampler.stage = stage
+        self._profile(stage).enable()
+
+    def _exit(self):
+        entry = self._stack.pop()
+        stage = entry['stage']
+        self.profiles[stage].disable()
+        peak = max(entry['peak'], self._tracemalloc.get_traced_memory()[1])
+        top = self._snapshot().compare_to(entry['before'], 'lineno')[:TOP_LINES]
+        self.memory.append((stage, peak, top))
+
+        if self._stack:
+            outer = self._stack[-1]
+            outer['peak'] = max(outer['peak'], peak)
+            self.sampler.stage = outer['stage']
+            self.profiles[outer['stage']].enable()
+
+    def _snapshot(self):
+        tracemalloc = self._tracemalloc
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+
+    @contextlib.contextmanager
+    def stage(self, job, name):
+        """run_metrics stage listener"""
+        # cProfile only sees the thread that enabled it; stages entered from
+        # worker threads are still covered by the stack sampler
+        if threading.get_ident() != self._owner:
+            yield
+            return
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def write(self, directory):
+        import pstats
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        combined = None
+        for stage, profile in self.profiles.items():
+            try:
+                stats = pstats.Stats(profile)
+            except TypeError:
+                continue  # Stage recorded no calls
+            stats.dump_stats(directory / f"{self.job}.{stage}.prof")
+            if combined is None:
+                combined = stats
+            else:
+                combined.add(stats)
+
+        if combined is not None:
+            combined.dump_stats(directory / f"{self.job}.prof")
+            print(f"\n🔬 Top {TOP_FUNCTIONS} functions by cumulative time:")
+            combined.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+        (directory / f"{self.job}.folded").write_text(self.sampler.folded(), encoding='utf-8')
+        (directory / f"{self.job}.memory.txt").write_text(self.memory_report(), encoding='utf-8')
+
+        print(self.memory_report(limit=5))
+        print(f"🔬 Profiles written to {directory}/{self.job}.*")
+
+    def memory_report(self, limit=TOP_LINES):
+        lines = []
+        for stage, peak, top in self.memory:
+            label = 'whole run' if stage == OUTSIDE_STAGE else stage
+            lines.append(f"[{label}] peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+            for stat in top[:limit]:
+                if stat.size_diff <= 0:
+                    continue
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:+10.1f} KiB  {stat.count_diff:+8d} blocks  "
+                             f"{frame.filename}:{frame.lineno}")
+            lines.append('')
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profiled(job, directory=PROFILE_DIR):
+    """Profile everything run inside the block, split by run_metrics stages"""
+    profiler = StageProfiler(job)
+    run_metrics.stage_listener = profiler.stage
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        run_metrics.stage_listener = None
+        profiler.write(directory)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Shared artifact publisher for the data scripts.
+
+Every fetcher hands its finished output to this module instead of calling
+json.dump() on the live path. Publishing an artifact:
+
+  1. Serializes JSON compactly (no indentation, UTF-8, no ASCII escaping),
+     with orjson when it is installed; record objects (scripts/records.py)
+     are serialized as their dict form
+  2. Writes it atomically (temp file in the same directory + os.replace),
+     so the site never serves a half-written file
+  3. Writes precompressed .gz and .br siblings (.br only when the optional
+     `brotli` package is installed)
+  4. Writes a content-hashed copy (e.g. live_ticker.3f9a0c1b2d4e.json) and
+     records it in data/manifest.json so pages can request the immutable
+     filename and cache it forever
+
+Files are only rewritten when their content actually changed, which keeps
+the workflow commits ("git diff --staged --quiet") meaningful.
+
+Dependencies:
+    pip install brotli   (optional - enables .br siblings)
+    pip install orjson   (optional - several times faster JSON encoding)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # Optional dependency - skip .br siblings without it
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # Optional dependency - use the stdlib encoder without it
+    orjson = None
+
+import run_metrics
+
+# Repository root (scripts/ lives directly under it)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Manifest mapping logical artifact names to content-hashed filenames
+MANIFEST_PATH = REPO_ROOT / "data" / "manifest.json"
+
+# Number of hashed versions to keep per artifact (current + previous), so a
+# page that loaded the old manifest can still fetch the file it points to
+KEEP_VERSIONS = 2
+
+# Length of the content hash embedded in hashed filenames
+HASH_LENGTH = 12
+
+_manifest_lock = threading.Lock()
+
+# Records go through _encode_record like with the stdlib encoder, so both
+# produce the same keys
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _encode_record(obj):
+    """JSON form of a record (Quote, Article, Bar) for the encoders' default hook"""
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def dumps_compact(data):
+    """
+    Serialize data to compact UTF-8 JSON bytes
+
+    orjson produces the same bytes as the stdlib encoder for the values the
+    pipelines publish (it only differs in the exponent form of extreme
+    floats, and writes NaN as null). Anything orjson rejects, such as
+    NumPy scalars or integers over 64 bits, falls back to the stdlib.
+
+    Args:
+        data: JSON-serializable object (records included)
+
+    Returns:
+        bytes: Encoded JSON without insignificant whitespace
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_encode_record, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False,
+                      default=_encode_record).encode('utf-8')
+
+
+def content_hash(payload):
+    """Return the short hex digest used in hashed filenames"""
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def atomic_write(path, payload):
+    """
+    Atomically replace path with payload
+
+    The bytes are written to a temp file in the destination directory,
+    flushed to disk and renamed over the target, so readers see either the
+    old file or the new one - never a partial write.
+
+    Args:
+        path: Destination path
+        payload: Bytes to write
+
+    Returns:
+        bool: True if the file was written, False if it was already identical
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        if path.stat().st_size == len(payload) and path.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    return True
+
+
+def write_state(data, path):
+    """
+    Atomically write a pipeline state file (health stats, caches, journals)
+
+    State files are read by the scripts rather than the site, so they stay
+    indented for readable diffs and get no compressed siblings or manifest entry.
+    """
+    payload = json.dumps(data, indent=2, ensure_ascii=False, default=_encode_record)
+    return atomic_write(path, payload.encode('utf-8') + b'\n')
+
+
+def write_compressed_siblings(path, payload):
+    """
+    Write .gz (and .br when available) siblings next to path
+
+    gzip output uses mtime=0 so identical content produces identical bytes
+    and does not show up as a change in git.
+    """
+    path = Path(path)
+    atomic_write(path.with_name(path.name + '.gz'), gzip.compress(payload, compresslevel=9, mtime=0))
+
+    if brotli is not None:
+        atomic_write(path.with_name(path.name + '.br'), brotli.compress(payload, quality=11))
+
+
+def _site_relative(path):
+    """Return path relative to the repository root (posix style) if possible"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _remove_artifact(rel_path):
+    """Delete a hashed artifact and its compressed siblings"""
+    base = REPO_ROOT / rel_path
+    for candidate in (base, base.with_name(base.name + '.gz'), base.with_name(base.name + '.br')):
+        try:
+            candidate.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the artifact manifest (empty manifest if missing or unreadable)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict) and isinstance(manifest.get('artifacts'), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'artifacts': {}}
+
+
+def _update_manifest(name, path, hashed_path, digest, size, manifest_path):
+    """Record the new hashed file for `name` and prune stale versions"""
+    with _manifest_lock:
+        manifest = load_manifest(manifest_path)
+        entry = manifest['artifacts'].get(name, {})
+
+        if entry.get('hash') == digest:
+            return
+
+        history = [entry['file']] if entry.get('file') else []
+        history += [p for p in entry.get('previous', []) if p not in history]
+        history = [p for p in history if p != hashed_path]
+
+        keep = history[:KEEP_VERSIONS - 1]
+        for stale in history[KEEP_VERSIONS - 1:]:
+            _remove_artifact(stale)
+
+        manifest['artifacts'][name] = {
+            'path': _site_relative(path),
+            'file': hashed_path,
+            'hash': digest,
+            'bytes': size,
+            'previous': keep,
+            'updatedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        }
+        manifest['artifacts'] = dict(sorted(manifest['artifacts'].items()))
+
+        atomic_write(manifest_path, json.dumps(manifest, indent=2).encode('utf-8') + b'\n')
+
+
+def publish_bytes(payload, path, name=None, manifest_path=MANIFEST_PATH, compress=True):
+    """
+    Publish an already-serialized artifact
+
+    Args:
+        payload: File contents as bytes
+        path: Live output path (e.g. "data/live_ticker.json")
+        name: Logical name for the manifest (defaults to the file stem);
+              pass False to skip the hashed copy and manifest entry
+        manifest_path: Manifest to update
+        compress: Write .gz/.br siblings; pass False for large files that
+                  change every run (stale siblings are removed)
+
+    Returns:
+        dict: {'path', 'changed', 'bytes', 'hash', 'file'}
+    """
+    started = time.perf_counter()
+    result = _publish(payload, Path(path), name, manifest_path, compress)
+    run_metrics.record_write(name or Path(path).stem, result['bytes'],
+                             time.perf_counter() - started, result['changed'])
+    return result
+
+
+def _publish(payload, path, name, manifest_path, compress=True):
+    digest = content_hash(payload)
+
+    changed = atomic_write(path, payload)
+    if compress:
+        write_compressed_siblings(path, payload)
+    else:
+        for suffix in ('.gz', '.br'):
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+    result = {
+        'path': str(path),
+        'changed': changed,
+        'bytes': len(payload),
+        'hash': digest,
+        'file': None,
+    }
+
+    if name is False:
+        return result
+
+    name = name or path.stem
+    hashed = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+    atomic_write(hashed, payload)
+    if compress:
+        write_compressed_siblings(hashed, payload)
+
+    result['file'] = _site_relative(hashed)
+    _update_manifest(name, path, result['file'], digest, len(payload), manifest_path)
+
+    return result
+
+
+def publish_json(data, path, name=None, manifest_path=MANIFEST_PATH, compress=True):
+    """
+    Serialize data compactly and publish it (see publish_bytes)
+
+    Args:
+        data: JSON-serializable object
+        path: Live output path
+        name: Logical manifest name (defaults to the file stem)
+        manifest_path: Manifest to update
+        compress: Write .gz/.br siblings
+
+    Returns:
+        dict: Publish result from publish_bytes
+    """
+    return publish_bytes(dumps_compact(data), path, name=name, manifest_path=manifest_path,
+                         compress=compress)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events push channel for live quotes.
+
+The broadcaster watches the quotes published by the ticker fetcher
+(data/live_ticker.json, via the API server's FileSource). Whenever a new
+snapshot lands it diffs it against the previous one and pushes only the
+symbols that changed to every connected client:
+
+    event: snapshot   id: <epoch>:<seq>   data: {"seq", "quotes", "fetchedAt"}
+    event: quotes     id: <epoch>:<seq>   data: {"seq", "changed", "removed", "fetchedAt"}
+
+Clients get a full snapshot on connect. Reconnecting clients send the last
+id they saw (EventSource does this automatically via Last-Event-ID, or
+?since=<id>) and receive just the deltas they missed, as long as those are
+still in the replay buffer; otherwise they get a fresh snapshot.
+
+Each event is encoded once and the same bytes object is queued for every
+subscriber. Per-client memory is capped by a bounded queue; a client too
+slow to keep up has its backlog dropped and is resynchronized with a
+snapshot instead of growing without limit.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from publisher import dumps_compact
+
+POLL_INTERVAL = 1.0          # Seconds between checks for a new snapshot
+REPLAY_EVENTS = 500          # Change events kept for resuming clients
+CLIENT_QUEUE_SIZE = 32       # Pending events per client before resync
+HEARTBEAT_INTERVAL = 15      # Seconds between keep-alive comments
+MAX_SUBSCRIBERS = 10000
+RETRY_MS = 3000              # Client reconnect delay hint
+
+
+def encode_event(event, event_id, payload):
+    """Encode one SSE message"""
+    return (f"event: {event}\nid: {event_id}\ndata: ".encode('utf-8')
+            + dumps_compact(payload) + b"\n\n")
+
+
+class Subscriber:
+    """One connected client: a bounded queue of pre-encoded events"""
+
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.resync = False
+
+    def offer(self, seq, payload):
+        if self.resync:
+            return
+        try:
+            self.queue.put_nowait((seq, payload))
+        except asyncio.QueueFull:
+            # Too slow: drop the backlog, a snapshot replaces it
+            self.resync = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((None, None))
+
+
+class QuoteBroadcaster:
+    """Diffs quote snapshots and fans the changes out to SSE subscribers"""
+
+    def __init__(self, source, poll_interval=POLL_INTERVAL, replay_events=REPLAY_EVENTS,
+                 client_queue_size=CLIENT_QUEUE_SIZE, max_subscribers=MAX_SUBSCRIBERS):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.client_queue_size = client_queue_size
+        self.max_subscribers = max_subscribers
+        self.epoch = str(int(time.time()))
+        self.seq = 0
+        self.quotes = {}
+        self.fetched_at = None
+        self.events = deque(maxlen=replay_events)
+        self.subscribers = set()
+        self._snapshot_cache = None
+        self._source_version = None
+
+    # -------------------------------------------------------------------------
+    # Producer side
+    # -------------------------------------------------------------------------
+
+    def event_id(self, seq):
+        return f"{self.epoch}:{seq}"
+
+    def publish(self, quotes, fetched_at=None):
+        """
+        Diff a new snapshot against the current one and broadcast changes
+
+        Returns:
+            int: Number of changed or removed symbols
+        """
+        changed = {symbol: quote for symbol, quote in quotes.items() if self.quotes.get(symbol) != quote}
+        removed = [symbol for symbol in self.quotes if symbol not in quotes]
+
+        self.quotes = dict(quotes)
+        self.fetched_at = fetched_at
+
+        if not changed and not removed:
+            return 0
+
+        self.seq += 1
+        payload = encode_event('quotes', self.event_id(self.seq), {
+            'seq': self.seq,
+            'changed': changed,
+            'removed': removed,
+            'fetchedAt': fetched_at,
+        })
+        self.events.append((self.seq, payload))
+
+        for subscriber in self.subscribers:
+            subscriber.offer(self.seq, payload)
+
+        return len(changed) + len(removed)
+
+    async def run(self):
+        """Watch the quotes source and publish each new version"""
+        while True:
+            try:
+                data, version = await self.source.get()
+                if version != self._source_version:
+                    self._source_version = version
+                    count = self.publish(data.get('quotes', {}), data.get('fetchedAt'))
+                    if count:
+                        print(f"📣 Pushed {count} changed quotes to {len(self.subscribers)} subscribers")
+            except Exception as e:  # noqa: BLE001 - keep the channel alive
+                print(f"⚠️  Quote broadcaster error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    # -------------------------------------------------------------------------
+    # Consumer side
+    # -------------------------------------------------------------------------
+
+    def snapshot_event(self):
+        """Full snapshot at the current sequence (encoded once per sequence)"""
+        if self._snapshot_cache is None or self._snapshot_cache[0] != self.seq:
+            payload = encode_event('snapshot', self.event_id(self.seq), {
+                'seq': self.seq,
+                'quotes': self.quotes,
+                'fetchedAt': self.fetched_at,
+            })
+            self._snapshot_cache = (self.seq, payload)
+        return self._snapshot_cache[1]
+
+    def replay_since(self, last_event_id):
+        """
+        Events after last_event_id, or None if the client must resync
+
+        Returns:
+            list or None: [(seq, payload), ...]
+        """
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.partition(':')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+
+        seq = int(seq)
+        if seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self.events or self.events[0][0] > seq + 1:
+            return None  # Gap: missed events already fell out of the buffer
+        return [event for event in self.events if event[0] > seq]
+
+    async def stream(self, writer, last_event_id=None):
+        """
+        Serve one SSE client until it disconnects
+
+        The caller has already sent the response headers.
+        """
+        subscriber = Subscriber(self.client_queue_size)
+        self.subscribers.add(subscriber)
+
+        try:
+            writer.write(f"retry: {RETRY_MS}\n\n".encode('utf-8'))
+
+            replay = self.replay_since(last_event_id)
+            if replay is None:
+                writer.write(self.snapshot_event())
+            else:
+                for _, payload in replay:
+                    writer.write(payload)
+            sent_seq = self.seq
+            await writer.drain()
+
+            while True:
+                try:
+                    seq, payload = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                    await writer.drain()
+                    continue
+
+                if subscriber.resync:
+                    subscriber.resync = False
+                    writer.write(self.snapshot_event())
+                    sent_seq = self.seq
+                elif seq > sent_seq:
+                    writer.write(payload)
+                    sent_seq = seq
+
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+
+    def is_full(self):
+        return len(self.subscribers) >= self.max_subscribers
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Typed record classes for the data that flows through the pipelines.
+
+Quotes, articles and daily bars used to be passed around as ad-hoc dicts,
+which costs a hash table and a full set of key slots per record. These are
+slotted dataclasses instead: fixed attributes, no per-instance __dict__,
+about half the memory of the equivalent dict.
+
+Field names are the published JSON keys (hence `changePercent`,
+`adjClose`), in the published order, so a record serializes to exactly the
+dict the scripts used to build:
+
+    quote.to_dict()   -> {'symbol': 'MCD', 'price': 290.12, ...}
+    Quote.from_dict(d)   (previous outputs, journals, shard files)
+
+publisher.dumps_compact() and write_state() serialize records directly,
+so writers hand over records as they are. Optional fields (articles'
+enrichment fields) are left out while unset, like the keys that were only
+added when there was a value.
+"""
+
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+
+def record(cls=None, *, optional=()):
+    """
+    Make a slotted record dataclass
+
+    Args:
+        optional: Fields (defaulting to None) that are omitted from to_dict()
+                  while they are None
+    """
+    def wrap(cls):
+        cls = dataclass(slots=True)(cls)
+        cls._fields = tuple(field.name for field in fields(cls))
+        cls._values = attrgetter(*cls._fields)
+        cls._optional = tuple(optional)
+        return cls
+    return wrap if cls is None else wrap(cls)
+
+
+class Record:
+    """Shared conversions of the record classes"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from its dict form (unknown keys are ignored)"""
+        return cls(**{name: data[name] for name in cls._fields if name in data})
+
+    def to_dict(self):
+        """The record as the dict that is published, in field order"""
+        data = dict(zip(self._fields, self._values(self)))
+        for name in self._optional:
+            if data[name] is None:
+                del data[name]
+        return data
+
+    def to_row(self):
+        """Field values as a list, in field order"""
+        return list(self._values(self))
+
+
+@record
+class Quote(Record):
+    """A live quote (data/live_ticker.json "quotes" values)"""
+
+    symbol: str
+    price: float
+    change: float
+    changePercent: float
+    isPositive: bool
+    isNegative: bool
+    high: float
+    low: float
+    open: float
+    previousClose: float
+    timestamp: int
+    source: str = 'finnhub'
+
+
+@record(optional=('google_news_url', 'image_url', 'canonical_url'))
+class Article(Record):
+    """A news article (data/franchise_news.json items)"""
+
+    id: str
+    title: str
+    url: str
+    summary: str
+    source_name: str
+    source_feed_url: str
+    source_type: str
+    category: str
+    published_raw: str
+    published_iso: str
+    author: str
+    fetched_at: str
+    google_news_url: str = None     # Set when a Google News link was resolved
+    image_url: str = None           # Set by the article enricher
+    canonical_url: str = None       # Set by the article enricher
+
+
+@record
+class Bar(Record):
+    """A daily OHLCV bar (data/franchise_stocks.csv columns, without the symbol)"""
+
+    date: str
+    open: float
+    high: float
+    low: float
+    close: float
+    adjClose: float
+    volume: int
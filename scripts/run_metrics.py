@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Per-run metrics for the data scripts.
+
+Each job run (ticker, history, news, ...) collects counters, gauges and
+latency histograms while it works, then writes two files:
+
+    data/metrics/<job>.json   Run report: wall time per stage, per-provider
+                              latency percentiles, bytes, statuses, rows
+    data/metrics/<job>.prom   Same numbers in Prometheus text format (for a
+                              node_exporter textfile collector / pushgateway)
+
+The fetchers call the record_* helpers below; they are cheap no-ops in
+spirit (a dict update) and always go to the run that is current in the
+calling context. Runs are tracked with a ContextVar, so jobs running side
+by side in the orchestrator's worker threads keep separate reports.
+
+Usage in a script:
+
+    @run_metrics.instrumented('ticker')
+    def main():
+        with run_metrics.stage('fetch'):
+            ...
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Repository root (scripts/ lives directly under it)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+METRICS_DIR = REPO_ROOT / "data" / "metrics"
+METRIC_PREFIX = "franchise_"
+
+# Histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+MAX_SAMPLES = 10000   # Raw samples kept per histogram for percentiles
+
+# Optional callable(job, stage) -> context manager entered around every
+# stage; set by profiling.py in --profile mode, None otherwise
+stage_listener = None
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Bucketed histogram that also keeps raw samples for percentiles"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = []
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': round(min(self.samples), 6) if self.samples else None,
+            'p50': _round(self.percentile(50)),
+            'p95': _round(self.percentile(95)),
+            'max': round(max(self.samples), 6) if self.samples else None,
+        }
+
+
+def _round(value):
+    return round(value, 6) if value is not None else None
+
+
+class RunMetrics:
+    """Metrics collected during one job run"""
+
+    def __init__(self, job):
+        self.job = job
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.wall_seconds = None
+        self.status = 'running'
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        listener = stage_listener
+        scope = listener(self.job, name) if listener is not None else contextlib.nullcontext()
+        started = time.perf_counter()
+        try:
+            with scope:
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def finish(self, status='ok'):
+        self.wall_seconds = time.perf_counter() - self._started
+        self.status = status
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def report(self):
+        """JSON-serializable run report"""
+        def entries(store, render):
+            return [dict(name=name, labels=dict(labels), **render(value))
+                    for (name, labels), value in sorted(store.items())]
+
+        return {
+            'job': self.job,
+            'status': self.status,
+            'startedAt': self.started_at.isoformat(),
+            'wallSeconds': _round(self.wall_seconds),
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'counters': entries(self.counters, lambda v: {'value': v}),
+            'gauges': entries(self.gauges, lambda v: {'value': v}),
+            'histograms': entries(self.histograms, lambda h: h.summary()),
+        }
+
+    def prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        typed = set()
+
+        def labels_text(labels, extra=()):
+            pairs = [('job', self.job)] + list(labels) + list(extra)
+            escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = METRIC_PREFIX + name
+            declare(metric, 'counter')
+            lines.append(f"{metric}{labels_text(labels)} {value}")
+
+        for (name, labels), value in sorted(self.gauges.items()):
+            metric = METRIC_PREFIX + name
+            declare(metric, 'gauge')
+            lines.append(f"{metric}{labels_text(labels)} {value}")
+
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            metric = METRIC_PREFIX + name
+            declare(metric, 'histogram')
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f"{metric}_bucket{labels_text(labels, [('le', bound)])} {count}")
+            lines.append(f"{metric}_bucket{labels_text(labels, [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{metric}_sum{labels_text(labels)} {round(histogram.sum, 6)}")
+            lines.append(f"{metric}_count{labels_text(labels)} {histogram.count}")
+
+        stage_metric = METRIC_PREFIX + 'stage_duration_seconds'
+        declare(stage_metric, 'gauge')
+        for name, seconds in self.stages.items():
+            lines.append(f"{stage_metric}{labels_text([('stage', name)])} {round(seconds, 6)}")
+
+        for name, value in (('run_duration_seconds', _round(self.wall_seconds) or 0),
+                            ('run_success', 1 if self.status == 'ok' else 0),
+                            ('run_timestamp_seconds', int(self.started_at.timestamp()))):
+            metric = METRIC_PREFIX + name
+            declare(metric, 'gauge')
+            lines.append(f"{metric}{labels_text([])} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory=METRICS_DIR):
+        """Write <job>.json and <job>.prom (atomically)"""
+        from publisher import atomic_write  # publisher imports this module
+
+        directory = Path(directory)
+        atomic_write(directory / f"{self.job}.json",
+                     json.dumps(self.report(), indent=2).encode('utf-8') + b'\n')
+        atomic_write(directory / f"{self.job}.prom", self.prometheus().encode('utf-8'))
+        return directory / f"{self.job}.json"
+
+
+# =============================================================================
+# CURRENT RUN
+# =============================================================================
+
+# Fallback run for code called outside an instrumented job (e.g. ad hoc use)
+_default_run = RunMetrics('default')
+_current_run = contextvars.ContextVar('current_run', default=None)
+
+
+def current():
+    """The run metrics of the calling context"""
+    return _current_run.get() or _default_run
+
+
+@contextlib.contextmanager
+def job_run(job, directory=METRICS_DIR):
+    """
+    Collect metrics for one job run and write the report when it ends
+
+    The report is written even if the job fails or calls sys.exit().
+    """
+    run = RunMetrics(job)
+    token = _current_run.set(run)
+    status = 'error'
+    try:
+        yield run
+        status = 'ok'
+    except SystemExit as e:
+        status = 'ok' if e.code in (0, None) else 'error'
+        raise
+    finally:
+        _current_run.reset(token)
+        run.finish(status)
+        try:
+            path = run.write(directory)
+            print(f"📏 Run metrics written to {path}")
+        except OSError as e:
+            print(f"⚠️  Could not write run metrics: {e}")
+
+
+def instrumented(job):
+    """Decorator: run the function inside job_run(job)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with job_run(job):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# =============================================================================
+# RECORDING HELPERS
+# =============================================================================
+
+def stage(name):
+    """Time a stage of the current run: `with run_metrics.stage('fetch'):`"""
+    return current().stage(name)
+
+
+def inc(name, value=1, **labels):
+    current().inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    current().observe(name, value, **labels)
+
+
+def record_request(provider, seconds, response=None, error=None, status=None):
+    """
+    Record one request to a data provider
+
+    Args:
+        provider: Provider label (e.g. "finnhub", a feed host)
+        seconds: Request latency
+        response: requests.Response (status, bytes, rate-limit headers)
+        error: Exception if the request failed before a response arrived
+        status: Explicit status label, for clients without a response
+            object (e.g. yfinance)
+    """
+    run = current()
+    if status is None:
+        if response is not None:
+            status = str(response.status_code)
+        else:
+            status = type(error).__name__ if error is not None else 'error'
+
+    if response is not None:
+        run.inc('response_bytes_total', len(response.content or b''), provider=provider)
+
+        remaining = response.headers.get('X-Ratelimit-Remaining')
+        if remaining is not None:
+            try:
+                run.set('rate_limit_remaining', int(remaining), provider=provider)
+            except ValueError:
+                pass
+        if response.status_code == 429:
+            run.inc('rate_limited_total', provider=provider)
+
+    run.inc('requests_total', provider=provider, status=status)
+    run.observe('request_latency_seconds', seconds, provider=provider)
+
+
+def record_rows(artifact, rows):
+    """Record rows/records written to an output artifact"""
+    current().inc('rows_written_total', rows, artifact=artifact)
+
+
+def record_write(artifact, size, seconds, changed):
+    """Record one artifact publish (called by publisher)"""
+    run = current()
+    run.set('artifact_bytes', size, artifact=artifact)
+    run.inc('artifact_writes_total', artifact=artifact, changed=str(changed).lower())
+    run.observe('write_seconds', seconds, artifact=artifact)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Split a fetch job's symbol universe across workers (--shard i/N).
+
+Each symbol belongs to shard crc32(symbol) % N, so the assignment is stable
+across runs, machines and Python versions (unlike hash()), and a symbol
+keeps its shard when others are added or removed. Shards are numbered from
+0, which matches a workflow matrix like `shard: [0, 1, 2, 3]`.
+
+A sharded run does not publish anything: it writes its partial output to
+
+    data/shards/<artifact>.<i>-of-<N>.<ext>
+
+and a reducer run (--merge-shards) collects the partial files of the
+latest complete set, merges them in shard order and publishes the result
+like an unsharded run would, then removes the partial files.
+"""
+
+import re
+import zlib
+from pathlib import Path
+
+SHARD_DIR = Path("data/shards")
+
+_SHARD_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+
+
+def parse_shard(text):
+    """
+    Parse "i/N" into (index, count)
+
+    Raises:
+        ValueError: If the text is not a valid shard (0 <= i < N)
+    """
+    match = _SHARD_RE.match(text or '')
+    if not match:
+        raise ValueError(f"invalid shard {text!r} (expected i/N, e.g. 0/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"invalid shard {text!r} (need 0 <= i < N)")
+    return index, count
+
+
+def shard_of(symbol, count):
+    """Shard index of a symbol among `count` shards"""
+    return zlib.crc32(symbol.upper().encode('utf-8')) % count
+
+
+def select(symbols, shard):
+    """
+    Symbols that belong to a shard, in their original order
+
+    Args:
+        symbols: Symbol list
+        shard: (index, count), or None for all symbols
+    """
+    if shard is None:
+        return list(symbols)
+    index, count = shard
+    return [symbol for symbol in symbols if shard_of(symbol, count) == index]
+
+
+def shard_path(artifact, shard, suffix, shard_dir=SHARD_DIR):
+    """Partial output path for one shard, e.g. data/shards/live_ticker.0-of-4.json"""
+    index, count = shard
+    return Path(shard_dir) / f"{artifact}.{index}-of-{count}{suffix}"
+
+
+def collect(artifact, suffix, shard_dir=SHARD_DIR):
+    """
+    Find the partial outputs of a sharded run
+
+    Returns:
+        tuple: (paths in shard order, missing shard indexes). If partial
+               files from runs with different N are present, the largest
+               N is used.
+    """
+    pattern = re.compile(rf'^{re.escape(artifact)}\.(\d+)-of-(\d+){re.escape(suffix)}$')
+    found = {}
+    for path in Path(shard_dir).glob(f"{artifact}.*-of-*{suffix}"):
+        match = pattern.match(path.name)
+        if match:
+            found.setdefault(int(match.group(2)), {})[int(match.group(1))] = path
+
+    if not found:
+        return [], []
+
+    count = max(found)
+    paths = found[count]
+    missing = [index for index in range(count) if index not in paths]
+    return [paths[index] for index in sorted(paths)], missing
+
+
+def remove(paths):
+    """Delete merged partial outputs"""
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Group news articles from different outlets into stories ("top stories").
+
+The aggregator publishes a flat, date-sorted list, so the same franchise
+event reported by five outlets shows up as five unrelated items. This stage
+groups them:
+
+1. Every article becomes a sparse TF-IDF vector (a dict) over its title
+   (weighted double) and summary, L2-normalized.
+2. Candidate pairs come from blocking instead of comparing all pairs: each
+   article is indexed under its BLOCK_TERMS highest-weighted terms, and
+   only articles sharing a block - published within WINDOW_HOURS of each
+   other - are compared. Terms found in more than BLOCK_LIMIT articles are
+   not specific enough to block on and are skipped, which keeps the work
+   near-linear in the number of articles.
+3. Pairs with cosine similarity >= THRESHOLD are joined (union-find).
+4. Clusters are ranked by the number of distinct outlets, then by the
+   newest article, and published as data/top_stories.json:
+
+    {"generatedAt": ..., "count": 25,
+     "stories": [{"id", "title", "url", "sources": 4, "articleCount": 5,
+                  "firstPublished", "lastPublished",
+                  "articles": [{"id", "title", "url", "source", "published_iso"}]}]}
+"""
+
+import hashlib
+import html
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from publisher import publish_json
+
+OUTPUT_PATH = Path("data/top_stories.json")
+
+THRESHOLD = 0.35        # Cosine similarity that makes two articles one story
+TITLE_WEIGHT = 2        # Title terms count this many times
+BLOCK_TERMS = 6         # Top terms per article used for candidate blocking
+BLOCK_LIMIT = 50        # Skip blocks on terms shared by more articles than this
+WINDOW_HOURS = 72       # Only articles this close in time can be one story
+MAX_STORIES = 25
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9&'-]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do
+does for from had has have he her his how if in into is it its just more most
+new news no not now of on one or our out over said says she so than that the
+their them then there these they this to up was we were what when which who
+will with would you your amp nbsp href target blank font color www com https
+http html rss articles oc
+""".split())
+
+
+# =============================================================================
+# VECTORS
+# =============================================================================
+
+def _stem(token):
+    """Crude plural/possessive folding ("franchises" / "franchisee's" -> singular)"""
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    text = html.unescape(_TAG_RE.sub(' ', text or '')).lower().replace('’', "'")
+    return [_stem(token) for token in _TOKEN_RE.findall(text)
+            if token not in STOPWORDS and not token.isdigit()]
+
+
+def article_source(article):
+    """Outlet of an article (Google News items name it after the last " - ")"""
+    if article.source_type == 'google_news':
+        head, sep, outlet = (article.title or '').rpartition(' - ')
+        if sep and outlet:
+            return outlet.strip()
+    return article.source_name or ''
+
+
+def _title(article):
+    """Title without the outlet suffix Google News appends"""
+    title = article.title or ''
+    if article.source_type == 'google_news':
+        head, sep, _ = title.rpartition(' - ')
+        if sep and head:
+            return head
+    return title
+
+
+def tfidf_vectors(articles):
+    """
+    L2-normalized TF-IDF vectors
+
+    Returns:
+        list: One {term: weight} dict per article
+    """
+    counts = []
+    document_frequency = Counter()
+    for article in articles:
+        terms = Counter(tokenize(_title(article)) * TITLE_WEIGHT)
+        terms.update(tokenize(article.summary))
+        counts.append(terms)
+        document_frequency.update(terms.keys())
+
+    total = len(articles)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    vectors = []
+    for terms in counts:
+        vector = {term: (1 + math.log(tf)) * idf[term] for term, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vector.items()})
+    return vectors, document_frequency
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(term, 0.0) for term, w in a.items())
+
+
+# =============================================================================
+# CLUSTERING
+# =============================================================================
+
+def _timestamp(article):
+    try:
+        return datetime.fromisoformat(article.published_iso or '').timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_articles(articles, threshold=THRESHOLD):
+    """
+    Group articles that report the same story
+
+    Returns:
+        list: Clusters (lists of article indexes), unordered
+    """
+    vectors, document_frequency = tfidf_vectors(articles)
+    times = [_timestamp(article) for article in articles]
+    window = WINDOW_HOURS * 3600
+
+    # Blocking: article indexes per specific term, in time order
+    blocks = defaultdict(list)
+    for index, vector in enumerate(vectors):
+        top = sorted(vector.items(), key=lambda item: -item[1])
+        kept = 0
+        for term, _ in top:
+            if document_frequency[term] > BLOCK_LIMIT or document_frequency[term] < 2:
+                continue
+            blocks[term].append(index)
+            kept += 1
+            if kept == BLOCK_TERMS:
+                break
+
+    parent = list(range(len(articles)))
+    compared = set()
+    for members in blocks.values():
+        members.sort(key=times.__getitem__)
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                if times[j] - times[i] > window:
+                    break
+                pair = (i, j) if i < j else (j, i)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                if cosine(vectors[i], vectors[j]) >= threshold:
+                    root_i, root_j = _find(parent, i), _find(parent, j)
+                    if root_i != root_j:
+                        parent[root_j] = root_i
+
+    clusters = defaultdict(list)
+    for index in range(len(articles)):
+        clusters[_find(parent, index)].append(index)
+    return list(clusters.values())
+
+
+def build_top_stories(articles, max_stories=MAX_STORIES):
+    """
+    Cluster articles and rank the stories by outlets, then recency
+
+    Returns:
+        dict: The top_stories artifact
+    """
+    stories = []
+    for members in cluster_articles(articles):
+        members.sort(key=lambda i: articles[i].published_iso or '', reverse=True)
+        group = [articles[i] for i in members]
+        sources = {article_source(article) for article in group}
+        # The earliest report names the story
+        lead = group[-1]
+        stories.append({
+            'id': hashlib.sha256(''.join(sorted(a.id for a in group)).encode('utf-8')).hexdigest()[:16],
+            'title': _title(lead),
+            'url': lead.url,
+            'sources': len(sources),
+            'articleCount': len(group),
+            'firstPublished': lead.published_iso,
+            'lastPublished': group[0].published_iso,
+            'articles': [{
+                'id': article.id,
+                'title': _title(article),
+                'url': article.url,
+                'source': article_source(article),
+                'published_iso': article.published_iso,
+            } for article in group],
+        })
+
+    stories.sort(key=lambda story: (story['sources'], story['lastPublished'] or '', story['id']), reverse=True)
+    stories = stories[:max_stories]
+    return {
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'count': len(stories),
+        'stories': stories,
+    }
+
+
+def save_top_stories(top_stories, output_path=OUTPUT_PATH):
+    """
+    Publish the top_stories artifact (compact, atomic, precompressed)
+
+    Nothing is written when the stories are the same as the published ones,
+    so an unchanged run does not change generatedAt.
+    """
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    if previous.get('stories') == top_stories['stories']:
+        print(f"📰 Top stories unchanged ({top_stories['count']})")
+        return previous
+
+    result = publish_json(top_stories, output_path)
+    multi = sum(1 for story in top_stories['stories'] if story['sources'] > 1)
+    print(f"📰 Saved {top_stories['count']} top stories ({multi} covered by several outlets) "
+          f"to {output_path} ({result['bytes']:,} bytes)")
+    return top_stories
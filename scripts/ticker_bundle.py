@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Precomputed ticker bundle: live quotes joined with history-derived fields.
+
+The ticker used to download the whole stock history CSV and the live quote
+snapshot and combine them in the browser. Both halves are now joined here,
+once per refresh, into one small file:
+
+    data/ticker_history.json   Per-symbol summary of the history CSV (state)
+    data/ticker_bundle.json    What ticker.js loads (published)
+
+The history summary is rebuilt by update_franchise_stocks.py after each CSV
+update, and holds for every symbol its last close, the close before it, the
+52-week high/low, the close the YTD return is measured from and the last 30
+closes. The bundle is rebuilt from the summary and the latest quote snapshot
+by both the live ticker fetch and the history update:
+
+    {"fetchedAt": ..., "historyDate": ..., "count": 34,
+     "quotes": {"MCD": {"symbol", "price", "change", "changePercent",
+                        "isPositive", "isNegative", "previousClose",
+                        "lastClose", "lastCloseDate", "high52", "low52",
+                        "ytdReturn", "spark": [30 closes], "timestamp", "source"}}}
+
+Live quotes newer than the history extend it: the day's high/low widens the
+52-week range and the live price becomes the last sparkline point. Symbols
+without a live quote fall back to their last close (source "history").
+
+Usage:
+    python scripts/ticker_bundle.py           # Rebuild summary and bundle from the CSV
+"""
+
+import csv
+import json
+import sys
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from market_calendar import trading_date
+from publisher import publish_json, write_state
+from records import Quote
+
+CSV_FILE = Path("data/franchise_stocks.csv")
+LIVE_TICKER_FILE = Path("data/live_ticker.json")
+SUMMARY_PATH = Path("data/ticker_history.json")
+BUNDLE_FILE = Path("data/ticker_bundle.json")
+
+SPARK_POINTS = 30
+WINDOW_DAYS = 365       # 52-week range
+WINDOW_ROWS = 260       # Trading days kept per symbol to cover WINDOW_DAYS
+
+
+# =============================================================================
+# HISTORY SUMMARY
+# =============================================================================
+
+def read_history_rows(path=CSV_FILE):
+    """
+    Stream (date, symbol, high, low, close) rows from the history CSV
+
+    The adjusted close is used as the close, like the charts do. Rows with
+    missing prices are skipped.
+    """
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                close = float(row.get('adjClose') or row['close'])
+                high = float(row['high'])
+                low = float(row['low'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            yield row['date'], row['symbol'], high, low, close
+
+
+def summarize_history(rows):
+    """
+    Reduce daily rows to the per-symbol fields the ticker needs
+
+    Args:
+        rows: Iterable of (date, symbol, high, low, close), in date order
+              for each symbol (the history CSV is sorted by date)
+
+    Returns:
+        dict: symbol -> summary (see module docstring)
+    """
+    states = {}
+    for date, symbol, high, low, close in rows:
+        if close != close:  # NaN from pandas
+            continue
+        state = states.get(symbol)
+        if state is None:
+            state = states[symbol] = {
+                'year': date[:4],
+                'ytdBase': None,
+                'previous': None,
+                'last': None,
+                'window': deque(maxlen=WINDOW_ROWS),
+            }
+        elif date[:4] != state['year']:
+            # First row of a new year: YTD is measured from last year's final close
+            state['year'] = date[:4]
+            state['ytdBase'] = state['last'][1]
+
+        state['previous'] = state['last']
+        state['last'] = (date, close)
+        state['window'].append((date, high if high == high else close, low if low == low else close, close))
+
+    summary = {}
+    for symbol, state in sorted(states.items()):
+        last_date, last_close = state['last']
+        cutoff = (datetime.strptime(last_date, '%Y-%m-%d') - timedelta(days=WINDOW_DAYS)).strftime('%Y-%m-%d')
+        window = [entry for entry in state['window'] if entry[0] > cutoff]
+        summary[symbol] = {
+            'date': last_date,
+            'close': round(last_close, 4),
+            'previousClose': round(state['previous'][1], 4) if state['previous'] else None,
+            'high52': round(max(entry[1] for entry in window), 4),
+            'low52': round(min(entry[2] for entry in window), 4),
+            'year': state['year'],
+            'ytdBase': round(state['ytdBase'], 4) if state['ytdBase'] else None,
+            'spark': [round(entry[3], 2) for entry in list(state['window'])[-SPARK_POINTS:]],
+        }
+    return summary
+
+
+def save_summary(summary, path=SUMMARY_PATH):
+    """Write the summary state file and return it as load_summary() would"""
+    dates = [entry['date'] for entry in summary.values()]
+    document = {
+        'historyDate': max(dates) if dates else None,
+        'symbols': summary,
+    }
+    write_state(document, path)
+    return document
+
+
+def load_summary(path=SUMMARY_PATH):
+    """Load the history summary ({} if it has not been built yet)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# =============================================================================
+# BUNDLE
+# =============================================================================
+
+def _pct(value, base):
+    if not base:
+        return None
+    return round((value / base - 1) * 100, 2)
+
+
+def bundle_entry(symbol, history, quote=None):
+    """
+    Join one symbol's history summary with its live quote
+
+    Either side may be missing (None), but not both.
+    """
+    if quote is None:
+        price = history['close']
+        previous = history.get('previousClose')
+        change = round(price - previous, 2) if previous else None
+        change_pct = _pct(price, previous)
+        entry = {
+            'symbol': symbol,
+            'price': round(price, 2),
+            'change': change,
+            'changePercent': change_pct,
+            'previousClose': previous,
+            'timestamp': None,
+            'source': 'history',
+        }
+    else:
+        price = float(quote.price)
+        change_pct = quote.changePercent
+        entry = {
+            'symbol': symbol,
+            'price': price,
+            'change': quote.change,
+            'changePercent': change_pct,
+            'previousClose': quote.previousClose,
+            'timestamp': quote.timestamp,
+            'source': quote.source,
+        }
+    entry['isPositive'] = bool(change_pct and change_pct > 0)
+    entry['isNegative'] = bool(change_pct and change_pct < 0)
+
+    if history is None:
+        entry.update(lastClose=None, lastCloseDate=None, high52=None, low52=None,
+                     ytdReturn=None, spark=[])
+        return entry
+
+    high52, low52 = history['high52'], history['low52']
+    ytd_base = history.get('ytdBase')
+    spark = list(history['spark'])
+
+    quote_date = trading_date(quote.timestamp) if quote and quote.timestamp else None
+    if quote_date and quote_date > history['date']:
+        # A session the history does not have yet
+        high52 = max(high52, float(quote.high or price))
+        low52 = min(low52, float(quote.low or price))
+        if quote_date[:4] != history['year']:
+            ytd_base = history['close']
+        spark = (spark + [round(price, 2)])[-SPARK_POINTS:]
+
+    entry.update(
+        lastClose=round(history['close'], 2),
+        lastCloseDate=history['date'],
+        high52=round(high52, 2),
+        low52=round(low52, 2),
+        ytdReturn=_pct(price, ytd_base),
+        spark=spark,
+    )
+    return entry
+
+
+def build_bundle(quotes, summary, fetched_at=None):
+    """
+    Join a quote snapshot with the history summary
+
+    Args:
+        quotes: dict of symbol -> Quote
+        summary: load_summary() output
+        fetched_at: Snapshot timestamp (ISO string)
+
+    Returns:
+        dict: The bundle
+    """
+    history = summary.get('symbols', {})
+    bundle = {}
+    for symbol in sorted(set(quotes) | set(history)):
+        bundle[symbol] = bundle_entry(symbol, history.get(symbol), quotes.get(symbol))
+
+    return {
+        'fetchedAt': fetched_at,
+        'historyDate': summary.get('historyDate'),
+        'count': len(bundle),
+        'quotes': bundle,
+    }
+
+
+def publish_bundle(quotes=None, fetched_at=None, summary=None, path=BUNDLE_FILE):
+    """
+    Rebuild and publish the ticker bundle
+
+    Args:
+        quotes: Quote snapshot (default: the published live_ticker.json)
+        fetched_at: Snapshot timestamp (default: the one in live_ticker.json)
+        summary: History summary (default: data/ticker_history.json)
+
+    Returns:
+        dict: publish_json() result, or None if there was nothing to publish
+    """
+    if quotes is None:
+        try:
+            with open(LIVE_TICKER_FILE, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = {}
+        quotes = {symbol: Quote.from_dict(quote) for symbol, quote in snapshot.get('quotes', {}).items()}
+        fetched_at = fetched_at or snapshot.get('fetchedAt')
+
+    summary = load_summary() if summary is None else summary
+    bundle = build_bundle(quotes, summary, fetched_at)
+    if not bundle['quotes']:
+        return None
+
+    result = publish_json(bundle, path)
+    print(f"🎟️  Ticker bundle: {bundle['count']} symbols ({result['bytes']:,} bytes)")
+    return result
+
+
+def rebuild_summary(rows):
+    """Summarize history rows, save the summary and republish the bundle"""
+    summary = summarize_history(rows)
+    document = save_summary(summary)
+    print(f"📇 Ticker history summary: {len(summary)} symbols")
+    publish_bundle(summary=document)
+    return document
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        print("Usage: python scripts/ticker_bundle.py")
+        return 2
+    if not CSV_FILE.exists():
+        print(f"No history CSV at {CSV_FILE}")
+        return 1
+    rebuild_summary(read_history_rows())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
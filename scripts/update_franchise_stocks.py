@@ -5,11 +5,26 @@ Fetches latest stock data for franchise companies and market indices.
 Updates the CSV file with new data while preserving historical records.
 """
 
-import yfinance as yf
-import pandas as pd
 from datetime import datetime, timedelta
+import argparse
 import os
 import sys
+import time
+
+import history_cache
+import profiling
+import run_metrics
+import sharding
+import ticker_bundle
+import validation
+from fetch_journal import FetchJournal
+from lazy_import import lazy_import
+from publisher import atomic_write, publish_bytes
+
+# Heavy dependencies load on first use, so the "already up to date" exit
+# finishes without importing them
+yf = lazy_import('yfinance')
+pd = lazy_import('pandas')
 
 # Franchise stock symbols (pure franchisors and system participants)
 FRANCHISE_STOCKS = [
@@ -33,67 +48,240 @@ FRANCHISE_STOCKS = [
 CSV_FILE = "data/franchise_stocks.csv"
 
 
-def fetch_stock_data(symbol, start_date, end_date):
-    """Fetch historical stock data for a symbol."""
+def latest_csv_date(path, tail_bytes=4096):
+    """
+    Date of the last row of the history CSV, read from the end of the file
+
+    The CSV is written sorted by date, so this is the latest date without
+    parsing the whole file. Returns None if it cannot be determined.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - tail_bytes))
+            lines = f.read().splitlines()
+        return datetime.strptime(lines[-1].split(b',', 1)[0].decode('ascii'), '%Y-%m-%d')
+    except (OSError, IndexError, ValueError, UnicodeDecodeError):
+        return None
+
+
+def download_stock_data(symbol, start_date, end_date):
+    """
+    Download daily bars for a symbol from yfinance
+
+    Returns:
+        DataFrame: Rows in CSV format (empty if the range has no bars)
+
+    Raises:
+        Exception: Whatever yfinance raises for a failed download
+    """
+    # yfinance logs most failures (network, missing timezone, bad data) and
+    # returns an empty frame, which the history cache would take for a range
+    # without trading; make it raise instead
+    yf.config.debug.hide_exceptions = False
+
+    started = time.perf_counter()
     try:
         ticker = yf.Ticker(symbol)
         df = ticker.history(start=start_date, end=end_date)
+    except yf.exceptions.YFPricesMissingError:
+        # Not an error: no bars in the range (weekend, holiday, not yet listed)
+        df = pd.DataFrame()
+    except Exception as e:
+        run_metrics.record_request('yfinance', time.perf_counter() - started, error=e)
+        raise
+
+    run_metrics.record_request('yfinance', time.perf_counter() - started,
+                               status='empty' if df.empty else 'ok')
+    if df.empty:
+        return pd.DataFrame(columns=['date', 'symbol', 'open', 'high', 'low', 'close', 'adjClose', 'volume'])
+    run_metrics.inc('rows_fetched_total', len(df), provider='yfinance')
+
+    # Reset index to make Date a column
+    df = df.reset_index()
+
+    # Rename columns to match our CSV format
+    df = df.rename(columns={
+        'Date': 'date',
+        'Open': 'open',
+        'High': 'high',
+        'Low': 'low',
+        'Close': 'close',
+        'Volume': 'volume'
+    })
+
+    # Add adjusted close (yfinance already adjusts Close for splits/dividends)
+    df['adjClose'] = df['close']
+
+    # Add symbol column
+    df['symbol'] = symbol
+
+    # Select only the columns we need
+    df = df[['date', 'symbol', 'open', 'high', 'low', 'close', 'adjClose', 'volume']]
+
+    # Convert date to string format
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    return df
+
+
+def fetch_stock_data(symbol, start_date, end_date, use_cache=True):
+    """
+    Fetch historical stock data for a symbol.
+
+    Ranges already downloaded by an earlier run come from the history cache
+    (scripts/history_cache.py); only the rest is downloaded. Open-ended
+    ranges (no start or end) always go to the network.
+    """
+    try:
+        if use_cache and start_date is not None and end_date is not None:
+            df = history_cache.fetch(symbol, start_date, end_date, download_stock_data)
+        else:
+            df = download_stock_data(symbol, start_date, end_date)
+    except Exception as e:
+        print(f"✗ Error fetching data for {symbol}: {e}")
+        return None
+
+    if df.empty:
+        print(f"Warning: No data returned for {symbol}")
+        return None
 
-        if df.empty:
-            print(f"Warning: No data returned for {symbol}")
-            return None
+    print(f"✓ Fetched {len(df)} records for {symbol}")
+    return df
 
-        # Reset index to make Date a column
-        df = df.reset_index()
 
-        # Rename columns to match our CSV format
-        df = df.rename(columns={
-            'Date': 'date',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Volume': 'volume'
-        })
+def merge_history(existing_df, new_df):
+    """
+    Merge newly fetched rows into the existing history
 
-        # Add adjusted close (yfinance already adjusts Close for splits/dividends)
-        df['adjClose'] = df['close']
+    Rows for the same (date, symbol) are replaced by the new data, and the
+    result is sorted by date and symbol.
+    """
+    if existing_df is None:
+        return new_df.sort_values(['date', 'symbol'])
 
-        # Add symbol column
-        df['symbol'] = symbol
+    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
 
-        # Select only the columns we need
-        df = df[['date', 'symbol', 'open', 'high', 'low', 'close', 'adjClose', 'volume']]
+    # Remove duplicates (keep latest)
+    combined_df = combined_df.drop_duplicates(subset=['date', 'symbol'], keep='last')
 
-        # Convert date to string format
-        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    # Sort by date and symbol
+    return combined_df.sort_values(['date', 'symbol'])
 
-        print(f"✓ Fetched {len(df)} records for {symbol}")
-        return df
 
-    except Exception as e:
-        print(f"✗ Error fetching data for {symbol}: {e}")
+def publish_history(combined_df):
+    """Publish the merged history and refresh the ticker's history fields"""
+    # Save to CSV (atomic only: the CSV is several MB and changes every run,
+    # so hashed copies and .gz/.br siblings would add that much to every
+    # commit; GitHub Pages compresses it on the fly)
+    with run_metrics.stage('publish'):
+        publish_bytes(combined_df.to_csv(index=False).encode('utf-8'), CSV_FILE, name=False, compress=False)
+    run_metrics.record_rows('franchise_stocks', len(combined_df))
+
+    # Refresh the ticker's history fields (last close, 52-week range, YTD,
+    # sparkline) so the page never has to download the CSV
+    with run_metrics.stage('summarize'):
+        rows = combined_df[['date', 'symbol', 'high', 'low', 'adjClose']].itertuples(index=False, name=None)
+        ticker_bundle.rebuild_summary(rows)
+
+    print(f"\n✓ Successfully updated {CSV_FILE}")
+    print(f"Total records: {len(combined_df)}")
+    print(f"Date range: {combined_df['date'].min()} to {combined_df['date'].max()}")
+    print(f"Stocks: {combined_df['symbol'].nunique()}")
+    print("=" * 70)
+
+
+def load_existing():
+    """Load the history CSV, or None if there is none yet"""
+    if not os.path.exists(CSV_FILE):
         return None
+    with run_metrics.stage('load'):
+        return pd.read_csv(CSV_FILE)
+
+
+# =============================================================================
+# SHARDED RUNS
+# =============================================================================
 
+def merge_shards():
+    """
+    Merge the shards' new rows into the history and publish it
+
+    Shards are concatenated in index order and merged with merge_history(),
+    which sorts by date and symbol, so the CSV is the same whichever worker
+    finished first.
+
+    Nothing is published unless every shard's output is there: the next run
+    starts after the CSV's last dates, so a missing shard's symbols would
+    keep a gap. The shard files are left for a retry.
+
+    Returns:
+        int: Process exit status
+    """
+    paths, missing = sharding.collect('franchise_stocks', '.csv')
+    if not paths:
+        print("✗ No shard outputs to merge")
+        return 1
+    if missing:
+        print(f"✗ Missing shard(s) {', '.join(map(str, missing))} - not publishing a partial history")
+        return 1
+
+    existing_df = load_existing()
+    with run_metrics.stage('merge'):
+        new_df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+        combined_df = merge_history(existing_df, new_df)
+
+    print(f"Merged {len(new_df)} new rows from {len(paths)} shard(s)")
+    publish_history(combined_df)
+    sharding.remove(paths)
+    return 0
+
+
+def add_arguments(parser):
+    parser.add_argument('--shard', type=sharding.parse_shard, metavar='i/N',
+                        help="Fetch only shard i of N (0-based) and write its new rows to data/shards/")
+    parser.add_argument('--merge-shards', action='store_true',
+                        help="Merge the shards' new rows into the CSV and publish it")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Download every range again instead of using data/cache/history")
+
+
+@run_metrics.instrumented('history')
+def main(args=None):
+    args = args or argparse.Namespace(shard=None, merge_shards=False, no_cache=False)
 
-def main():
     print("=" * 70)
     print("Updating Franchise Stock Data")
     print("=" * 70)
 
+    if args.merge_shards:
+        return merge_shards()
+
     # Determine date range
     # If CSV exists, fetch data from last date + 1 day
     # Otherwise, fetch last 10 years of data
 
     if os.path.exists(CSV_FILE):
         print(f"\nExisting CSV found: {CSV_FILE}")
-        existing_df = pd.read_csv(CSV_FILE)
+
+        # Fast path: decide from the last line whether there is anything to
+        # fetch before loading pandas and the full CSV
+        last_row_date = latest_csv_date(CSV_FILE)
+        if last_row_date is not None and (last_row_date + timedelta(days=1)).date() >= datetime.now().date():
+            print("\n✓ CSV is already up to date!")
+            sys.exit(0)
+
+        existing_df = load_existing()
 
         # Get the latest date in the CSV
         latest_date = pd.to_datetime(existing_df['date']).max()
         start_date = latest_date + timedelta(days=1)
         end_date = datetime.now()
 
+        # Each symbol resumes after its own last row, so days that were
+        # quarantined (or failed) for one symbol are fetched again
+        last_dates = pd.to_datetime(existing_df.groupby('symbol')['date'].max())
+        symbol_starts = {symbol: day + timedelta(days=1) for symbol, day in last_dates.items()}
+
         print(f"Fetching new data from {start_date.date()} to {end_date.date()}")
 
         # Check if we need to update
@@ -103,6 +291,7 @@ def main():
     else:
         print(f"\nNo existing CSV found. Creating new file: {CSV_FILE}")
         existing_df = None
+        symbol_starts = {}
 
         # Fetch last 10 years of data
         end_date = datetime.now()
@@ -110,50 +299,63 @@ def main():
 
         print(f"Fetching 10 years of historical data from {start_date.date()} to {end_date.date()}")
 
-    # Fetch data for all symbols
+    # Fetch data for all symbols (or this worker's share of them). Each
+    # symbol's rows are checkpointed, so a backfill that dies halfway
+    # resumes with the symbols it has not fetched yet.
+    symbols = sharding.select(list(dict.fromkeys(FRANCHISE_STOCKS)), args.shard)  # TNL is listed twice
+    shard = f"{args.shard[0]}-of-{args.shard[1]}" if args.shard else 'all'
+    journal = FetchJournal(f"history.{shard}", key=f"{start_date.date()}:{end_date.date()}")
     all_data = []
 
-    print(f"\nFetching data for {len(FRANCHISE_STOCKS)} stocks...")
+    print(f"\nFetching data for {len(symbols)} stocks...")
     print("-" * 70)
 
-    for symbol in FRANCHISE_STOCKS:
-        df = fetch_stock_data(symbol, start_date, end_date)
-        if df is not None and not df.empty:
-            all_data.append(df)
+    with run_metrics.stage('fetch'):
+        for symbol in symbols:
+            if symbol in journal:
+                all_data.append(pd.DataFrame(**journal.entries[symbol]))
+                continue
+            df = fetch_stock_data(symbol, symbol_starts.get(symbol, start_date), end_date,
+                                  use_cache=not args.no_cache)
+            if df is not None and not df.empty:
+                journal.record(symbol, df.to_dict(orient='split', index=False))
+                all_data.append(df)
 
     print("-" * 70)
 
+    if all_data:
+        # Quarantine bad bars (price jumps, broken OHLC, duplicate or stale days)
+        with run_metrics.stage('validate'):
+            new_df = validation.screen_history(pd.concat(all_data, ignore_index=True), existing_df)
+    else:
+        new_df = pd.DataFrame(columns=['date', 'symbol', 'open', 'high', 'low', 'close', 'adjClose', 'volume'])
+
+    if args.shard:
+        # Only this shard's new rows (possibly none: the merge needs every
+        # shard's file); --merge-shards folds them into the CSV
+        path = sharding.shard_path('franchise_stocks', args.shard, '.csv')
+        with run_metrics.stage('publish'):
+            atomic_write(path, new_df.to_csv(index=False).encode('utf-8'))
+        print(f"\n✓ Saved {len(new_df)} rows for shard {args.shard[0]}/{args.shard[1]} to {path}")
+        journal.complete()
+        return 0
+
     if not all_data:
         print("\n✗ No new data fetched. Exiting.")
         sys.exit(1)
 
-    # Combine all new data
-    new_df = pd.concat(all_data, ignore_index=True)
-
-    # Merge with existing data if it exists
-    if existing_df is not None:
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-
-        # Remove duplicates (keep latest)
-        combined_df = combined_df.drop_duplicates(subset=['date', 'symbol'], keep='last')
-
-        # Sort by date and symbol
-        combined_df = combined_df.sort_values(['date', 'symbol'])
-    else:
-        combined_df = new_df.sort_values(['date', 'symbol'])
-
-    # Create data directory if it doesn't exist
-    os.makedirs('data', exist_ok=True)
+    if new_df.empty:
+        print("\n✗ Every fetched row was quarantined. Exiting.")
+        sys.exit(1)
 
-    # Save to CSV
-    combined_df.to_csv(CSV_FILE, index=False)
+    with run_metrics.stage('merge'):
+        # Merge with existing data if it exists
+        combined_df = merge_history(existing_df, new_df)
 
-    print(f"\n✓ Successfully updated {CSV_FILE}")
-    print(f"Total records: {len(combined_df)}")
-    print(f"Date range: {combined_df['date'].min()} to {combined_df['date'].max()}")
-    print(f"Stocks: {combined_df['symbol'].nunique()}")
-    print("=" * 70)
+    publish_history(combined_df)
+    journal.complete()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(profiling.run(main, 'history', description="Update the franchise stock history CSV",
+                           arguments=add_arguments))
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Batch validation of quotes and daily bars before they are published.
+
+The fetchers used to publish whatever the providers returned, so a bad
+tick (a 10x price, a zero-volume copy of the previous day) went straight to
+the site. Every batch is now checked in one vectorized pass against the
+stored history, and suspect rows are quarantined instead of published:
+
+    invalid       missing, non-finite or non-positive price
+    ohlc          low/high do not bracket open, close (or the quote price)
+    duplicate     same date as the previous row of the symbol
+    out_of_order  date (or quote timestamp) older than the previous one
+    stale         quote timestamp missing, in the future or days old;
+                  bar dated in the future or a zero-volume repeat of the
+                  previous bar
+    jump          log return versus the last good close is more than
+                  Z_LIMIT robust standard deviations of the symbol's recent
+                  returns (and more than MIN_MOVE in absolute terms)
+
+Volatility is the median absolute deviation of recent daily log returns
+(x1.4826), so one bad tick in the window does not hide itself.
+
+A real move stays where it went, a bad tick does not. A jumped bar that the
+next bar confirms (the next bar is no jump from it) is a level shift and is
+accepted; until that bar exists the jumped bar waits in quarantine. A quote
+only counts as a jump if it is also one from the provider's previous close,
+so the day after a move the quotes are published before the history has
+caught up.
+
+Quarantined rows are kept in data/quarantine/<artifact>.json (latest
+MAX_QUARANTINE entries) for review. A quarantined quote is simply left out
+of the snapshot, so the ticker falls back to the last close; a quarantined
+bar is left out of the CSV and fetched again by the next run, which resumes
+each symbol after its own last stored date.
+"""
+
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import run_metrics
+import ticker_bundle
+from lazy_import import lazy_import
+from publisher import write_state
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+QUARANTINE_DIR = Path("data/quarantine")
+MAX_QUARANTINE = 500         # Entries kept per artifact
+
+Z_LIMIT = 8.0                # Robust z-score that counts as a jump
+MIN_MOVE = 0.25              # ... and only if the move is at least 25%
+MIN_SIGMA = 0.005            # Volatility floor (0.5% a day)
+SIGMA_WINDOW = 60            # Recent returns used for the volatility
+OHLC_TOLERANCE = 0.005       # Relative slack for rounding in OHLC checks
+
+STALE_QUOTE_SECONDS = 5 * 86400   # Quotes older than this are stale (long weekends pass)
+FUTURE_SLACK_SECONDS = 300        # Clock skew allowed for quote timestamps
+
+MAD_SCALE = 1.4826
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _column(values):
+    """Float array with None/missing as NaN"""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def _group_median(values, groups, n_groups):
+    """Median of values per group id (NaNs ignored; NaN for empty groups)"""
+    valid = ~np.isnan(values)
+    values, groups = values[valid], groups[valid]
+    order = np.lexsort((values, groups))
+    values, groups = values[order], groups[order]
+
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    result[has] = (values[lo] + values[hi]) / 2
+    return result
+
+
+def robust_sigma(returns, groups, n_groups):
+    """Per-group volatility: scaled median absolute deviation of the returns"""
+    center = _group_median(returns, groups, n_groups)
+    deviation = np.abs(returns - center[groups])
+    sigma = MAD_SCALE * _group_median(deviation, groups, n_groups)
+    return np.fmax(np.nan_to_num(sigma, nan=MIN_SIGMA), MIN_SIGMA)
+
+
+def _is_jump(log_return, sigma):
+    with np.errstate(invalid='ignore'):
+        size = np.abs(log_return)
+        return (size > math.log1p(MIN_MOVE)) & (size > Z_LIMIT * sigma)
+
+
+def _dates(values):
+    """'YYYY-MM-DD' strings as a datetime64[D] array"""
+    return pd.to_datetime(values, format='%Y-%m-%d').to_numpy().astype('datetime64[D]')
+
+
+def _reasons(checks, index):
+    return [name for name, mask in checks if mask[index]]
+
+
+def quarantine(artifact, entries, directory=QUARANTINE_DIR):
+    """Append rejected rows to the artifact's quarantine file"""
+    if not entries:
+        return
+    path = Path(directory) / f"{artifact}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            kept = json.load(f).get('entries', [])
+    except (OSError, ValueError):
+        kept = []
+
+    stamp = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+    kept.extend({'quarantinedAt': stamp, **entry} for entry in entries)
+    write_state({'artifact': artifact, 'entries': kept[-MAX_QUARANTINE:]}, path)
+
+    run_metrics.inc('quarantined_total', len(entries), artifact=artifact)
+    print(f"🚧 Quarantined {len(entries)} suspect {artifact} row(s) in {path}")
+
+
+# =============================================================================
+# QUOTES
+# =============================================================================
+
+def check_quotes(quotes, history=None, previous=None, now=None):
+    """
+    Validate a quote snapshot
+
+    Args:
+        quotes: dict of symbol -> Quote (fetch_quote output)
+        history: ticker_bundle history summary "symbols" (last close and
+                 recent closes per symbol)
+        previous: dict of symbol -> quote from the last published snapshot
+        now: Unix time, for testing
+
+    Returns:
+        tuple: (accepted quotes dict, {symbol: [reasons]} for rejected ones)
+    """
+    if not quotes:
+        return {}, {}
+    history = history or {}
+    previous = previous or {}
+    now = time.time() if now is None else now
+
+    symbols = list(quotes)
+    price = _column(quotes[s].price for s in symbols)
+    high = _column(quotes[s].high for s in symbols)
+    low = _column(quotes[s].low for s in symbols)
+    opens = _column(quotes[s].open for s in symbols)
+    previous_close = _column(quotes[s].previousClose for s in symbols)
+    stamp = _column(quotes[s].timestamp or 0 for s in symbols)
+    last_stamp = _column((previous.get(s) or {}).get('timestamp') or 0 for s in symbols)
+    ref = _column((history.get(s) or {}).get('close') for s in symbols)
+
+    # Recent closes as a (symbols x points) matrix, NaN-padded on the left
+    width = max([len((history.get(s) or {}).get('spark') or ()) for s in symbols] + [2])
+    spark = np.full((len(symbols), width), np.nan)
+    for row, symbol in enumerate(symbols):
+        closes = (history.get(symbol) or {}).get('spark') or ()
+        if closes:
+            spark[row, width - len(closes):] = closes
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        invalid = ~np.isfinite(price) | (price <= 0)
+
+        slack = price * OHLC_TOLERANCE
+        ranged = (high > 0) & (low > 0)
+        ohlc = ranged & ((low > high + slack) | (price > high + slack) | (price < low - slack) |
+                         ((opens > 0) & ((opens > high + slack) | (opens < low - slack))))
+
+        stale = (stamp <= 0) | (stamp > now + FUTURE_SLACK_SECONDS) | (stamp < now - STALE_QUOTE_SECONDS)
+        out_of_order = (last_stamp > 0) & (stamp < last_stamp)
+
+        returns = np.diff(np.log(spark), axis=1)
+        rows = np.repeat(np.arange(len(symbols)), returns.shape[1])
+        sigma = robust_sigma(returns.ravel(), rows, len(symbols))
+        jump = ~invalid & (ref > 0) & _is_jump(np.log(price / ref), sigma)
+        # The provider's previous close already at the new level confirms the move
+        jump &= ~(previous_close > 0) | _is_jump(np.log(price / previous_close), sigma)
+
+    checks = (('invalid', invalid), ('ohlc', ohlc), ('stale', stale),
+              ('out_of_order', out_of_order), ('jump', jump))
+    suspect = invalid | ohlc | stale | out_of_order | jump
+
+    accepted, rejected = {}, {}
+    for index, symbol in enumerate(symbols):
+        if suspect[index]:
+            rejected[symbol] = _reasons(checks, index)
+        else:
+            accepted[symbol] = quotes[symbol]
+    return accepted, rejected
+
+
+def screen_quotes(quotes, history=None, previous=None, now=None):
+    """
+    Validate a snapshot, quarantine the suspect quotes and return the rest
+
+    history and previous default to the ticker history summary and the
+    currently published live_ticker.json.
+    """
+    if history is None:
+        history = ticker_bundle.load_summary().get('symbols', {})
+    if previous is None:
+        try:
+            with open(ticker_bundle.LIVE_TICKER_FILE, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get('quotes', {})
+        except (OSError, ValueError):
+            previous = {}
+
+    accepted, rejected = check_quotes(quotes, history, previous, now)
+    quarantine('live_ticker', [
+        {'symbol': symbol, 'reasons': reasons, 'quote': quotes[symbol]}
+        for symbol, reasons in rejected.items()
+    ])
+    return accepted
+
+
+# =============================================================================
+# DAILY BARS
+# =============================================================================
+
+def check_history(new_df, existing_df=None, today=None):
+    """
+    Validate newly fetched daily bars against the stored history
+
+    Rows are checked in the order they were fetched within each symbol;
+    the context is each symbol's last SIGMA_WINDOW stored rows before its
+    first new date (rows that will be replaced are not context).
+
+    Args:
+        new_df: Fetched rows (date, symbol, open, high, low, close, adjClose, volume)
+        existing_df: The stored history, or None
+        today: 'YYYY-MM-DD', for testing
+
+    Returns:
+        tuple: (accepted DataFrame, rejected DataFrame with a "reasons" column)
+    """
+    today = np.datetime64(today or datetime.now().strftime('%Y-%m-%d'), 'D')
+    new_df = new_df.reset_index(drop=True)
+    if existing_df is None:
+        existing_df = new_df.iloc[:0]
+
+    # One symbol code space for both frames
+    codes, uniques = pd.factorize(pd.concat([existing_df['symbol'], new_df['symbol']], ignore_index=True))
+    old_codes, new_codes = codes[:len(existing_df)], codes[len(existing_df):]
+    old_dates, new_dates = _dates(existing_df['date']), _dates(new_df['date'])
+
+    # Context: the last SIGMA_WINDOW + 1 stored rows before each symbol's first new date
+    first_new = np.full(len(uniques), np.datetime64('9999-12-31', 'D'))
+    np.minimum.at(first_new, new_codes, new_dates)
+    candidates = np.flatnonzero(old_dates < first_new[old_codes])
+    candidates = candidates[np.lexsort((old_dates[candidates], old_codes[candidates]))]
+    cand_codes = old_codes[candidates]
+    group_end = np.searchsorted(cand_codes, cand_codes, side='right')
+    context = candidates[group_end - np.arange(len(candidates)) <= SIGMA_WINDOW + 1]
+
+    def column(name):
+        return np.concatenate((existing_df[name].to_numpy(dtype=float)[context],
+                               new_df[name].to_numpy(dtype=float)))
+
+    # Group rows by symbol, keeping row order within a symbol (context first)
+    all_codes = np.concatenate((old_codes[context], new_codes))
+    order = np.lexsort((np.arange(len(all_codes)), all_codes))
+    groups = all_codes[order]
+    is_new = order >= len(context)
+    dates = np.concatenate((old_dates[context], new_dates))[order]
+    o, h, l, c, volume = (column(name)[order] for name in ('open', 'high', 'low', 'adjClose', 'volume'))
+    n = len(groups)
+
+    same = np.zeros(n, dtype=bool)
+    same[1:] = groups[1:] == groups[:-1]
+    prev = np.arange(n) - 1
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        invalid = ~np.isfinite(c) | (c <= 0)
+
+        slack = c * OHLC_TOLERANCE
+        ohlc = ~invalid & ((l <= 0) | (l > np.fmin(o, c) + slack) | (h < np.fmax(o, c) - slack) | (volume < 0))
+
+        gap = np.zeros(n, dtype='timedelta64[D]')
+        gap[1:] = dates[1:] - dates[:-1]
+        duplicate = same & (gap == np.timedelta64(0, 'D'))
+        out_of_order = same & (gap < np.timedelta64(0, 'D'))
+
+        repeat = np.zeros(n, dtype=bool)
+        repeat[1:] = ((volume[1:] == 0) & (o[1:] == o[:-1]) & (h[1:] == h[:-1]) &
+                      (l[1:] == l[:-1]) & (c[1:] == c[:-1]))
+        stale = (dates > today) | (same & repeat)
+
+        log_c = np.log(c)
+        returns = np.where(same, log_c - log_c[prev], np.nan)
+        sigma = robust_sigma(returns, groups, len(uniques))[groups]
+        jump = same & _is_jump(returns, sigma)
+        raw_jump = jump.copy()
+
+        # A single bad bar also makes the next one look like a jump back;
+        # measure that one against the bar before the bad one instead
+        back = np.zeros(n, dtype=bool)
+        back[2:] = jump[1:-1] & same[1:-1] & same[2:]
+        if back.any():
+            skip = np.where(back, log_c - log_c[np.maximum(prev - 1, 0)], np.nan)
+            jump = jump & ~(back & ~_is_jump(skip, sigma))
+
+        # A jump the next bar stays at is a level shift, not a bad tick
+        # (raw_jump: a bar that jumps back does not confirm, even when the
+        # check above cleared it)
+        confirmed = np.zeros(n, dtype=bool)
+        confirmed[:-1] = jump[:-1] & same[1:] & ~raw_jump[1:] & ~invalid[1:]
+        jump &= ~confirmed
+
+    checks = (('invalid', invalid), ('ohlc', ohlc), ('duplicate', duplicate),
+              ('out_of_order', out_of_order), ('stale', stale), ('jump', jump))
+    suspect = np.zeros(n, dtype=bool)
+    for _, mask in checks:
+        suspect |= mask
+    suspect &= is_new
+
+    # Back to new_df's row order
+    rows = order[suspect] - len(context)
+    rejected = new_df.iloc[rows].copy()
+    rejected['reasons'] = [_reasons(checks, index) for index in np.flatnonzero(suspect)]
+    accepted = new_df.drop(index=rows)
+    return accepted, rejected
+
+
+def screen_history(new_df, existing_df=None, today=None):
+    """Validate fetched bars, quarantine the suspect rows and return the rest"""
+    accepted, rejected = check_history(new_df, existing_df, today)
+    quarantine('franchise_stocks', [
+        {'symbol': row['symbol'], 'reasons': row['reasons'],
+         'row': {key: value for key, value in row.items() if key != 'reasons'}}
+        for row in rejected.to_dict('records')
+    ])
+    return accepted